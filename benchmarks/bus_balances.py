@@ -0,0 +1,90 @@
+"""
+Benchmark of the bus balances of large result tables.
+
+Creates an energy system of 100 buses with 10,000 sources and 10,000 sinks
+and a random flow table of 720 time steps. The inputs and outputs of all
+buses are summed once like the ``process_results`` functions of the
+examples (relabelling and filtering the columns by list comprehensions per
+bus) and once by :class:`placades.results.FlowLabels`. Run from the
+repository root:
+
+    $ python benchmarks/bus_balances.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from oemof.solph import Bus
+from oemof.solph import EnergySystem
+from oemof.solph import Flow
+from oemof.solph.components import Sink
+from oemof.solph.components import Source
+
+from placades.results import FlowLabels
+
+BUSES = 100
+COMPONENTS = 10_000
+TIMESTEPS = 720
+
+
+def create_energy_system():
+    es = EnergySystem(
+        timeindex=pd.date_range("2025", periods=TIMESTEPS + 1, freq="h"),
+        infer_last_interval=False,
+    )
+    buses = [Bus(label=f"bus_{number}") for number in range(BUSES)]
+    es.add(*buses)
+    for number in range(COMPONENTS):
+        bus = buses[number % BUSES]
+        es.add(
+            Source(label=f"source_{number}", outputs={bus: Flow()}),
+            Sink(label=f"sink_{number}", inputs={bus: Flow()}),
+        )
+    return es
+
+
+def loop_balances(flows):
+    """Sum the flows like the process_results functions of the examples."""
+    flows = flows.rename(columns=lambda node: node.label)
+    balances = {}
+    for number in range(BUSES):
+        label = f"bus_{number}"
+        inputs = flows[[c for c in flows.columns if c[1] == label]]
+        outputs = flows[[c for c in flows.columns if c[0] == label]]
+        balances[label] = (inputs.sum().sum(), outputs.sum().sum())
+    return pd.DataFrame(balances, index=["in", "out"]).T
+
+
+def main():
+    es = create_energy_system()
+    keys = list(es.flows())
+    flows = pd.DataFrame(
+        np.random.default_rng(1).random((TIMESTEPS, len(keys))),
+        index=es.timeindex[:-1],
+        columns=pd.MultiIndex.from_tuples(keys),
+    )
+
+    start = time.perf_counter()
+    expected = loop_balances(flows)
+    print(f"   list comprehensions: {time.perf_counter() - start:7.3f} s")
+
+    start = time.perf_counter()
+    labels = FlowLabels(es)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    balances = labels.balances(flows)
+    print(
+        f"FlowLabels: {built:7.3f} s once per energy system,"
+        f" {time.perf_counter() - start:7.3f} s per result table"
+    )
+    start = time.perf_counter()
+    labels.balance_series(flows)
+    print(f"   balance per time step: {time.perf_counter() - start:7.3f} s")
+    np.testing.assert_allclose(
+        balances.loc[expected.index, ["in", "out"]], expected
+    )
+
+
+if __name__ == "__main__":
+    main()
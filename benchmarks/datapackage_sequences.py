@@ -0,0 +1,79 @@
+"""
+Benchmark of the sequence loading of datapackages.
+
+Copies the example datapackage with a three year, 15 minute profiles.csv
+and compares oemof.datapackage's reader with the placades sequence backend,
+without and with the memory-mapped cache. Run from the repository root:
+
+    $ python benchmarks/datapackage_sequences.py
+"""
+
+import shutil
+import tempfile
+import timeit
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from oemof.datapackage import datapackage  # noqa: F401
+from oemof.solph import EnergySystem
+
+from placades import TYPEMAP
+from placades.datapackage.reading import from_datapackage
+
+EXAMPLE_PACKAGE = Path(
+    Path(__file__).parent.parent,
+    "examples",
+    "simple_dispatch",
+    "openPlan_package",
+)
+
+
+def create_package(directory, years=3):
+    package = Path(directory, "package")
+    shutil.copytree(EXAMPLE_PACKAGE, package)
+    timeindex = pd.date_range(
+        "2024-01-01", periods=years * 8760 * 4, freq="15min"
+    )
+    profiles = pd.DataFrame(
+        np.random.default_rng(42).random((len(timeindex), 3)).round(6),
+        index=pd.Index(timeindex, name="timeindex"),
+        columns=[
+            "electricity_demand.csv",
+            "pv_profile.csv",
+            "wind_profile.csv",
+        ],
+    )
+    profiles.to_csv(Path(package, "data", "sequences", "profiles.csv"))
+    return Path(package, "datapackage.json")
+
+
+def main():
+    warnings.simplefilter("ignore")
+    with tempfile.TemporaryDirectory() as directory:
+        path = create_package(directory)
+        cache_dir = Path(directory, "cache")
+        for name, function in [
+            (
+                "oemof.datapackage",
+                lambda: EnergySystem.from_datapackage(
+                    str(path), attributemap={}, typemap=TYPEMAP.copy()
+                ),
+            ),
+            ("csv", lambda: from_datapackage(path)),
+            (
+                "cache (cold)",
+                lambda: from_datapackage(path, cache_dir=cache_dir),
+            ),
+            (
+                "cache (warm)",
+                lambda: from_datapackage(path, cache_dir=cache_dir),
+            ),
+        ]:
+            seconds = timeit.timeit(function, number=1)
+            print(f"{name:>17}: {seconds:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark of the key performance indicators of many scenarios.
+
+Creates an energy system of 20 buses, each with a DSO, 100 PV plants and
+100 demands, and random flow tables of 720 time steps for 50 scenarios.
+The demand, generation, grid import and export and the renewable factor of
+all scenarios are calculated once by selecting the columns of every facade
+type in a loop and once by :func:`placades.kpi.KeyIndicators.table`. Run
+from the repository root:
+
+    $ python benchmarks/kpis.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from oemof.solph import EnergySystem
+
+from placades import CarrierBus
+from placades import Demand
+from placades import DsoElectricity
+from placades import Project
+from placades import PvPlant
+from placades.facades.providers.dso import DSO
+from placades.kpi import KeyIndicators
+
+BUSES = 20
+COMPONENTS = 100
+TIMESTEPS = 720
+SCENARIOS = 50
+
+
+def create_energy_system():
+    es = EnergySystem(
+        timeindex=pd.date_range("2025", periods=TIMESTEPS + 1, freq="h"),
+        infer_last_interval=False,
+    )
+    project = Project(name="p", lifetime=20, tax=0, discount_factor=0.05)
+    profile = np.ones(TIMESTEPS)
+    for number in range(BUSES):
+        bus = CarrierBus(name=f"bus_{number}", carrier="electricity")
+        es.add(bus, DsoElectricity(name=f"dso_{number}", bus_electricity=bus))
+        for component in range(COMPONENTS):
+            es.add(
+                PvPlant(
+                    project_data=project,
+                    bus_out_electricity=bus,
+                    input_timeseries=profile,
+                    name=f"pv_{number}_{component}",
+                ),
+                Demand(
+                    name=f"demand_{number}_{component}",
+                    bus_in_electricity=bus,
+                    input_timeseries=profile,
+                ),
+            )
+    return es
+
+
+def parent(node):
+    return getattr(node, "parent", None) or node
+
+
+def loop_kpis(scenarios):
+    """Select the columns of every facade type like a dashboard script."""
+    rows = {}
+    for name, flows in scenarios.items():
+        columns = flows.columns
+        demand = flows[[c for c in columns if isinstance(c[1], Demand)]]
+        generation = flows[[c for c in columns if isinstance(c[0], PvPlant)]]
+        imports = flows[
+            [
+                c
+                for c in columns
+                if isinstance(parent(c[0]), DSO)
+                and not isinstance(parent(c[1]), DSO)
+            ]
+        ]
+        exports = flows[
+            [
+                c
+                for c in columns
+                if isinstance(parent(c[1]), DSO)
+                and not isinstance(parent(c[0]), DSO)
+            ]
+        ]
+        renewable_import = sum(
+            imports[c].sum() * parent(c[0]).renewable_share
+            for c in imports.columns
+        )
+        generated = generation.sum().sum()
+        imported = imports.sum().sum()
+        rows[name] = {
+            "demand": demand.sum().sum(),
+            "generation": generated,
+            "grid_import": imported,
+            "grid_export": exports.sum().sum(),
+            "renewable_factor": (generated + renewable_import)
+            / (generated + imported),
+        }
+    return pd.DataFrame(rows).T
+
+
+def main():
+    es = create_energy_system()
+    keys = list(es.flows())
+    rng = np.random.default_rng(1)
+    columns = pd.MultiIndex.from_tuples(keys)
+    scenarios = {
+        f"scenario_{number}": pd.DataFrame(
+            rng.random((TIMESTEPS, len(keys))),
+            index=es.timeindex[:-1],
+            columns=columns,
+        )
+        for number in range(SCENARIOS)
+    }
+    results = {name: {"flow": flows} for name, flows in scenarios.items()}
+
+    start = time.perf_counter()
+    expected = loop_kpis(scenarios)
+    print(f"    column selection: {time.perf_counter() - start:7.3f} s")
+
+    start = time.perf_counter()
+    indicators = KeyIndicators(es)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    table = indicators.table(results)
+    print(
+        f"KeyIndicators: {built:7.3f} s once per energy system,"
+        f" {time.perf_counter() - start:7.3f} s for {SCENARIOS} scenarios"
+    )
+    np.testing.assert_allclose(
+        table[expected.columns].to_numpy(), expected.to_numpy()
+    )
+
+
+if __name__ == "__main__":
+    main()
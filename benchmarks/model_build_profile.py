@@ -0,0 +1,57 @@
+"""
+Profile of building and solving the example datapackage.
+
+Builds the model of the example datapackage (one year, hourly) once
+without and once within :func:`placades.profiling.profile`, solves it and
+prints the slowest stages, calls and facades and the size of the model per
+facade type. Run from the repository root:
+
+    $ python benchmarks/model_build_profile.py
+"""
+
+import time
+import warnings
+from pathlib import Path
+
+from oemof.solph import Model
+
+from placades.datapackage.reading import from_datapackage
+from placades.profiling import profile
+from placades.profiling import stage
+
+EXAMPLE_PACKAGE = Path(
+    Path(__file__).parent.parent,
+    "examples",
+    "simple_dispatch",
+    "openPlan_package",
+    "datapackage.json",
+)
+
+
+def main():
+    warnings.simplefilter("ignore")
+    es = from_datapackage(EXAMPLE_PACKAGE)
+    start = time.perf_counter()
+    Model(energysystem=es)
+    print(f"without profile: {time.perf_counter() - start:6.3f} s")
+
+    with profile(log=False) as report:
+        es = from_datapackage(EXAMPLE_PACKAGE)
+        with stage("build_model"):
+            model = Model(energysystem=es)
+        with stage("solve"):
+            model.solve(solver="highs")
+    build = report.calls["Model"]["seconds"]
+    counting = report.stages["count_model"]["seconds"]
+    print(
+        f"   with profile: {build:6.3f} s, {counting:6.3f} s more counting"
+        " the model"
+    )
+    for section in ("stages", "calls", "facades"):
+        print(f"\n{section}:\n{report.table(section).head(8)}")
+    statistics = report.models[0].groupby("component_type")
+    print(statistics[["variables", "constraints"]].sum())
+
+
+if __name__ == "__main__":
+    main()
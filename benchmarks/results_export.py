@@ -0,0 +1,101 @@
+"""
+Benchmark of the result export.
+
+Solves the example datapackage (one year, hourly) once and writes its
+flows, storage contents and investments as wide csv files, like the
+runner does by default, and in the long format as Parquet and Arrow IPC
+files. Reports the time to write, the size on disk and the time to reload
+the tables of 20 copies of the scenario. Run from the repository root:
+
+    $ python benchmarks/results_export.py
+"""
+
+import shutil
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import pandas as pd
+from oemof.solph import Model
+
+from placades.datapackage.reading import from_datapackage
+from placades.datapackage.results import RESULT_KEYS
+from placades.datapackage.results import read_results
+from placades.datapackage.results import write_results
+from placades.runner import _label
+
+EXAMPLE_PACKAGE = Path(
+    Path(__file__).parent.parent,
+    "examples",
+    "simple_dispatch",
+    "openPlan_package",
+    "datapackage.json",
+)
+SCENARIOS = 20
+
+
+def write_csv(results, output_dir):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for key in RESULT_KEYS:
+        if key in results:
+            table = results.get(key).rename(columns=_label)
+            table.to_csv(Path(output_dir, f"{key}.csv"))
+
+
+def read_csv(path):
+    return {
+        file.parent.name: pd.read_csv(file, header=[0, 1], index_col=0)
+        for file in sorted(path.glob("*/flow.csv"))
+    }
+
+
+def size(path):
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def main():
+    warnings.simplefilter("ignore")
+    energy_system = from_datapackage(EXAMPLE_PACKAGE)
+    results = Model(energysystem=energy_system).solve(solver="highs")
+    results = {key: results.get(key) for key in RESULT_KEYS if key in results}
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, write, read in [
+            ("csv", write_csv, read_csv),
+            *(
+                (
+                    f"{format} ({compression})",
+                    lambda r, path, f=format, c=compression: write_results(
+                        r, path, format=f, compression=c
+                    ),
+                    lambda path, f=format: read_results(path, format=f),
+                )
+                for format, compression in [
+                    ("parquet", "zstd"),
+                    ("parquet", "snappy"),
+                    ("arrow", "lz4"),
+                ]
+            ),
+        ]:
+            path = Path(directory, name.split()[0])
+            start = time.perf_counter()
+            write(results, Path(path, "scenario_0"))
+            written = time.perf_counter() - start
+            for number in range(1, SCENARIOS):
+                shutil.copytree(
+                    Path(path, "scenario_0"), Path(path, f"scenario_{number}")
+                )
+            start = time.perf_counter()
+            read(path)
+            reloaded = time.perf_counter() - start
+            print(
+                f"{name:>16}: write {written:6.3f} s,"
+                f" {size(path) / SCENARIOS / 1e6:6.2f} MB per scenario,"
+                f" reload {SCENARIOS} flow tables {reloaded:6.3f} s"
+            )
+            shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    main()
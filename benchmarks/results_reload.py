@@ -0,0 +1,85 @@
+"""
+Benchmark of reloading exported results.
+
+Solves the example datapackage (one year, hourly) once and exports its
+results as csv and Parquet files for 20 copies of the scenario. The flows
+of one scenario are reloaded once like ``import_results`` of the
+simple_dispatch example did, by building the energy system again to map the
+labels back to the nodes, and once by the label sidecar with
+:class:`placades.datapackage.results.ResultStore`. Run from the repository
+root:
+
+    $ python benchmarks/results_reload.py
+"""
+
+import shutil
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import pandas as pd
+from oemof.solph import Model
+
+from placades.datapackage.reading import from_datapackage
+from placades.datapackage.results import ResultStore
+from placades.runner import _write_results
+
+EXAMPLE_PACKAGE = Path(
+    Path(__file__).parent.parent,
+    "examples",
+    "simple_dispatch",
+    "openPlan_package",
+    "datapackage.json",
+)
+SCENARIOS = 20
+
+
+def rebuild_and_read(path):
+    """Map the labels of the csv results to the nodes of a new system."""
+    flows = pd.read_csv(Path(path, "flow.csv"), header=[0, 1], index_col=0)
+    nodes = {
+        str(node.label): node
+        for node in from_datapackage(EXAMPLE_PACKAGE).nodes
+    }
+    return flows.rename(columns=nodes)
+
+
+def main():
+    warnings.simplefilter("ignore")
+    model = Model(energysystem=from_datapackage(EXAMPLE_PACKAGE))
+    results = model.solve(solver="highs")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for format in ("csv", "parquet"):
+            path = Path(directory, format, "scenario_0")
+            _write_results(results, model, path, results_format=format)
+            for number in range(1, SCENARIOS):
+                shutil.copytree(path, Path(path.parent, f"scenario_{number}"))
+
+        start = time.perf_counter()
+        rebuild_and_read(Path(directory, "csv", "scenario_3"))
+        print(
+            f"     rebuild energy system: {time.perf_counter() - start:6.3f} s"
+        )
+
+        start = time.perf_counter()
+        store = ResultStore(Path(directory, "parquet"))
+        buses = store.select(type="CarrierBus")
+        store.get("flow", scenarios=["scenario_3"], target=buses)
+        print(
+            "ResultStore, flows into the buses of one scenario:"
+            f" {time.perf_counter() - start:6.3f} s"
+        )
+
+        start = time.perf_counter()
+        store = ResultStore(Path(directory, "parquet"))
+        store.get("flow")
+        print(
+            f"ResultStore, all flows of {SCENARIOS} scenarios:"
+            f" {time.perf_counter() - start:6.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark of the rolling horizon dispatch.
+
+Solves a year of hourly dispatch of PV, grid and three batteries once as
+one model and window by window, and a system without storages with the
+windows in parallel. Every solve runs in a fresh process to measure its
+peak memory. Run from the repository root:
+
+    $ python benchmarks/rolling_horizon.py
+"""
+
+import multiprocessing
+import resource
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from oemof.solph import EnergySystem
+from oemof.solph import Model
+
+from placades import CarrierBus
+from placades import Demand
+from placades import DsoElectricity
+from placades import ElectricalStorage
+from placades import Project
+from placades import PvPlant
+from placades.rolling_horizon import solve_rolling_horizon
+
+HOURS = 8760
+SOLVER = "highs"
+
+
+def create_energy_system(storages=3):
+    es = EnergySystem(
+        timeindex=pd.date_range("2025", periods=HOURS + 1, freq="h"),
+        infer_last_interval=False,
+    )
+    rng = np.random.default_rng(42)
+    hours = np.arange(HOURS)
+    project = Project(name="p", lifetime=20, tax=0, discount_factor=0.05)
+    bus = CarrierBus(name="electricity")
+    es.add(
+        bus,
+        DsoElectricity(name="dso", bus_electricity=bus, feedin_tariff=0.05),
+        PvPlant(
+            project_data=project,
+            bus_out_electricity=bus,
+            input_timeseries=np.clip(
+                np.sin((hours % 24 - 6) / 12 * np.pi), 0, 1
+            )
+            * rng.uniform(0.3, 1, HOURS),
+            name="pv",
+            installed_capacity=10,
+            optimize_cap=False,
+        ),
+        Demand(
+            name="demand",
+            bus_in_electricity=bus,
+            input_timeseries=rng.uniform(1, 4, HOURS),
+        ),
+    )
+    for number in range(storages):
+        es.add(
+            ElectricalStorage(
+                name=f"battery_{number}",
+                bus_in_electricity=bus,
+                age_installed=0,
+                installed_capacity=5 + 5 * number,
+                capex_var=0,
+                opex_fix=0,
+                opex_var=0.001 * number,
+                lifetime=10,
+                optimize_cap=False,
+                soc_max=1,
+                soc_min=0.1 * number,
+                crate=0.5,
+                efficiency=0.9,
+                project_data=project,
+                self_discharge=0.0005 * (number + 1),
+            )
+        )
+    return es
+
+
+def solve_monolithic(storages):
+    return Model(energysystem=create_energy_system(storages)).solve(
+        solver=SOLVER
+    )["objective"]
+
+
+def solve_windows(storages, parallel=False):
+    return solve_rolling_horizon(
+        create_energy_system(storages),
+        window=168,
+        overlap=24,
+        solver=SOLVER,
+        parallel=parallel,
+        workers=4,
+    )["objective"]
+
+
+def measure(function, *args):
+    warnings.simplefilter("ignore")
+    start = time.perf_counter()
+    objective = function(*args)
+    seconds = time.perf_counter() - start
+    # the parallel windows are solved in child processes
+    peak = (
+        max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        )
+        / 1024
+    )
+    return objective, seconds, peak
+
+
+def main():
+    context = multiprocessing.get_context("spawn")
+    for name, function, args in [
+        ("monolithic", solve_monolithic, (3,)),
+        ("rolling", solve_windows, (3,)),
+        ("monolithic, no storage", solve_monolithic, (0,)),
+        ("rolling, no storage", solve_windows, (0,)),
+        ("parallel, no storage", solve_windows, (0, True)),
+    ]:
+        with ProcessPoolExecutor(1, mp_context=context) as pool:
+            objective, seconds, peak = pool.submit(
+                measure, function, *args
+            ).result()
+        print(
+            f"{name:>22}: objective {objective:12.2f}, {seconds:7.1f} s,"
+            f" peak memory {peak:7.0f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark of the time series aggregation.
+
+Optimises the PV and battery capacities of a year of hourly profiles once
+on the full time index and on typical days. Reports the deviation of the
+objective and the capacities, the speedup and the largest profile error.
+Run from the repository root:
+
+    $ python benchmarks/time_series_aggregation.py
+"""
+
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from oemof.solph import EnergySystem
+from oemof.solph import Model
+
+from placades import CarrierBus
+from placades import Demand
+from placades import DsoElectricity
+from placades import ElectricalStorage
+from placades import Project
+from placades import PvPlant
+from placades.aggregation import solve_aggregated
+
+DAYS = 365
+SOLVER = "highs"
+
+
+def create_energy_system():
+    hours = np.arange(DAYS * 24)
+    es = EnergySystem(
+        timeindex=pd.date_range("2025", periods=len(hours) + 1, freq="h"),
+        infer_last_interval=False,
+    )
+    rng = np.random.default_rng(42)
+    season = 1 - 0.5 * np.cos(hours / len(hours) * 2 * np.pi)
+    daylight = np.clip(np.sin((hours % 24 - 6) / 12 * np.pi), 0, 1)
+    project = Project(name="p", lifetime=20, tax=0, discount_factor=0.05)
+    bus = CarrierBus(name="electricity")
+    es.add(
+        bus,
+        DsoElectricity(name="dso", bus_electricity=bus, feedin_tariff=0),
+        PvPlant(
+            project_data=project,
+            bus_out_electricity=bus,
+            input_timeseries=daylight
+            * season
+            * rng.uniform(0.2, 1, DAYS).repeat(24),
+            name="pv",
+            optimize_cap=True,
+            capex_var=800,
+        ),
+        Demand(
+            name="demand",
+            bus_in_electricity=bus,
+            input_timeseries=(1 + 0.5 * np.cos(hours / 24 * 2 * np.pi))
+            * (2 - season)
+            * rng.uniform(0.8, 1.2, len(hours)),
+        ),
+        ElectricalStorage(
+            name="battery",
+            bus_in_electricity=bus,
+            age_installed=0,
+            installed_capacity=0,
+            capex_var=300,
+            opex_fix=0,
+            opex_var=0,
+            lifetime=10,
+            optimize_cap=True,
+            soc_max=1,
+            soc_min=0,
+            crate=1,
+            efficiency=0.9,
+            project_data=project,
+            self_discharge=0.0005,
+        ),
+    )
+    return es
+
+
+def capacities(invest):
+    """Return the PV and the storage capacity."""
+    return {
+        str(key[0].label if isinstance(key, tuple) else key.label): round(
+            value, 2
+        )
+        for key, value in invest.iloc[0].items()
+        if not isinstance(key, tuple) or str(key[0].label) == "pv"
+    }
+
+
+def main():
+    warnings.simplefilter("ignore")
+    start = time.perf_counter()
+    results = Model(energysystem=create_energy_system()).solve(solver=SOLVER)
+    seconds = time.perf_counter() - start
+    objective = results["objective"]
+    reference = capacities(results["invest"])
+    print(
+        f"{'full year':>16}: objective {objective:10.1f}, {seconds:6.1f} s,"
+        f" capacities {reference}"
+    )
+    for days in (8, 16, 32, 64):
+        start = time.perf_counter()
+        aggregated = solve_aggregated(
+            create_energy_system(), days, solver=SOLVER
+        )
+        aggregated_seconds = time.perf_counter() - start
+        deviation = aggregated["objective"] / objective - 1
+        errors = aggregated["errors"]
+        print(
+            f"{days:>3} typical days: objective {deviation:+8.2%},"
+            f" {aggregated_seconds:6.1f} s"
+            f" ({seconds / aggregated_seconds:4.1f}x),"
+            f" capacities {capacities(aggregated['invest'])},"
+            f" max rmse {errors['rmse'].max():.3f},"
+            f" max duration rmse {errors['duration_rmse'].max():.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
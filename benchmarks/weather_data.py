@@ -0,0 +1,80 @@
+"""
+Benchmark of the TRY weather data import.
+
+Compares the vectorised ``import_trj`` with the former line-by-line parser
+on the example TRY2015.dat, and a cold with a warm load through the binary
+cache. Run from the repository root:
+
+    $ python benchmarks/weather_data.py
+"""
+
+import tempfile
+import timeit
+from pathlib import Path
+
+from placades.importer.weather_data import import_trj
+
+EXAMPLE_DATA = Path(
+    Path(__file__).parent.parent, "examples", "simple_dispatch", "data"
+)
+TRY_FILE = Path(EXAMPLE_DATA, "TRY2015.dat")
+
+
+def import_trj_line_by_line(path):
+    """Former parser, kept as baseline (with the file opened for reading)."""
+    columns = {i: [] for i in range(17)}
+    with Path(path).open(encoding="latin-1") as f:
+        for line in f:
+            if (
+                line.strip() == ""
+                or line.lstrip().startswith("*")
+                or line.lstrip().startswith("RW")
+            ):
+                continue
+            parts = line.split()
+            if not parts[0].replace("-", "").isdigit():
+                continue
+            if len(parts) < 17:
+                continue
+            for i in range(17):
+                if i in (0, 1, 2, 3, 4, 16):
+                    columns[i].append(int(parts[i]))
+                else:
+                    columns[i].append(float(parts[i]))
+    return columns
+
+
+def main(number=20):
+    for name, function in [
+        ("line by line", import_trj_line_by_line),
+        ("vectorised", import_trj),
+    ]:
+        seconds = min(
+            timeit.repeat(
+                lambda f=function: f(TRY_FILE), number=1, repeat=number
+            )
+        )
+        print(f"{name:>14}: {seconds * 1000:8.2f} ms")
+
+    cold = []
+    warm = []
+    for _ in range(number):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold.append(
+                timeit.timeit(
+                    lambda d=cache_dir: import_trj(TRY_FILE, cache_dir=d),
+                    number=1,
+                )
+            )
+            warm.append(
+                timeit.timeit(
+                    lambda d=cache_dir: import_trj(TRY_FILE, cache_dir=d),
+                    number=1,
+                )
+            )
+    print(f"{'cache (cold)':>14}: {min(cold) * 1000:8.2f} ms")
+    print(f"{'cache (warm)':>14}: {min(warm) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,10 @@ from oemof.tools.logger import define_logging
 from simple_dispatch_dp import create_energy_system_from_dp
 from simple_dispatch_scripted import create_energy_system_sc
 
+from placades.datapackage.results import nodes_of
+from placades.datapackage.results import read_labels
+from placades.datapackage.results import write_labels
+
 
 def main(kind, debug=False):
     results = optimise(kind=kind, debug=debug)
@@ -58,8 +62,8 @@ def process_results(results):
             columns={
                 c[n]: c[n].label[-1]
                 for c in rdf.columns
-                if isinstance(c[n].label, tuple)
-                and not isinstance(c[m].label, tuple)
+                if isinstance(getattr(c[n], "label", None), tuple)
+                and not isinstance(getattr(c[m], "label", None), tuple)
             },
             level=n,
             inplace=True,
@@ -82,15 +86,20 @@ def export_results(results):
     write.export_results_to_datapackage(
         results=results, base_path=export_path, zip=False
     )
+    # all nodes of the results are part of a flow
+    write_labels(nodes_of([results["flow"]]), export_path)
     return export_path
 
 
 def import_results(path):
     results = read.import_results_from_resultpackage(path)
-    groups = create_energy_system_from_dp().groups
+    # the labels of the sidecar are mapped to clean identifiers, so the
+    # energy system does not have to be built again
+    labels = read_labels(path)
+    ids = dict(zip(labels["label"], labels.index, strict=True))
     for key in results.keys():
         if isinstance(results[key], pd.DataFrame):
-            results[key].rename(columns=groups, inplace=True)
+            results[key].rename(columns=ids, inplace=True)
     logging.info("Imported results")
     return results
 
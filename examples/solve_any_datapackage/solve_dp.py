@@ -9,11 +9,13 @@ from oemof.datapackage import datapackage  # noqa
 from oemof.network import graph
 from oemof.solph import EnergySystem
 from oemof.solph import Model
-from oemof.solph import Results
 from oemof.tools.debugging import ExperimentalFeatureWarning
 from oemof.visio import ESGraphRenderer
 
 from placades import TYPEMAP
+from placades.datapackage.results import component_id
+from placades.results import FlowLabels
+from placades.results import LazyResults
 
 warnings.filterwarnings("ignore", category=ExperimentalFeatureWarning)
 
@@ -55,30 +57,18 @@ def optimise(energy_system, solver="cbc", debug=False):
     else:
         skwargs = {}
     optimization_model.solve(solver=solver, solve_kwargs=skwargs)
-    return Results(optimization_model)
+    return LazyResults(optimization_model)
 
 
 def process_results(results):
-    rdf = results["flow"]
-
-    for n, m in [(0, 1), (1, 0)]:
-        rdf.rename(
-            columns={
-                c[n]: c[n].label[-1]
-                for c in rdf.columns
-                if isinstance(c[n].label, tuple)
-                and not isinstance(c[m].label, tuple)
-            },
-            level=n,
-            inplace=True,
-        )
-    elec_in = rdf[[c for c in rdf.columns if c[0] == "electricity"]]
-    elec_out = rdf[[c for c in rdf.columns if c[1] == "electricity"]]
+    # only the flows of the electricity bus are extracted from the model
+    elec_in = results.flows(source="electricity").rename(columns=component_id)
+    elec_out = results.flows(target="electricity").rename(columns=component_id)
     print(elec_in.sum())
     print(elec_out.sum())
     print("*****************")
-    print("Input:", round(elec_in.sum().sum()))
-    print("Output:", round(elec_out.sum().sum()))
+    labels = FlowLabels(results.model.es)
+    print(labels.balances(results["flow"]).round())
     print("Objective:", results["objective"])
 
 
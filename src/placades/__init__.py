@@ -1,39 +1,80 @@
 __version__ = "0.0.0"
 
-from placades.facades.buses.carrier import CarrierBus
-from placades.facades.compansation.excess import Excess
-from placades.facades.compansation.shortage import Shortage
-from placades.facades.converters.Boiler import Boiler
-from placades.facades.converters.ChpFixedRatio import ChpFixedRatio
-from placades.facades.converters.ChpVariableRatio import ChpVariableRatio
-from placades.facades.converters.DieselGenerator import DieselGenerator
-from placades.facades.converters.ElectricalTransformator import (
-    ElectricalTransformator,
-)
-from placades.facades.converters.Electrolyzer import Electrolyzer
-from placades.facades.converters.FuelCell import FuelCell
-from placades.facades.converters.HeatPump import HeatPump
-from placades.facades.demand.electricity_demand import Demand
-from placades.facades.demand.fuel_demand import FuelDemand
-from placades.facades.demand.heat_demand import HeatDemand
-from placades.facades.demand.hydrogen_demand import H2Demand
-from placades.facades.komponenten import CHP
-from placades.facades.komponenten import Battery
-from placades.facades.production.BiogasPlant import BiogasPlant
-from placades.facades.production.GeothermalPlant import GeothermalPlant
-from placades.facades.production.PvPlant import PvPlant
-from placades.facades.production.SolarThermalPlant import SolarThermalPlant
-from placades.facades.production.WindTurbine import WindTurbine
-from placades.facades.providers.DSO_electricity import DsoElectricity
-from placades.facades.providers.DSO_fuel import DsoFuel
-from placades.facades.providers.DSO_heat import DsoHeat
-from placades.facades.providers.DSO_hydrogen import DsoHydrogen
-from placades.facades.storages.ElectricalStorage import ElectricalStorage
-from placades.facades.storages.FuelStorage import FuelStorage
-from placades.facades.storages.HydrogenStorage import HydrogenStorage
-from placades.facades.storages.ThermalStorage import ThermalStorage
-from placades.project import Project
-from placades.typemap import TYPEMAP
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from placades.facades.buses.carrier import CarrierBus
+    from placades.facades.compansation.excess import Excess
+    from placades.facades.compansation.shortage import Shortage
+    from placades.facades.converters.Boiler import Boiler
+    from placades.facades.converters.ChpFixedRatio import ChpFixedRatio
+    from placades.facades.converters.ChpVariableRatio import ChpVariableRatio
+    from placades.facades.converters.DieselGenerator import DieselGenerator
+    from placades.facades.converters.ElectricalTransformator import (
+        ElectricalTransformator,
+    )
+    from placades.facades.converters.Electrolyzer import Electrolyzer
+    from placades.facades.converters.FuelCell import FuelCell
+    from placades.facades.converters.HeatPump import HeatPump
+    from placades.facades.demand.electricity_demand import Demand
+    from placades.facades.demand.fuel_demand import FuelDemand
+    from placades.facades.demand.heat_demand import HeatDemand
+    from placades.facades.demand.hydrogen_demand import H2Demand
+    from placades.facades.komponenten import CHP
+    from placades.facades.komponenten import Battery
+    from placades.facades.production.BiogasPlant import BiogasPlant
+    from placades.facades.production.GeothermalPlant import GeothermalPlant
+    from placades.facades.production.PvPlant import PvPlant
+    from placades.facades.production.SolarThermalPlant import SolarThermalPlant
+    from placades.facades.production.WindTurbine import WindTurbine
+    from placades.facades.providers.DSO_electricity import DsoElectricity
+    from placades.facades.providers.DSO_fuel import DsoFuel
+    from placades.facades.providers.DSO_heat import DsoHeat
+    from placades.facades.providers.DSO_hydrogen import DsoHydrogen
+    from placades.facades.storages.ElectricalStorage import ElectricalStorage
+    from placades.facades.storages.FuelStorage import FuelStorage
+    from placades.facades.storages.HydrogenStorage import HydrogenStorage
+    from placades.facades.storages.ThermalStorage import ThermalStorage
+    from placades.project import Project
+    from placades.typemap import TYPEMAP
+
+
+# Facades pull in oemof.solph, so they are only imported on first access
+_LAZY_ATTRIBUTES = {
+    "Battery": "placades.facades.komponenten",
+    "BiogasPlant": "placades.facades.production.BiogasPlant",
+    "Boiler": "placades.facades.converters.Boiler",
+    "CarrierBus": "placades.facades.buses.carrier",
+    "CHP": "placades.facades.komponenten",
+    "ChpFixedRatio": "placades.facades.converters.ChpFixedRatio",
+    "ChpVariableRatio": "placades.facades.converters.ChpVariableRatio",
+    "Demand": "placades.facades.demand.electricity_demand",
+    "DieselGenerator": "placades.facades.converters.DieselGenerator",
+    "DsoElectricity": "placades.facades.providers.DSO_electricity",
+    "DsoFuel": "placades.facades.providers.DSO_fuel",
+    "DsoHeat": "placades.facades.providers.DSO_heat",
+    "DsoHydrogen": "placades.facades.providers.DSO_hydrogen",
+    "ElectricalStorage": "placades.facades.storages.ElectricalStorage",
+    "ElectricalTransformator": "placades.facades.converters.ElectricalTransformator",
+    "Electrolyzer": "placades.facades.converters.Electrolyzer",
+    "Excess": "placades.facades.compansation.excess",
+    "FuelCell": "placades.facades.converters.FuelCell",
+    "FuelDemand": "placades.facades.demand.fuel_demand",
+    "FuelStorage": "placades.facades.storages.FuelStorage",
+    "GeothermalPlant": "placades.facades.production.GeothermalPlant",
+    "H2Demand": "placades.facades.demand.hydrogen_demand",
+    "HeatDemand": "placades.facades.demand.heat_demand",
+    "HeatPump": "placades.facades.converters.HeatPump",
+    "HydrogenStorage": "placades.facades.storages.HydrogenStorage",
+    "Project": "placades.project",
+    "PvPlant": "placades.facades.production.PvPlant",
+    "Shortage": "placades.facades.compansation.shortage",
+    "SolarThermalPlant": "placades.facades.production.SolarThermalPlant",
+    "ThermalStorage": "placades.facades.storages.ThermalStorage",
+    "TYPEMAP": "placades.typemap",
+    "WindTurbine": "placades.facades.production.WindTurbine",
+}
 
 __all__ = [
     "CHP",
@@ -69,3 +110,20 @@ __all__ = [
     "ThermalStorage",
     "WindTurbine",
 ]
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg) from None
+    from placades.profiling import watch  # noqa: PLC0415
+
+    value = watch(getattr(importlib.import_module(module), name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,5 @@
+import sys
+
+from placades.cli import main
+
+sys.exit(main())
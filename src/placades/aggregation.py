@@ -0,0 +1,470 @@
+import logging
+import time
+import warnings
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from oemof.solph import Model
+from oemof.solph.components import GenericStorage
+from oemof.tools.debugging import ExperimentalFeatureWarning
+from pyomo.environ import Constraint
+from pyomo.environ import Var
+
+from placades.timeseries import replaced_sequences
+from placades.timeseries import sequence_slots
+from placades.timeseries import share_nodes
+
+Aggregation = namedtuple(
+    "Aggregation", ["order", "representatives", "weights", "timesteps"]
+)
+
+
+def cluster_periods(profiles, n_periods, timesteps_per_period=24):
+    """
+    Cluster the periods of profiles into typical periods.
+
+    The periods (e.g. days) are clustered by all min-max normalised profiles
+    at once with the hierarchical method of Ward. Every cluster is
+    represented by its medoid, i.e. the original period closest to all
+    others of the cluster, so the typical periods are consistent real
+    periods of all profiles.
+
+    Parameters
+    ----------
+    profiles : array-like
+        Profiles as columns, the number of rows has to be a multiple of
+        ``timesteps_per_period``
+    n_periods : int
+        Number of typical periods
+    timesteps_per_period : int, default=24
+        Time steps per period
+
+    Returns
+    -------
+    Aggregation : the typical period of every original period ("order"),
+        the original period represented by every typical period
+        ("representatives") and the number of periods represented by every
+        typical period ("weights")
+
+    Examples
+    --------
+    >>> days = [[0, 1], [0, 1], [5, 6], [0, 1.1]]
+    >>> aggregation = cluster_periods(
+    ...     np.ravel(days)[:, None], 2, timesteps_per_period=2
+    ... )
+    >>> aggregation.order.tolist()
+    [0, 0, 1, 0]
+    >>> aggregation.weights.tolist()
+    [3, 1]
+    """
+    values = np.asarray(profiles, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    timesteps, columns = values.shape
+    if timesteps % timesteps_per_period:
+        msg = (
+            f"The {timesteps} time steps cannot be split into periods of"
+            f" {timesteps_per_period} time steps."
+        )
+        raise ValueError(msg)
+    periods = timesteps // timesteps_per_period
+    if not 0 < n_periods <= periods:
+        msg = f"The number of typical periods has to be in [1, {periods}]."
+        raise ValueError(msg)
+
+    span = np.ptp(values, axis=0)
+    normalised = (values - values.min(axis=0)) / np.where(span, span, 1)
+    features = normalised.reshape(periods, timesteps_per_period * columns)
+    if n_periods == periods:
+        labels = np.arange(periods)
+    else:
+        # scipy is imported here, as it is only needed to cluster
+        from scipy.cluster.hierarchy import fcluster  # noqa: PLC0415
+        from scipy.cluster.hierarchy import linkage  # noqa: PLC0415
+
+        labels = fcluster(
+            linkage(features, method="ward"), n_periods, criterion="maxclust"
+        )
+
+    # number the typical periods by their first occurrence
+    _, first, inverse = np.unique(
+        labels, return_index=True, return_inverse=True
+    )
+    rank = np.argsort(np.argsort(first))
+    order = rank[inverse]
+    representatives = np.empty(len(first), dtype=np.intp)
+    for cluster in range(len(first)):
+        members = np.flatnonzero(order == cluster)
+        distances = (
+            (features[members, None, :] - features[None, members, :]) ** 2
+        ).sum(axis=(1, 2))
+        representatives[cluster] = members[np.argmin(distances)]
+    return Aggregation(
+        order,
+        representatives,
+        np.bincount(order, minlength=len(first)),
+        timesteps_per_period,
+    )
+
+
+def aggregate(values, aggregation):
+    """
+    Return the typical periods of profiles one after another.
+
+    Examples
+    --------
+    >>> aggregation = Aggregation(None, np.array([2, 0]), None, 2)
+    >>> aggregate(np.array([1, 2, 3, 4, 5, 6]), aggregation).tolist()
+    [5, 6, 1, 2]
+    """
+    values = np.asarray(values)
+    periods = values.reshape(-1, aggregation.timesteps, *values.shape[1:])
+    return periods[aggregation.representatives].reshape(-1, *values.shape[1:])
+
+
+def disaggregate(values, aggregation):
+    """
+    Map the typical periods back to the original periods.
+
+    Examples
+    --------
+    >>> aggregation = Aggregation(np.array([0, 1, 0]), None, None, 2)
+    >>> disaggregate(np.array([1, 2, 3, 4]), aggregation).tolist()
+    [1, 2, 3, 4, 1, 2]
+    """
+    values = np.asarray(values)
+    periods = values.reshape(-1, aggregation.timesteps, *values.shape[1:])
+    return periods[aggregation.order].reshape(-1, *values.shape[1:])
+
+
+def aggregation_errors(profiles, aggregation):
+    """
+    Compare profiles with their aggregated and disaggregated profiles.
+
+    Returns
+    -------
+    pandas.DataFrame : per profile the root mean square error ("rmse"), the
+        mean absolute error ("mae") and the root mean square error of the
+        sorted values ("duration_rmse"), all relative to the range of the
+        profile, and the relative deviation of the sum ("sum_deviation")
+    """
+    profiles = pd.DataFrame(profiles)
+    values = profiles.to_numpy(dtype=np.float64)
+    approximated = disaggregate(aggregate(values, aggregation), aggregation)
+    span = np.ptp(values, axis=0)
+    span = np.where(span, span, 1)
+    total = values.sum(axis=0)
+    return pd.DataFrame(
+        {
+            "rmse": np.sqrt(((approximated - values) ** 2).mean(axis=0))
+            / span,
+            "mae": np.abs(approximated - values).mean(axis=0) / span,
+            "duration_rmse": np.sqrt(
+                (
+                    (np.sort(approximated, axis=0) - np.sort(values, axis=0))
+                    ** 2
+                ).mean(axis=0)
+            )
+            / span,
+            "sum_deviation": (approximated.sum(axis=0) - total)
+            / np.where(total, total, 1),
+        },
+        index=profiles.columns,
+    )
+
+
+def collect_profiles(energy_system):
+    """
+    Return all profiles of the flows and nodes of an energy system.
+
+    Sequences of the length of the time index are collected, e.g. demands,
+    PV and wind profiles or the conversion factors of a heat pump with a
+    COP series. Profiles used by several facades are only returned once.
+    """
+    timesteps = len(energy_system.timeindex) - 1
+    profiles = {}
+    seen = set()
+    for slot in sequence_slots(energy_system):
+        values = slot.container[slot.key]
+        if not isinstance(values, np.ndarray) or values.ndim != 1:
+            continue
+        if len(values) != timesteps:
+            msg = (
+                f"The sequence {slot.name} with {len(values)} values cannot be"
+                f" aggregated, only sequences of the {timesteps} time steps."
+            )
+            raise ValueError(msg)
+        if id(values) not in seen:
+            seen.add(id(values))
+            profiles[slot.name] = values
+    return pd.DataFrame(profiles, index=energy_system.timeindex[:-1])
+
+
+class _TypicalPeriodModel(Model):
+    """
+    Model of oemof.solph without the storage level bounds per time step.
+
+    oemof.solph bounds the storage content of every original time step in
+    the time series aggregation mode, so the model still grows with the
+    whole time index. They are replaced by :func:`_bound_storage_levels`.
+
+    The bounds are built for the time steps of ``TIMEINDEX_CLUSTER``, which
+    is emptied after oemof.solph created its sets. This relies on the
+    private methods of oemof.solph 0.6, the version placades is pinned to.
+    """
+
+    def _add_parent_block_sets(self):
+        super()._add_parent_block_sets()
+        self.TIMEINDEX_CLUSTER = []
+
+
+def _storage_blocks(model):
+    for name, storages in (
+        ("GenericStorageBlock", "STORAGES"),
+        ("GenericInvestmentStorageBlock", "INVESTSTORAGES"),
+    ):
+        block = getattr(model, name, None)
+        if block is not None:
+            yield block, list(getattr(block, storages))
+
+
+def _bound_storage_levels(model, aggregation):
+    """
+    Bound the storage content per original period.
+
+    The highest and the lowest intra-period content of every typical period
+    are variables, so the content is bounded by one constraint per original
+    period and bound (see https://doi.org/10.1016/j.apenergy.2018.01.023).
+    The bounds are exact for storages without losses and slightly
+    conservative otherwise.
+    """
+    steps = aggregation.timesteps
+    typical = range(len(aggregation.representatives))
+    for block, storages in _storage_blocks(model):
+        if not storages:
+            continue
+
+        def capacity(n, block=block):
+            if getattr(n, "investment", None) is None:
+                return n.nominal_storage_capacity
+            return block.total[n, 0]
+
+        block.intra_maximum = Var(storages, typical)
+        block.intra_minimum = Var(storages, typical)
+        block.intra_maximum_level = Constraint(
+            storages,
+            typical,
+            range(steps + 1),
+            rule=lambda b, n, k, g: (
+                b.intra_storage_delta[n, 0, k, g] <= b.intra_maximum[n, k]
+            ),
+        )
+        block.intra_minimum_level = Constraint(
+            storages,
+            typical,
+            range(steps + 1),
+            rule=lambda b, n, k, g: (
+                b.intra_storage_delta[n, 0, k, g] >= b.intra_minimum[n, k]
+            ),
+        )
+
+        def maximum_rule(b, n, i, capacity=capacity):
+            k = aggregation.order[i]
+            level = min(
+                n.max_storage_level[k * steps + g] for g in range(steps)
+            )
+            return (
+                b.inter_storage_content[n, i] + b.intra_maximum[n, k]
+                <= capacity(n) * level
+            )
+
+        def minimum_rule(b, n, i, capacity=capacity):
+            k = aggregation.order[i]
+            level = max(
+                n.min_storage_level[k * steps + g] for g in range(steps)
+            )
+            decay = (1 - n.loss_rate[k * steps]) ** (
+                steps * model.timeincrement[k * steps]
+            )
+            return (
+                b.inter_storage_content[n, i] * decay + b.intra_minimum[n, k]
+                >= capacity(n) * level
+            )
+
+        periods = range(len(aggregation.order))
+        block.storage_period_maximum_level = Constraint(
+            storages, periods, rule=maximum_rule
+        )
+        block.storage_period_minimum_level = Constraint(
+            storages, periods, rule=minimum_rule
+        )
+
+
+def _balance_investment_storages(model, aggregation):
+    """
+    Add the balance of investment storages missing in oemof.solph.
+
+    oemof.solph only links the last to the first storage content of
+    balanced storages with optimised capacity without time series
+    aggregation.
+    """
+    block = getattr(model, "GenericInvestmentStorageBlock", None)
+    if block is None:
+        return
+    last = len(aggregation.order)
+    block.balanced_inter_storage = Constraint(
+        [n for n in block.INVESTSTORAGES if n.balanced],
+        rule=lambda b, n: (
+            b.inter_storage_content[n, last] == b.inter_storage_content[n, 0]
+        ),
+    )
+
+
+def _storage_content(model, storage, aggregation):
+    """Combine the inter- and intra-period content of a storage."""
+    if getattr(storage, "investment", None) is None:
+        block = model.GenericStorageBlock
+    else:
+        block = model.GenericInvestmentStorageBlock
+    inter = np.array(
+        [
+            block.inter_storage_content[storage, i].value
+            for i in range(len(aggregation.order) + 1)
+        ]
+    )
+    intra = np.array(
+        [
+            [
+                block.intra_storage_delta[storage, 0, k, g].value
+                for g in range(aggregation.timesteps)
+            ]
+            for k in range(len(aggregation.representatives))
+        ]
+    )
+    decay = (1 - storage.loss_rate[0]) ** (
+        np.arange(aggregation.timesteps) * model.timeincrement[0]
+    )
+    content = inter[:-1, None] * decay + intra[aggregation.order]
+    return np.append(content.ravel(), inter[-1])
+
+
+def solve_aggregated(
+    energy_system,
+    n_periods,
+    timesteps_per_period=24,
+    solver="cbc",
+    cmdline_options=None,
+):
+    """
+    Solve an energy system on typical periods.
+
+    All profiles of the facades are clustered into ``n_periods`` typical
+    periods by :func:`cluster_periods`. The model is built only for the
+    typical periods, weighted by the number of periods they represent, in
+    the time series aggregation mode of oemof.solph. The storage content is
+    linked between the original periods, so seasonal storage is possible.
+    The results are mapped back to the whole time index.
+
+    The size of the model and the solver time shrink roughly by
+    ``periods / n_periods``, at the costs of the accuracy shown by the
+    reported errors.
+
+    Parameters
+    ----------
+    energy_system : oemof.solph.EnergySystem
+        Energy system with a regular time index
+    n_periods : int
+        Number of typical periods
+    timesteps_per_period : int, default=24
+        Time steps per period
+    solver : str, default="cbc"
+        Solver used by oemof.solph
+    cmdline_options : dict or None, default=None
+        Options of the solver
+
+    Returns
+    -------
+    dict : the "flow" and "storage_content" tables of the whole time index,
+        the optimised capacities ("invest") and the "objective" of the
+        aggregated model, the "aggregation" and the "errors" of the profiles
+        (see :func:`aggregation_errors`)
+    """
+    profiles = collect_profiles(energy_system)
+    aggregation = cluster_periods(profiles, n_periods, timesteps_per_period)
+    errors = aggregation_errors(profiles, aggregation)
+    logging.info(
+        "%s periods aggregated to %s typical periods, maximal rmse %.3f",
+        len(aggregation.order),
+        n_periods,
+        errors["rmse"].max(),
+    )
+    timeindex = energy_system.timeindex
+    freq = timeindex.freq or pd.infer_freq(timeindex)
+    timesteps = n_periods * timesteps_per_period
+    aggregated = {}
+
+    def replace(_, values):
+        if not isinstance(values, np.ndarray) or values.ndim != 1:
+            return values
+        if id(values) not in aggregated:
+            aggregated[id(values)] = aggregate(values, aggregation)
+        return aggregated[id(values)]
+
+    start = time.perf_counter()
+    with (
+        replaced_sequences(energy_system, replace),
+        warnings.catch_warnings(),
+    ):
+        warnings.simplefilter("ignore", ExperimentalFeatureWarning)
+        system = share_nodes(
+            energy_system,
+            timeindex=pd.date_range(
+                timeindex[0], periods=timesteps + 1, freq=freq
+            ),
+            infer_last_interval=False,
+            tsa_parameters={
+                "timesteps_per_period": timesteps_per_period,
+                "order": aggregation.order.tolist(),
+            },
+        )
+        model = _TypicalPeriodModel(energysystem=system)
+        _bound_storage_levels(model, aggregation)
+        _balance_investment_storages(model, aggregation)
+        results = model.solve(
+            solver=solver, cmdline_options=cmdline_options or {}
+        )
+        flows = list(model.FLOWS)
+        flow_values = np.fromiter(
+            (variable.value for variable in model.flow.values()),
+            dtype=np.float64,
+            count=len(flows) * timesteps,
+        ).reshape(len(flows), timesteps)
+        storages = [
+            node for node in system.nodes if isinstance(node, GenericStorage)
+        ]
+        storage_content = {
+            storage: _storage_content(model, storage, aggregation)
+            for storage in storages
+        }
+        invest = results.get("invest") if "invest" in results else None
+    logging.info(
+        "Aggregated model solved in %.1f s", time.perf_counter() - start
+    )
+
+    return {
+        "flow": pd.DataFrame(
+            disaggregate(flow_values.T, aggregation),
+            index=timeindex[:-1],
+            columns=pd.MultiIndex.from_tuples(flows),
+        ),
+        "storage_content": pd.DataFrame(
+            storage_content,
+            index=timeindex,
+            columns=pd.Index(storages, dtype=object),
+        ),
+        "invest": invest,
+        "objective": results["objective"],
+        "aggregation": aggregation,
+        "errors": errors,
+    }
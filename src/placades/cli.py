@@ -0,0 +1,115 @@
+import argparse
+import logging
+import sys
+
+from placades.runner import run_scenarios
+
+
+def create_parser():
+    parser = argparse.ArgumentParser(
+        prog="placades",
+        description="Build and solve energy systems from datapackages.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser(
+        "run",
+        help="Solve datapackages in parallel.",
+        description=(
+            "Solve all datapackages found in the given directories, glob "
+            "patterns or datapackage.json files, each in its own process."
+        ),
+    )
+    run.add_argument("paths", nargs="+", help="directories, globs or files")
+    run.add_argument(
+        "-o",
+        "--output-dir",
+        default="results",
+        help="directory of the results (default: %(default)s)",
+    )
+    run.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of processes (default: cores / solver threads)",
+    )
+    run.add_argument(
+        "-s",
+        "--solver",
+        default="cbc",
+        help="solver used by oemof.solph (default: %(default)s)",
+    )
+    run.add_argument(
+        "-t",
+        "--solver-threads",
+        type=int,
+        default=1,
+        help="threads of the solver per scenario (default: %(default)s)",
+    )
+    run.add_argument(
+        "--cache-dir",
+        default=None,
+        help="directory of the memory-mapped sequence cache",
+    )
+    run.add_argument(
+        "-r",
+        "--resolution",
+        default=None,
+        help="coarser time resolution for screening, e.g. 4h or 1D",
+    )
+    run.add_argument(
+        "-f",
+        "--format",
+        choices=["csv", "parquet", "arrow"],
+        default="csv",
+        help="format of the results (default: %(default)s)",
+    )
+    run.add_argument(
+        "--profile",
+        action="store_true",
+        help="write the timings and model size to profile.json",
+    )
+    run.add_argument("-v", "--verbose", action="store_true")
+    return parser
+
+
+def main(argv=None):
+    """
+    Entry point of the ``placades`` command.
+
+    Examples
+    --------
+    .. code-block:: console
+
+        $ placades run scenarios/ -o results -j 8 --solver-threads 2
+    """
+    args = create_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+    results = run_scenarios(
+        args.paths,
+        args.output_dir,
+        workers=args.workers,
+        solver=args.solver,
+        solver_threads=args.solver_threads,
+        cache_dir=args.cache_dir,
+        resolution=args.resolution,
+        results_format=args.format,
+        profile=args.profile,
+    )
+    failed = [result for result in results if result.status != "optimal"]
+    for result in results:
+        print(
+            f"{result.name}: {result.status}, objective={result.objective}, "
+            f"{result.seconds:.1f} s"
+        )
+    if failed:
+        print(f"{len(failed)} of {len(results)} scenarios failed.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
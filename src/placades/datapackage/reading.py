@@ -0,0 +1,395 @@
+import json
+import re
+import warnings
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from placades.file_cache import cache_files
+from placades.file_cache import load_meta
+from placades.file_cache import save_array
+from placades.file_cache import store_meta
+from placades.profiling import count
+from placades.profiling import instrument
+from placades.profiling import stage
+from placades.timeseries import resample
+from placades.typemap import TYPEMAP
+
+try:
+    from oemof.datapackage.datapackage import reading
+except ModuleNotFoundError:
+    reading = None
+
+SEQUENCE_PATH = re.compile(r"^data/sequences/.*$")
+ELEMENT_PATH = re.compile(r"^data/elements/.*$")
+
+# Resources with a special meaning for oemof.datapackage
+OEMOF_RESOURCES = ("elements", "hubs", "components", "periods", "temporal")
+
+# Columns of the facades that define their equivalent periodical costs
+EPC_COLUMNS = ("capex_var", "lifetime", "age_installed")
+
+
+@instrument
+def load_sequences(path, cache_dir=None):
+    """
+    Load a sequences csv file of a datapackage as read-only columns.
+
+    The file is parsed by the C reader of pandas into one column-major
+    array, so every column is a contiguous, zero-copy view.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Path to the csv file, the first column has to be the "timeindex".
+    cache_dir : str or pathlib.Path or None, default=None
+        Directory of the binary cache. If given, the columns are stored
+        there as .npy file and memory-mapped on the next load of the same
+        file. The cache is validated by the modification time and the
+        content hash of the csv file.
+
+    Returns
+    -------
+    tuple : timeindex (pandas.DatetimeIndex) and a dictionary of the
+        column names mapped to read-only numpy arrays
+
+    Examples
+    --------
+    >>> timeindex, columns = load_sequences(
+    ...     "examples/simple_dispatch/openPlan_package/data/sequences/"
+    ...     "profiles.csv"
+    ... )
+    >>> sorted(columns)
+    ['electricity_demand.csv', 'pv_profile.csv', 'wind_profile.csv']
+    >>> len(timeindex) == len(columns["pv_profile.csv"])
+    True
+    >>> columns["pv_profile.csv"].flags.writeable
+    False
+    """
+    if cache_dir is None:
+        timeindex, columns = _read_sequences(path)
+    else:
+        timeindex, columns = _load_sequences_cached(path, cache_dir)
+    count("sequence_columns", len(columns))
+    return timeindex, columns
+
+
+def _read_sequences(path):
+    table = pd.read_csv(path, index_col="timeindex", parse_dates=True)
+    values = np.asfortranarray(table.to_numpy(dtype=np.float64))
+    values.flags.writeable = False
+    return table.index, _split_columns(values, table.columns)
+
+
+def _split_columns(values, names):
+    return {name: values[:, number] for number, name in enumerate(names)}
+
+
+def _load_sequences_cached(path, cache_dir):
+    source, data_file, index_file, meta_file = cache_files(
+        path, cache_dir, ".npy", "-timeindex.npy", ".json"
+    )
+
+    if data_file.exists() and index_file.exists():
+        meta = load_meta(meta_file, source)
+        if meta is not None:
+            timeindex = pd.DatetimeIndex(np.load(index_file), name="timeindex")
+            values = np.load(data_file, mmap_mode="r")
+            return timeindex, _split_columns(values, meta["columns"])
+
+    timeindex, columns = _read_sequences(source)
+    save_array(
+        data_file, np.asfortranarray(np.column_stack(list(columns.values())))
+    )
+    save_array(index_file, timeindex.to_numpy())
+    store_meta(meta_file, source, columns=list(columns))
+    return timeindex, columns
+
+
+def _is_sequence_resource(resource):
+    path = resource.descriptor["path"]
+    return (
+        isinstance(path, str)
+        and SEQUENCE_PATH.match(path) is not None
+        and resource.local
+    )
+
+
+def deserialize_energy_system(
+    cls, path, typemap=None, attributemap=None, cache_dir=None
+):
+    """
+    Create an energy system from a datapackage of facades.
+
+    Works like ``deserialize_energy_system`` of oemof.datapackage, but the
+    sequences are read with :func:`load_sequences` and handed to the facades
+    as read-only numpy arrays instead of parsing the csv file row by row
+    once for every column. The equivalent periodical costs of all optimised
+    assets of a project are calculated in one go with
+    :meth:`placades.Project.precalculate_epc` before the facades are
+    created. Packages using more than facades and local
+    sequences, i.e. the "elements", "hubs", "components", "periods" or
+    "temporal" resources or multipart or remote sequences, are read by
+    oemof.datapackage.
+
+    Parameters
+    ----------
+    cls : type
+        Class of the energy system, e.g. :class:`oemof.solph.EnergySystem`
+    path : str or pathlib.Path
+        Path to the datapackage.json
+    typemap : dict or None, default=None
+        Type names mapped to facade classes
+    attributemap : dict or None, default=None
+        Renamed facade arguments per class
+    cache_dir : str or pathlib.Path or None, default=None
+        Directory of the binary sequence cache, see :func:`load_sequences`
+
+    Returns
+    -------
+    cls : the energy system with all facades
+    """
+    _check_reading()
+    typemap = {} if typemap is None else typemap
+    attributemap = {} if attributemap is None else attributemap
+    path = Path(path)
+    descriptor = json.loads(path.read_text())
+
+    # the references of facades to sequences are no real foreign keys, as
+    # they lack the fields of the referenced resource
+    sequence_names = {
+        r["name"] for r in descriptor["resources"] if "sequences" in r["path"]
+    }
+    sequence_foreign_keys = {}
+    for resource in descriptor["resources"]:
+        foreign_keys = resource["schema"].get("foreignKeys", [])
+        sequence_foreign_keys[resource["name"]] = [
+            fk
+            for fk in foreign_keys
+            if fk["reference"]["resource"] in sequence_names
+        ]
+        resource["schema"]["foreignKeys"] = [
+            fk
+            for fk in foreign_keys
+            if fk["reference"]["resource"] not in sequence_names
+        ]
+    package = reading.dp.Package(descriptor, base_path=str(path.parent))
+
+    sequences = [r for r in package.resources if _matches(r, SEQUENCE_PATH)]
+    if (
+        not sequences
+        or not all(_is_sequence_resource(r) for r in sequences)
+        or any(package.get_resource(name) for name in OEMOF_RESOURCES)
+    ):
+        with warnings.catch_warnings():
+            warnings.filterwarnings(
+                "ignore",
+                message=r"The instance of the .* does not inherit from "
+                r"oemof\.network\.Node",
+                category=UserWarning,
+            )
+            return reading.deserialize_energy_system(
+                cls, str(path), typemap=typemap, attributemap=attributemap
+            )
+
+    data = {}
+    timeindices = []
+    for resource in sequences:
+        timeindex, data[resource.name] = load_sequences(
+            resource.source, cache_dir
+        )
+        timeindices.append(timeindex)
+    if not all(index.equals(timeindices[0]) for index in timeindices):
+        msg = "Timeindices in resources differ!"
+        raise ValueError(msg)
+
+    objects = {}
+
+    def create(facade_class, init, attributes):
+        init.pop("type")
+        if issubclass(facade_class, reading.Node):
+            init = reading.remap(init, attributemap, facade_class)
+        instance = facade_class(**init)
+        for key, value in reading.remap(
+            attributes, attributemap, facade_class
+        ).items():
+            if not hasattr(instance, key):
+                setattr(instance, key, value)
+        name = getattr(instance, "name", getattr(instance, "label", None))
+        if name is not None:
+            objects[name] = instance
+        return instance
+
+    tables = []
+    for resource in package.resources:
+        if not _matches(resource, ELEMENT_PATH):
+            continue
+        try:
+            rows = resource.read(keyed=True, relations=True)
+        except reading.dp.exceptions.DataPackageException as e:
+            msg = (
+                f"Could not read data for resource with name "
+                f"`{resource.name}`. Maybe wrong foreign keys?\n"
+                f"Exception was: {e}"
+            )
+            raise reading.dp.exceptions.LoadError(msg) from e
+        foreign_keys = {
+            fk["fields"]: fk["reference"]
+            for fk in resource.descriptor["schema"].get("foreignKeys", [])
+            + sequence_foreign_keys[resource.name]
+        }
+        tables.append((rows, foreign_keys))
+
+    for rows, foreign_keys in tables:
+        for field, reference in foreign_keys.items():
+            referenced = package.get_resource(reference["resource"])
+            if referenced is None or _matches(referenced, ELEMENT_PATH):
+                continue
+            for row in rows:
+                _create_referenced_object(
+                    row[field], reference, typemap, create, objects
+                )
+            _precalculate_epc(rows, field, reference, objects)
+
+    facades = {}
+    for rows, foreign_keys in tables:
+        for row in rows:
+            reading.read_facade(
+                {
+                    key: float(value) if isinstance(value, Decimal) else value
+                    for key, value in row.items()
+                },
+                facades,
+                create,
+                typemap,
+                data,
+                objects,
+                set(data),
+                foreign_keys,
+                package.get_resource,
+            )
+
+    energy_system = cls(
+        timeindex=pd.DatetimeIndex(
+            timeindices[0].values,
+            freq=timeindices[0].inferred_freq,
+            name="timeindex",
+        ),
+        periods=None,
+    )
+    energy_system.add(*facades.values())
+    energy_system.typemap = typemap
+    return energy_system
+
+
+def _create_referenced_object(row, reference, typemap, create, objects):
+    # Objects referenced by facades that are no nodes, e.g. the project,
+    # are created before the facades. oemof.datapackage would create them
+    # with the first facade and warn that they are no part of the energy
+    # system.
+    if not isinstance(row, dict) or row[reference["fields"]] in objects:
+        return
+    mapping = typemap.get(str(row.get("type")).strip())
+    if mapping is None or issubclass(mapping, reading.Node):
+        return
+    row = dict(row)
+    create(mapping, row, row)
+
+
+def _precalculate_epc(rows, field, reference, objects):
+    # The equivalent periodical costs of all optimised assets of a project
+    # are calculated in one vectorised call, the facades look them up.
+    assets = {}
+    for row in rows:
+        if row.get("optimize_cap") is not True or not isinstance(
+            row[field], dict
+        ):
+            continue
+        project = objects.get(row[field][reference["fields"]])
+        values = [row.get(column) for column in EPC_COLUMNS]
+        if hasattr(project, "precalculate_epc") and None not in values:
+            assets.setdefault(id(project), (project, []))[1].append(values)
+    for project, values in assets.values():
+        project.precalculate_epc(*np.array(values, dtype=float).T)
+
+
+def _matches(resource, pattern):
+    path = resource.descriptor["path"]
+    paths = path if isinstance(path, list) else [path]
+    return all(pattern.match(p) is not None for p in paths)
+
+
+def _check_reading():
+    if reading is None:
+        msg = (
+            "To read datapackages the package oemof.datapackage is needed."
+            "\nUse `pip install oemof.datapackage` to install it."
+        )
+        raise ModuleNotFoundError(msg)
+
+
+def from_datapackage(
+    path,
+    typemap=None,
+    attributemap=None,
+    cache_dir=None,
+    resolution=None,
+):
+    """
+    Create an energy system from a datapackage.
+
+    The sequences are read with :func:`deserialize_energy_system`, so with
+    a ``cache_dir`` the profiles are converted to .npy files once and
+    memory-mapped by all further scenarios using them.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Path to the datapackage.json
+    typemap : dict or None, default=None
+        Type names mapped to facade classes, defaults to
+        :data:`placades.TYPEMAP`
+    attributemap : dict or None, default=None
+        Renamed facade arguments per class
+    cache_dir : str or pathlib.Path or None, default=None
+        Directory of the binary sequence cache
+    resolution : str or None, default=None
+        Coarser time resolution, e.g. "4h" or "1D", to screen options
+        quickly, see :func:`placades.timeseries.resample`
+
+    Returns
+    -------
+    oemof.solph.EnergySystem
+
+    Examples
+    --------
+    >>> es = from_datapackage(
+    ...     "examples/simple_dispatch/openPlan_package/datapackage.json"
+    ... )
+    >>> len(es.timeindex)
+    8760
+    >>> es = from_datapackage(
+    ...     "examples/simple_dispatch/openPlan_package/datapackage.json",
+    ...     resolution="1D",
+    ... )
+    >>> len(es.timeindex)
+    366
+    """
+    from oemof.solph import EnergySystem  # noqa: PLC0415
+
+    if typemap is None:
+        typemap = TYPEMAP.copy()
+    with stage("read_datapackage"):
+        energy_system = deserialize_energy_system(
+            EnergySystem,
+            path,
+            typemap=typemap,
+            attributemap=attributemap,
+            cache_dir=cache_dir,
+        )
+    if resolution is not None:
+        with stage("resample"):
+            energy_system = resample(energy_system, resolution)
+    return energy_system
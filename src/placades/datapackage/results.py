@@ -0,0 +1,581 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ModuleNotFoundError:
+    pa = None
+
+# File extension of the supported formats
+FORMATS = {"parquet": "parquet", "arrow": "arrow"}
+
+# Tables exported by default
+RESULT_KEYS = ("flow", "storage_content", "invest")
+
+# Sidecar of exported results, which maps the identifiers to the nodes
+LABELS_FILE = "labels.json"
+
+
+def _check_pyarrow():
+    if pa is None:
+        msg = (
+            "To write columnar results the package pyarrow is needed."
+            "\nUse `pip install pyarrow` to install it."
+        )
+        raise ModuleNotFoundError(msg)
+
+
+def _check_format(format):
+    if format not in FORMATS:
+        msg = f"The format has to be one of {list(FORMATS)}, got {format!r}."
+        raise ValueError(msg)
+
+
+def component_id(node):
+    """
+    Return a clean identifier of a node.
+
+    Subnodes of facades are named by the identifier of their parent and
+    their local name, joined by a dot, instead of their tuple label.
+
+    Examples
+    --------
+    >>> from placades import CarrierBus
+    >>> from placades import DsoElectricity
+    >>> dso = DsoElectricity(name="dso", bus_electricity=CarrierBus("el"))
+    >>> [component_id(node) for node in dso.subnodes][:2]
+    ['dso.internal_bus', 'dso.feedin_converter']
+    >>> component_id("pv")
+    'pv'
+    """
+    parent = getattr(node, "parent", None)
+    label = getattr(node, "label", node)
+    if parent is None:
+        return str(label)
+    local_name = label[0] if isinstance(label, tuple) else label
+    return f"{component_id(parent)}.{local_name}"
+
+
+def nodes_of(tables):
+    """Return the nodes of the columns of result tables and their parents."""
+    nodes = {}
+    for table in tables:
+        for column in getattr(table, "columns", ()):
+            for node in column if isinstance(column, tuple) else (column,):
+                while hasattr(node, "label") and id(node) not in nodes:
+                    nodes[id(node)] = node
+                    node = getattr(node, "parent", None)
+    return list(nodes.values())
+
+
+def write_labels(nodes, output_dir):
+    """
+    Write the sidecar of exported results, see :func:`read_labels`.
+
+    Returns
+    -------
+    pathlib.Path : the written file
+    """
+    labels = {}
+    for node in nodes:
+        parent = getattr(node, "parent", None)
+        facade = node
+        while getattr(facade, "parent", None) is not None:
+            facade = facade.parent
+        labels[component_id(node)] = {
+            "label": str(node.label),
+            "type": type(node).__name__,
+            "parent": None if parent is None else component_id(parent),
+            "facade": component_id(facade),
+            "facade_type": type(facade).__name__,
+            "carrier": getattr(node, "carrier", None),
+        }
+    path = Path(output_dir, LABELS_FILE)
+    path.write_text(json.dumps(labels, indent=1))
+    return path
+
+
+def read_labels(path):
+    """
+    Read the labels of exported results.
+
+    Every node of the exported tables is identified by its
+    :func:`component_id`. The sidecar "labels.json" holds the original
+    "label" of every identifier (the column names of the csv results), the
+    class of the node ("type"), the identifier of its "parent", of its
+    top-level "facade" and the class of the facade ("facade_type") and the
+    "carrier" of buses. The nodes of the results are thus known without
+    building the energy system again.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        "labels.json" or the directory of the results
+
+    Returns
+    -------
+    pandas.DataFrame : the labels with the identifiers as index
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> from placades import CarrierBus
+    >>> from placades import DsoElectricity
+    >>> bus = CarrierBus(name="el", carrier="electricity")
+    >>> dso = DsoElectricity(name="dso", bus_electricity=bus)
+    >>> flow = pd.DataFrame(
+    ...     columns=pd.MultiIndex.from_tuples([(dso.subnodes[3], bus)])
+    ... )
+    >>> with tempfile.TemporaryDirectory() as path:
+    ...     _ = write_labels(nodes_of([flow]), path)
+    ...     labels = read_labels(path)
+    >>> labels.index.tolist()
+    ['dso.consumption_converter', 'dso', 'el']
+    >>> labels.loc["dso.consumption_converter", ["label", "type"]].tolist()
+    ["('consumption_converter', 'dso')", 'Converter']
+    >>> labels.loc["el", ["facade_type", "carrier"]].tolist()
+    ['CarrierBus', 'electricity']
+    """
+    path = Path(path)
+    if path.is_dir():
+        path = Path(path, LABELS_FILE)
+    labels = pd.DataFrame.from_dict(
+        json.loads(path.read_text()),
+        orient="index",
+        columns=[
+            "label",
+            "type",
+            "parent",
+            "facade",
+            "facade_type",
+            "carrier",
+        ],
+    )
+    labels.index.name = "id"
+    return labels
+
+
+def _dictionary(codes, names):
+    return pa.DictionaryArray.from_arrays(
+        pa.array(codes, type=pa.int32(), mask=codes < 0),
+        pa.array(names, type=pa.string()),
+    )
+
+
+def _record_batches(table, batch_size):
+    """
+    Convert a wide result table to record batches of the long format.
+
+    Flows are identified by the "source" and the "target", other variables
+    (e.g. the content of a storage) only by the "source". The target of
+    nodes in tables of both (e.g. the investments) is null. The batches hold
+    whole columns of the table with about ``batch_size`` rows.
+    """
+    columns = table.columns
+    keys = [
+        (column[0], column[1]) if isinstance(column, tuple) else (column, None)
+        for column in columns
+    ]
+    sources = pd.Categorical([component_id(o) for o, _ in keys])
+    source_names, source_codes = sources.categories, sources.codes
+    targets = None
+    if any(i is not None for _, i in keys):
+        targets = pd.Categorical(
+            [None if i is None else component_id(i) for _, i in keys]
+        )
+        target_names, target_codes = targets.categories, targets.codes
+
+    index = table.index
+    if isinstance(index, pd.DatetimeIndex):
+        time_name = "timestamp"
+        time_values = pa.array(index.as_unit("us").to_numpy())
+    else:
+        time_name = "period"
+        time_values = pa.array(np.asarray(index, dtype=np.int64))
+    values = table.to_numpy(dtype=np.float64)
+    rows = len(index)
+    step = max(1, batch_size // max(rows, 1))
+    for start in range(0, len(columns), step):
+        stop = min(start + step, len(columns))
+        repeat = np.repeat(np.arange(start, stop), rows)
+        arrays = {"source": _dictionary(source_codes[repeat], source_names)}
+        if targets is not None:
+            arrays["target"] = _dictionary(target_codes[repeat], target_names)
+        arrays[time_name] = pa.concat_arrays([time_values] * (stop - start))
+        arrays["value"] = pa.array(values[:, start:stop].T.ravel())
+        yield pa.record_batch(arrays)
+
+
+def _write_table(table, path, format, compression, batch_size):
+    batches = _record_batches(table, batch_size)
+    first = next(batches, None)
+    if first is None:
+        return
+    temporary_file = path.with_suffix(f"{path.suffix}.tmp")
+    if format == "parquet":
+        writer = pq.ParquetWriter(
+            temporary_file, first.schema, compression=compression or "none"
+        )
+    else:
+        writer = pa.ipc.new_file(
+            temporary_file,
+            first.schema,
+            options=pa.ipc.IpcWriteOptions(compression=compression),
+        )
+    with writer:
+        writer.write_batch(first)
+        for batch in batches:
+            writer.write_batch(batch)
+    temporary_file.replace(path)
+
+
+def write_results(
+    results,
+    output_dir,
+    keys=RESULT_KEYS,
+    format="parquet",
+    compression="zstd",
+    batch_size=1_000_000,
+    labels=True,
+):
+    """
+    Write result tables in the long format as Parquet or Arrow IPC files.
+
+    Every table is written to "<output_dir>/<key>.parquet" (or ".arrow")
+    with one row per component and time step: the "source" and, for flows,
+    the "target" as dictionary encoded :func:`component_id`, the
+    "timestamp" (or the "period" of investments) and the "value". The rows
+    are streamed to the file in batches of about ``batch_size`` rows, so
+    only one batch is held in the long format. One directory per scenario
+    partitions a set of scenarios, see :func:`read_results` and
+    :class:`ResultStore`. The nodes of the tables are written to the sidecar
+    "labels.json", see :func:`read_labels`.
+
+    Parameters
+    ----------
+    results : oemof.solph.Results or dict
+        Results with the tables of ``keys`` as wide pandas.DataFrame, e.g.
+        also the results of :mod:`placades.rolling_horizon` and
+        :mod:`placades.aggregation`
+    output_dir : str or pathlib.Path
+        Directory of the files
+    keys : iterable, default=("flow", "storage_content", "invest")
+        Result tables to write, missing or empty tables are skipped
+    format : str, default="parquet"
+        "parquet" or "arrow" (Arrow IPC file)
+    compression : str or None, default="zstd"
+        Compression of the files, e.g. "zstd", "snappy" (Parquet only),
+        "lz4" or None
+    batch_size : int, default=1_000_000
+        Rows per written batch
+    labels : bool, default=True
+        Write the labels of the nodes
+
+    Returns
+    -------
+    list of pathlib.Path : the written files
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> from placades import CarrierBus
+    >>> from placades import DsoElectricity
+    >>> bus = CarrierBus(name="electricity")
+    >>> dso = DsoElectricity(name="dso", bus_electricity=bus)
+    >>> flow = pd.DataFrame(
+    ...     [[1.0, 0.0], [2.0, 0.5]],
+    ...     index=pd.date_range("2025", periods=2, freq="h"),
+    ...     columns=pd.MultiIndex.from_tuples(
+    ...         [(dso.subnodes[3], bus), (bus, dso.subnodes[1])]
+    ...     ),
+    ... )
+    >>> with tempfile.TemporaryDirectory() as path:
+    ...     files = write_results({"flow": flow}, path)
+    ...     table = read_results(path, "flow")
+    >>> [file.name for file in files]
+    ['flow.parquet', 'labels.json']
+    >>> table[["source", "target", "value"]]
+                          source                target  value
+    0  dso.consumption_converter           electricity    1.0
+    1  dso.consumption_converter           electricity    2.0
+    2                electricity  dso.feedin_converter    0.0
+    3                electricity  dso.feedin_converter    0.5
+    """
+    _check_pyarrow()
+    _check_format(format)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    files = []
+    tables = []
+    for key in keys:
+        if key not in results:
+            continue
+        table = results.get(key)
+        if not isinstance(table, pd.DataFrame) or table.empty:
+            continue
+        path = Path(output_dir, f"{key}.{FORMATS[format]}")
+        _write_table(table, path, format, compression, batch_size)
+        files.append(path)
+        tables.append(table)
+    if labels:
+        files.append(write_labels(nodes_of(tables), output_dir))
+    return files
+
+
+def read_results(
+    path,
+    key="flow",
+    scenarios=None,
+    format="parquet",
+    source=None,
+    target=None,
+):
+    """
+    Read a result table written by :func:`write_results`.
+
+    ``path`` is either the directory of one scenario or a directory of
+    scenario directories, e.g. the output directory of
+    :func:`placades.runner.run_scenarios`. In the latter case the name of
+    the scenario directory is added as column "scenario", and only the files
+    of the given ``scenarios`` are read. Only the rows of the given
+    ``source`` and ``target`` identifiers (or lists of them) are read from
+    the files.
+
+    Returns
+    -------
+    pandas.DataFrame : the table in the long format
+    """
+    _check_pyarrow()
+    _check_format(format)
+    path = Path(path)
+    file_name = f"{key}.{FORMATS[format]}"
+    dataset_format = "parquet" if format == "parquet" else "ipc"
+    expression = None
+    for column, selected in (("source", source), ("target", target)):
+        if selected is None:
+            continue
+        if isinstance(selected, str):
+            selected = [selected]
+        condition = ds.field(column).isin(list(selected))
+        expression = (
+            condition if expression is None else expression & condition
+        )
+    if Path(path, file_name).exists():
+        dataset = ds.dataset(Path(path, file_name), format=dataset_format)
+        return dataset.to_table(filter=expression).to_pandas()
+
+    files = sorted(path.glob(f"*/{file_name}"))
+    if scenarios is not None:
+        scenarios = set(scenarios)
+        files = [file for file in files if file.parent.name in scenarios]
+    if not files:
+        msg = f"No {file_name} found in {path}."
+        raise FileNotFoundError(msg)
+    dataset = ds.dataset(
+        [str(file) for file in files],
+        format=dataset_format,
+        partitioning=ds.DirectoryPartitioning(
+            pa.schema([("scenario", pa.string())])
+        ),
+        partition_base_dir=str(path),
+    )
+    return dataset.to_table(filter=expression).to_pandas()
+
+
+def _factorize(table, columns):
+    """
+    Return the unique rows of the columns of a long table as sorted
+    pandas.MultiIndex and the position of every row of the table in it.
+    """
+    codes = []
+    levels = []
+    for column in columns:
+        values = table[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.cat.remove_unused_categories()
+            if values.isna().any():
+                values = values.cat.add_categories("").fillna("")
+        code, uniques = pd.factorize(values, sort=True)
+        codes.append(code)
+        levels.append(pd.Index(np.asarray(uniques)))
+    shape = [len(level) for level in levels]
+    keys, positions = np.unique(
+        np.ravel_multi_index(codes, shape), return_inverse=True
+    )
+    index = pd.MultiIndex(
+        levels=levels, codes=np.unravel_index(keys, shape), names=columns
+    )
+    return positions, index
+
+
+def _unnamed(index):
+    if index.nlevels == 1:
+        return index.get_level_values(0).rename(None)
+    return index.set_names([None] * index.nlevels)
+
+
+class ResultStore:
+    """
+    Exported results, which are read on access.
+
+    ``path`` is the directory of the results of one scenario or a directory
+    of scenario directories, as in :func:`read_results`. The nodes are
+    known from the sidecars (see :func:`read_labels`), so neither the
+    facades nor the energy system are needed. Only the selected tables,
+    scenarios and nodes are read from the files.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Directory of the results
+    format : str, default="parquet"
+        "parquet" or "arrow"
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> from placades import CarrierBus
+    >>> from placades import DsoElectricity
+    >>> bus = CarrierBus(name="electricity", carrier="electricity")
+    >>> dso = DsoElectricity(name="dso", bus_electricity=bus)
+    >>> flow = pd.DataFrame(
+    ...     [[1.0, 0.0], [2.0, 0.5]],
+    ...     index=pd.date_range("2025", periods=2, freq="h"),
+    ...     columns=pd.MultiIndex.from_tuples(
+    ...         [(dso.subnodes[3], bus), (bus, dso.subnodes[1])]
+    ...     ),
+    ... )
+    >>> with tempfile.TemporaryDirectory() as path:
+    ...     for scenario in ("a", "b"):
+    ...         _ = write_results({"flow": flow}, Path(path, scenario))
+    ...     store = ResultStore(path)
+    ...     buses = store.select(carrier="electricity")
+    ...     flows = store.get("flow", scenarios=["b"], target=buses)
+    ...     scenarios = store.scenarios
+    >>> scenarios
+    ['a', 'b']
+    >>> flows.columns.tolist()
+    [('dso.consumption_converter', 'electricity')]
+    >>> flows.loc["b"].to_numpy().ravel().tolist()
+    [1.0, 2.0]
+    """
+
+    def __init__(self, path, format="parquet"):
+        _check_pyarrow()
+        _check_format(format)
+        self.path = Path(path)
+        self.format = format
+        self._labels = None
+
+    @property
+    def scenarios(self):
+        """Names of the scenarios, empty for the results of one scenario."""
+        if Path(self.path, LABELS_FILE).exists():
+            return []
+        return sorted(
+            file.parent.name for file in self.path.glob(f"*/{LABELS_FILE}")
+        )
+
+    @property
+    def labels(self):
+        """The labels of the nodes of all scenarios, see :func:`read_labels`."""
+        if self._labels is None:
+            files = [
+                Path(self.path, scenario, LABELS_FILE)
+                for scenario in self.scenarios
+            ] or [Path(self.path, LABELS_FILE)]
+            labels = pd.concat([read_labels(file) for file in files])
+            self._labels = labels[~labels.index.duplicated()]
+        return self._labels
+
+    def select(self, **columns):
+        """
+        Return the identifiers of the nodes with the given labels.
+
+        Every keyword is a column of :attr:`labels` with a value or a list
+        of values, e.g. ``select(type="CarrierBus", carrier="electricity")``
+        or ``select(facade_type=["PvPlant", "WindTurbine"])``.
+        """
+        labels = self.labels
+        selected = np.ones(len(labels), dtype=bool)
+        for column, value in columns.items():
+            values = (
+                value if isinstance(value, (list, tuple, set)) else [value]
+            )
+            selected &= labels[column].isin(values).to_numpy()
+        return labels.index[selected].tolist()
+
+    def _expand(self, selector):
+        """Add the subnodes of selected facades to the identifiers."""
+        if selector is None:
+            return None
+        if isinstance(selector, str):
+            selector = [selector]
+        selector = list(selector)
+        labels = self.labels
+        subnodes = labels.index[
+            labels["facade"].isin(selector) | labels["parent"].isin(selector)
+        ]
+        return list(dict.fromkeys([*selector, *subnodes]))
+
+    def read(self, key="flow", scenarios=None, source=None, target=None):
+        """
+        Return a table in the long format, see :func:`read_results`.
+
+        ``source`` and ``target`` are identifiers or lists of them, a facade
+        selects its subnodes, too.
+        """
+        return read_results(
+            self.path,
+            key,
+            scenarios=scenarios,
+            format=self.format,
+            source=self._expand(source),
+            target=self._expand(target),
+        )
+
+    def get(self, key="flow", scenarios=None, source=None, target=None):
+        """
+        Return a table in the wide format like ``oemof.solph.Results.get``.
+
+        The nodes are selected like in :meth:`read`. The columns are their
+        identifiers and the tables of many scenarios are stacked with the
+        scenario as outer index level.
+        """
+        table = self.read(key, scenarios, source=source, target=target)
+        columns = [
+            column for column in ("source", "target") if column in table
+        ]
+        index = [
+            column
+            for column in ("scenario", "timestamp", "period")
+            if column in table
+        ]
+        rows, row_index = _factorize(table, index)
+        cells, column_index = _factorize(table, columns)
+        values = np.full((len(row_index), len(column_index)), np.nan)
+        values[rows, cells] = table["value"].to_numpy()
+        if row_index.nlevels == 1:
+            row_index = _unnamed(row_index)
+        return pd.DataFrame(
+            values, index=row_index, columns=_unnamed(column_index)
+        )
+
+    def keys(self):
+        """Return the keys of the exported tables."""
+        suffix = f".{FORMATS[self.format]}"
+        files = self.path.glob(f"*{suffix}")
+        if self.scenarios:
+            files = self.path.glob(f"*/*{suffix}")
+        return sorted({file.name.removesuffix(suffix) for file in files})
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __getitem__(self, key):
+        return self.get(key)
@@ -1,6 +1,7 @@
-from oemof.solph import Flow
 from oemof.solph.components import Sink
 
+from placades.timeseries import shared_fix_flow
+
 
 class H2Demand(Sink):
     def __init__(self, name, bus_in_hydrogen, input_timeseries):
@@ -35,15 +36,10 @@ class H2Demand(Sink):
 
         """
 
+        input_timeseries, flow = shared_fix_flow(
+            input_timeseries, nominal_capacity=1
+        )
         self.profile = input_timeseries
         self.name = name
 
-        super().__init__(
-            label=name,
-            inputs={
-                bus_in_hydrogen: Flow(
-                    fix=input_timeseries,
-                    nominal_capacity=1,
-                )
-            },
-        )
+        super().__init__(label=name, inputs={bus_in_hydrogen: flow})
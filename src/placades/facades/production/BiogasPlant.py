@@ -1,7 +1,7 @@
-from oemof.solph import Flow
 from oemof.solph.components import Source
 
 from placades.investment import _create_invest_if_wanted
+from placades.timeseries import shared_fix_flow
 
 
 class BiogasPlant(Source):
@@ -111,6 +111,9 @@ class BiogasPlant(Source):
             project_data=project_data,
         )
 
+        input_timeseries, flow = shared_fix_flow(
+            input_timeseries, nominal_capacity=nv
+        )
         self.bus_out_fuel = bus_out_fuel
         self.input_timeseries = input_timeseries
         self.name = name
@@ -125,11 +128,6 @@ class BiogasPlant(Source):
         self.maximum_capacity = maximum_capacity
         self.renewable_asset = renewable_asset
 
-        outputs = {
-            self.bus_out_fuel: Flow(
-                fix=input_timeseries,
-                nominal_capacity=nv,
-            )
-        }
+        outputs = {self.bus_out_fuel: flow}
 
         super().__init__(label=name, outputs=outputs)
@@ -1,7 +1,7 @@
-from oemof.solph import Flow
 from oemof.solph.components import Source
 
 from placades.investment import _create_invest_if_wanted
+from placades.timeseries import shared_fix_flow
 
 
 class GeothermalPlant(Source):
@@ -108,6 +108,9 @@ class GeothermalPlant(Source):
             project_data=project_data,
         )
 
+        input_timeseries, flow = shared_fix_flow(
+            input_timeseries, nominal_capacity=nv
+        )
         self.bus_out_heat = bus_out_heat
         self.input_timeseries = input_timeseries
         self.name = name
@@ -122,11 +125,6 @@ class GeothermalPlant(Source):
         self.maximum_capacity = maximum_capacity
         self.renewable_asset = renewable_asset
 
-        outputs = {
-            self.bus_out_heat: Flow(
-                fix=input_timeseries,
-                nominal_capacity=nv,
-            )
-        }
+        outputs = {self.bus_out_heat: flow}
 
         super().__init__(label=name, outputs=outputs)
@@ -1,7 +1,7 @@
-from oemof.solph import Flow
 from oemof.solph.components import Source
 
 from placades.investment import _create_invest_if_wanted
+from placades.timeseries import shared_fix_flow
 
 
 class WindTurbine(Source):
@@ -112,6 +112,9 @@ class WindTurbine(Source):
             project_data=project_data,
         )
 
+        input_timeseries, flow = shared_fix_flow(
+            input_timeseries, nominal_capacity=nv
+        )
         self.bus_out_electricity = bus_out_electricity
         self.input_timeseries = input_timeseries
         self.name = name
@@ -126,11 +129,6 @@ class WindTurbine(Source):
         self.maximum_capacity = maximum_capacity
         self.renewable_asset = renewable_asset
 
-        outputs = {
-            self.bus_out_electricity: Flow(
-                fix=input_timeseries,
-                nominal_capacity=nv,
-            )
-        }
+        outputs = {self.bus_out_electricity: flow}
 
         super().__init__(label=name, outputs=outputs)
@@ -75,7 +75,7 @@ class DSO(Node):
 
         internal_bus = self.subnode(Bus, local_name="internal_bus")
 
-        self.subnode(
+        self._feedin_converter = self.subnode(
             Converter,
             inputs={self.bus: Flow(variable_costs=self.feedin_tariff * -1)},
             outputs={internal_bus: Flow()},
@@ -86,7 +86,7 @@ class DSO(Node):
             Sink, inputs={internal_bus: Flow()}, local_name="feedin_sink"
         )
 
-        self.subnode(
+        self._consumption_converter = self.subnode(
             Converter,
             inputs={internal_bus: Flow()},
             outputs={self.bus: Flow(variable_costs=self.energy_price)},
@@ -98,3 +98,22 @@ class DSO(Node):
             outputs={internal_bus: Flow()},
             local_name="consumption_source",
         )
+
+    def set_prices(self, energy_price=None, feedin_tariff=None):
+        """
+        Change the energy price or the feed-in tariff in place.
+
+        The costs of the existing flows are updated, so an already built
+        model only needs a new objective, see
+        :class:`placades.sweep.ParameterSweep`.
+        """
+        if energy_price is not None:
+            self.energy_price = energy_price
+            self._consumption_converter.outputs[
+                self.bus
+            ].variable_costs = energy_price
+        if feedin_tariff is not None:
+            self.feedin_tariff = feedin_tariff
+            self._feedin_converter.inputs[self.bus].variable_costs = (
+                feedin_tariff * -1
+            )
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+
+def cache_files(path, cache_dir, *suffixes):
+    """
+    Return the resolved source path and the names of its cache files.
+
+    The file names are derived from the stem and a hash of the resolved
+    path, so equally named sources in different directories do not share
+    a cache.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Path of the source file
+    cache_dir : str or pathlib.Path
+        Directory of the cache
+    suffixes : str
+        Name endings of the cache files, e.g. "-timeindex.npy"
+
+    Returns
+    -------
+    tuple : the source path and one cache path for every suffix
+
+    Examples
+    --------
+    >>> source, data_file = cache_files("a/profiles.csv", "cache", ".npy")
+    >>> data_file.parent.name, data_file.name.startswith("profiles-")
+    ('cache', True)
+    """
+    source = Path(path).resolve()
+    key = hashlib.sha256(str(source).encode()).hexdigest()[:16]
+    return source, *(
+        Path(cache_dir, f"{source.stem}-{key}{suffix}") for suffix in suffixes
+    )
+
+
+def file_hash(path):
+    """Return the sha256 hex digest of the content of a file."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def load_meta(meta_file, source):
+    """
+    Return the metadata of a cache if it is still valid for its source.
+
+    The cache is valid if the modification time and the size of the
+    source are unchanged. A source that was touched but not changed is
+    recognised by its content hash and the metadata is renewed.
+
+    Returns
+    -------
+    dict or None : the metadata or None for a missing or outdated cache
+    """
+    meta_file = Path(meta_file)
+    if not meta_file.exists():
+        return None
+    meta = json.loads(meta_file.read_text())
+    stat = Path(source).stat()
+    if (meta["mtime_ns"], meta["size"]) == (stat.st_mtime_ns, stat.st_size):
+        return meta
+    if meta["sha256"] != file_hash(source):
+        return None
+    # touched but unchanged
+    meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+    _write_atomically(meta_file, lambda f: f.write(json.dumps(meta).encode()))
+    return meta
+
+
+def store_meta(meta_file, source, **fields):
+    """
+    Write the metadata that validates a cache of ``source``.
+
+    The modification time, size and content hash of the source are stored
+    together with the given fields. Write it after the cached data, so a
+    cache is never considered valid before it is complete.
+    """
+    stat = Path(source).stat()
+    meta = {
+        "source": str(source),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": file_hash(source),
+        **fields,
+    }
+    _write_atomically(meta_file, lambda f: f.write(json.dumps(meta).encode()))
+
+
+def save_array(file, array):
+    """Write an array as .npy file without exposing a partial file."""
+    _write_atomically(file, lambda f: np.save(f, array))
+
+
+def _write_atomically(file, write):
+    # readers in other threads or processes either see the old or the new
+    # file, never a partially written one
+    file = Path(file)
+    file.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary_file = tempfile.mkstemp(
+        dir=file.parent, prefix=f".{file.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            write(f)
+        Path(temporary_file).replace(file)
+    except BaseException:
+        Path(temporary_file).unlink(missing_ok=True)
+        raise
@@ -1,9 +1,14 @@
-import datetime
+import functools
+import hashlib
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pvlib
 from demandlib import bdew
 
+from placades.importer.holidays import get_holidays
+
 
 def apply_curtailability_if_wanted(timeseries, curtailable):
     """
@@ -38,6 +43,7 @@ def create_pv_production_timeseries(
     azimuth=180,
     gcr=0.8,
     mounting_type="fix tilt",
+    cache_dir=None,
 ):
     """
     This is an internal function that can be called within the component.
@@ -64,6 +70,9 @@ def create_pv_production_timeseries(
         the modulefield)
     mounting_type: string
         "fix tilt" for static systems or "tracker" for 1-axis tracking systems
+    cache_dir: str or pathlib.Path or None
+        Directory to store the solar geometry on disk, see
+        :func:`get_solar_geometry`
 
 
     Example
@@ -85,29 +94,144 @@ def create_pv_production_timeseries(
     times = pd.date_range(
         "2021-01-01", "2021-12-31", freq="1h", tz=tz
     )  # project input
-    loc = pvlib.location.Location(latitude=lat, longitude=lon, tz=times.tz)
+    solar_position, cs = get_solar_geometry(
+        lat, lon, year=2021, freq="1h", tz=tz, cache_dir=cache_dir
+    )
+    solar_position = solar_position.loc[times]
+    cs = cs.loc[times]
+
+    # Define mounting system
+    mounting_system = _create_mounting_system(
+        mounting_type=mounting_type, tilt=tilt, azimuth=azimuth, gcr=gcr
+    )
+    return _calculate_pv_output(
+        solar_position, cs, mounting_system, system_eff=system_eff
+    )
+
+
+SOLAR_POSITION_COLUMNS = (
+    "apparent_zenith",
+    "zenith",
+    "apparent_elevation",
+    "elevation",
+    "azimuth",
+    "equation_of_time",
+)
+CLEARSKY_COLUMNS = ("ghi", "dni", "dhi")
 
+
+def get_solar_geometry(
+    lat, lon, year=2021, freq="1h", tz="Europe/Berlin", cache_dir=None
+):
+    """
+    Return the solar position and clear sky irradiance of a site.
+
+    Both only depend on the location and the time grid, not on the
+    orientation or efficiency of the modules. They are memoised in memory
+    (see :func:`solar_geometry_cache_info`) and, if ``cache_dir`` is given,
+    stored on disk as .npy file for later processes.
+
+    The returned DataFrames are shared between calls and must not be
+    modified.
+
+    Parameters
+    ----------
+    lat : numeric
+        latitude of the site (decimal degrees)
+    lon : numeric
+        longitude of the site (decimal degrees)
+    year : int, default=2021
+        Year of the time index, which covers the whole year
+    freq : str, default="1h"
+        Frequency of the time index
+    tz : str, default="Europe/Berlin"
+        Time zone of the time index
+    cache_dir : str or pathlib.Path or None, default=None
+        Directory of the on-disk store
+
+    Returns
+    -------
+    tuple of pandas.DataFrame : solar position and clear sky irradiance
+        ("ghi", "dni", "dhi")
+
+    Examples
+    --------
+    >>> solar_geometry_cache_clear()
+    >>> solar_position, clearsky = get_solar_geometry(50.59, 10.17)
+    >>> solar_position, clearsky = get_solar_geometry(50.59, 10.17)
+    >>> solar_geometry_cache_info().hits
+    1
+    >>> list(clearsky.columns)
+    ['ghi', 'dni', 'dhi']
+    """
+    if cache_dir is not None:
+        cache_dir = str(Path(cache_dir).resolve())
+    return _get_solar_geometry(
+        float(lat), float(lon), int(year), freq, tz, cache_dir
+    )
+
+
+def _create_year_index(year, freq, tz):
+    return pd.date_range(
+        f"{year}-01-01",
+        f"{year + 1}-01-01",
+        freq=freq,
+        tz=tz,
+        inclusive="left",
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _get_solar_geometry(lat, lon, year, freq, tz, cache_dir):
+    times = _create_year_index(year, freq, tz)
+    columns = SOLAR_POSITION_COLUMNS + CLEARSKY_COLUMNS
+
+    cache_file = None
+    if cache_dir is not None:
+        key = hashlib.sha256(
+            repr((lat, lon, year, freq, tz, pvlib.__version__)).encode()
+        ).hexdigest()[:16]
+        cache_file = Path(cache_dir, f"solar_geometry-{key}.npy")
+        if cache_file.exists():
+            data = pd.DataFrame(
+                np.load(cache_file), index=times, columns=columns
+            )
+            return (
+                data[list(SOLAR_POSITION_COLUMNS)],
+                data[list(CLEARSKY_COLUMNS)],
+            )
+
+    loc = pvlib.location.Location(latitude=lat, longitude=lon, tz=times.tz)
     solar_position = loc.get_solarposition(times)
-    cs = loc.get_clearsky(times)
+    cs = loc.get_clearsky(times, solar_position=solar_position)
+
+    if cache_file is not None:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        np.save(
+            cache_file,
+            np.column_stack(
+                [solar_position[c] for c in SOLAR_POSITION_COLUMNS]
+                + [cs[c] for c in CLEARSKY_COLUMNS]
+            ),
+        )
+    return solar_position[list(SOLAR_POSITION_COLUMNS)], cs[
+        list(CLEARSKY_COLUMNS)
+    ]
+
+
+def solar_geometry_cache_info():
+    """Return the statistics of the in-memory solar geometry cache."""
+    return _get_solar_geometry.cache_info()
 
-    # weather data should instead be used from PF script (this here is
-    # cs=clear sky so it is not suitable)
-    dni = cs["dni"]  # =direct normal irradiation
-    ghi = cs["ghi"]  # =global horizontal irradiation
-    dhi = cs["dhi"]  # =diffuse horizontal irradiation
 
+def solar_geometry_cache_clear():
+    """Clear the in-memory solar geometry cache."""
+    _get_solar_geometry.cache_clear()
+
+
+def _create_mounting_system(mounting_type, tilt, azimuth, gcr):
     axis_tilt = 0  # default
-    azimuth = azimuth  # user input
-    gcr = gcr  # user input
     max_angle = 60  # default
-    tilt = tilt  # user input
-    system_eff = system_eff  # user input = performance ratio (PR)
-    # albedo = 0.25  # default
-    mounting_type = (
-        mounting_type  # user input dropdown menu with: fix tilt // tracker
-    )
-
-    # Define mounting system
     if mounting_type == "fix tilt":
         mounting_system = pvlib.pvsystem.FixedMount(
             surface_tilt=tilt, surface_azimuth=azimuth
@@ -122,6 +246,35 @@ def create_pv_production_timeseries(
         )
     else:
         raise NotImplementedError(f"Type {mounting_type} does not exist.")
+    return mounting_system
+
+
+def _calculate_pv_output(
+    solar_position, irradiance, mounting_system, system_eff, model="king"
+):
+    """
+    Calculate the AC output per kWp of one orientation.
+
+    The solar position and irradiance (columns "dni", "ghi" and "dhi") only
+    depend on the site and the time index, so they can be shared by all
+    orientations at the same site.
+    """
+    poa_global = _calculate_poa_global(
+        solar_position, irradiance, mounting_system, model=model
+    )
+
+    # Calculate AC power with plain system_eff
+    ac = poa_global * system_eff / 1000
+    return ac.fillna(0)
+
+
+def _calculate_poa_global(
+    solar_position, irradiance, mounting_system, model="king"
+):
+    """Calculate the global irradiance on the plane of one orientation."""
+    dni = irradiance["dni"]  # =direct normal irradiation
+    ghi = irradiance["ghi"]  # =global horizontal irradiation
+    dhi = irradiance["dhi"]  # =diffuse horizontal irradiation
 
     # Calculate orientation of tracker
     orientation = mounting_system.get_orientation(
@@ -141,14 +294,385 @@ def create_pv_production_timeseries(
         airmass=None,
         albedo=0.25,
         surface_type=None,
-        model="king",
+        model=model,
         model_perez="allsitescomposite1990",
     )
+    return irrad["poa_global"]
 
-    # Calculate AC power with plain system_eff
-    ac = irrad["poa_global"] * system_eff / 1000
-    ac.fillna(0, inplace=True)
-    return ac
+
+def get_weather_irradiance(weather_data, lat, lon):
+    """
+    Return the solar position and irradiance of a weather dataset.
+
+    The direct and diffuse horizontal irradiance of the
+    :class:`~placades.importer.weather_data.WeatherData` are converted to
+    the "ghi", "dni" and "dhi" columns used by the profile generators. The
+    TRY values are hourly means, so the solar position is calculated for
+    the middle of each hour. All steps are vectorised over the time index.
+
+    Parameters
+    ----------
+    weather_data : placades.importer.weather_data.WeatherData
+        Parsed weather dataset with ``timeindex``
+    lat : numeric
+        latitude of the site (decimal degrees)
+    lon : numeric
+        longitude of the site (decimal degrees)
+
+    Returns
+    -------
+    tuple of pandas.DataFrame : solar position and irradiance
+        ("ghi", "dni", "dhi") indexed by the time index of the weather data
+    """
+    times = weather_data.timeindex
+    loc = pvlib.location.Location(latitude=lat, longitude=lon, tz=times.tz)
+    solar_position = loc.get_solarposition(times + pd.Timedelta(minutes=30))
+    solar_position.index = times
+
+    ghi = pd.Series(
+        weather_data.direct_solar_Wm2 + weather_data.diffuse_solar_Wm2,
+        index=times,
+    )
+    dhi = pd.Series(weather_data.diffuse_solar_Wm2, index=times, dtype=float)
+    dni = pvlib.irradiance.dni(ghi, dhi, solar_position["zenith"]).fillna(0)
+    return solar_position, pd.DataFrame({"ghi": ghi, "dni": dni, "dhi": dhi})
+
+
+def _broadcast_plants(parameters, values):
+    """Broadcast scalar and per-plant values to a table of plants."""
+    columns = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(value, dtype=object)) for value in values)
+    )
+    return pd.DataFrame(dict(zip(parameters, columns, strict=True)))
+
+
+PV_PLANT_PARAMETERS = (
+    "lat",
+    "lon",
+    "tilt",
+    "system_eff",
+    "azimuth",
+    "gcr",
+    "mounting_type",
+)
+
+
+def create_pv_production_timeseries_batch(
+    lat,
+    lon,
+    tilt=15,
+    system_eff=0.85,
+    azimuth=180,
+    gcr=0.8,
+    mounting_type="fix tilt",
+    names=None,
+    year=2021,
+    tz="Europe/Berlin",
+    freq="1h",
+    model="king",
+    as_frame=True,
+    cache_dir=None,
+    weather_data=None,
+):
+    """
+    Create the PV production timeseries of many plants at once.
+
+    Every argument describing a plant may be a scalar or an array with one
+    value per plant. Plants with the same latitude and longitude share one
+    calculation of the solar position and clear sky irradiance, which is
+    the expensive step (see :func:`get_solar_geometry`). The orientation
+    dependent part is then calculated for every plant of the site.
+
+    Parameters
+    ----------
+    lat : numeric or array-like
+        latitude of the PV-plants (decimal degrees)
+    lon : numeric or array-like
+        longitude of the PV-plants (decimal degrees)
+    tilt : numeric or array-like
+        Tilt angle in degrees (90° is vertical)
+    system_eff : numeric or array-like
+        Performace Ratio of the systems (usually around 0,8)
+    azimuth : numeric or array-like
+        Azimuth angle of the module orientation in degrees (North is 0°)
+        Azimut angle of the rotation-axis for tracking systems
+    gcr : numeric or array-like
+        Ground Coverage Ratio
+    mounting_type : str or array-like
+        "fix tilt" for static systems or "tracker" for 1-axis tracking
+        systems
+    names : array-like or None
+        Column names of the plants, defaults to their position
+    year : int, default=2021
+        Year of the hourly time index
+    tz : str, default="Europe/Berlin"
+        Time zone of the time index
+    freq : str, default="1h"
+        Frequency of the time index
+    model : str, default="king"
+        Sky diffuse irradiance model of
+        :func:`pvlib.irradiance.get_total_irradiance`
+    as_frame : bool, default=True
+        Return a wide DataFrame (one column per plant) instead of a 2-D
+        numpy array of shape (timesteps, plants)
+    cache_dir : str or pathlib.Path or None, default=None
+        Directory to store the solar geometry on disk
+    weather_data : placades.importer.weather_data.WeatherData or None
+        Use the measured irradiance of a weather dataset instead of clear sky
+        data, see :func:`get_weather_irradiance`. The time index of the
+        weather data replaces ``year``, ``tz`` and ``freq``.
+
+    Examples
+    --------
+    >>> profiles = create_pv_production_timeseries_batch(
+    ...     lat=[50.59, 50.59, 52.52],
+    ...     lon=[10.17, 10.17, 13.40],
+    ...     tilt=[15, 30, 15],
+    ...     azimuth=[180, 90, 180],
+    ...     names=["roof_south", "roof_east", "berlin"],
+    ...     model="isotropic",
+    ... )
+    >>> profiles.shape
+    (8760, 3)
+    >>> list(profiles.columns)
+    ['roof_south', 'roof_east', 'berlin']
+
+    With the weather data of a TRY dataset:
+
+    >>> from placades.importer.weather_data import import_trj
+    >>> weather = import_trj("examples/simple_dispatch/data/TRY2015.dat")
+    >>> profiles = create_pv_production_timeseries_batch(
+    ...     lat=50.59,
+    ...     lon=10.17,
+    ...     tilt=[15, 30, 45],
+    ...     weather_data=weather,
+    ...     model="isotropic",
+    ...     as_frame=False,
+    ... )
+    >>> profiles.shape
+    (8760, 3)
+    """
+    plants = _broadcast_plants(
+        PV_PLANT_PARAMETERS,
+        (lat, lon, tilt, system_eff, azimuth, gcr, mounting_type),
+    )
+    if weather_data is None:
+        times = _create_year_index(year, freq, tz)
+    else:
+        times = weather_data.timeindex
+    profiles = np.zeros((len(times), len(plants)))
+    for (site_lat, site_lon), site in plants.groupby(
+        ["lat", "lon"], sort=False
+    ):
+        if weather_data is None:
+            solar_position, cs = get_solar_geometry(
+                site_lat, site_lon, year, freq, tz, cache_dir=cache_dir
+            )
+        else:
+            solar_position, cs = get_weather_irradiance(
+                weather_data, site_lat, site_lon
+            )
+        for position, plant in zip(
+            plants.index.get_indexer(site.index),
+            site.itertuples(),
+            strict=True,
+        ):
+            mounting_system = _create_mounting_system(
+                mounting_type=plant.mounting_type,
+                tilt=plant.tilt,
+                azimuth=plant.azimuth,
+                gcr=plant.gcr,
+            )
+            profiles[:, position] = _calculate_pv_output(
+                solar_position,
+                cs,
+                mounting_system,
+                system_eff=plant.system_eff,
+                model=model,
+            ).to_numpy()
+
+    if as_frame:
+        return pd.DataFrame(profiles, index=times, columns=names)
+    return profiles
+
+
+SOLAR_THERMAL_PLANT_PARAMETERS = (
+    "lat",
+    "lon",
+    "tilt",
+    "azimuth",
+    "eta_0",
+    "a_1",
+    "a_2",
+    "collector_temperature",
+)
+
+
+def create_solar_thermal_production_timeseries(
+    weather_data,
+    lat,
+    lon,
+    tilt=35,
+    azimuth=180,
+    eta_0=0.8,
+    a_1=3.5,
+    a_2=0.015,
+    collector_temperature=50,
+    names=None,
+    model="king",
+    as_frame=True,
+):
+    """
+    Create the heat production timeseries of solar thermal plants.
+
+    The collector efficiency follows the quadratic collector equation
+    ``eta = eta_0 - a_1 * dT / G - a_2 * dT**2 / G`` with the difference
+    ``dT`` between the mean collector temperature and the air temperature of
+    the weather data and the irradiance ``G`` on the collector plane. The
+    result is the heat output per kW of peak output (``eta_0`` at
+    1000 W/m²), vectorised over the time index. Every plant parameter may
+    be a scalar or an array with one value per plant, and plants at the
+    same site share the solar position.
+
+    Parameters
+    ----------
+    weather_data : placades.importer.weather_data.WeatherData
+        Parsed weather dataset
+    lat : numeric or array-like
+        latitude of the plants (decimal degrees)
+    lon : numeric or array-like
+        longitude of the plants (decimal degrees)
+    tilt : numeric or array-like
+        Tilt angle of the collectors in degrees (90° is vertical)
+    azimuth : numeric or array-like
+        Azimuth angle of the collectors in degrees (North is 0°)
+    eta_0 : numeric or array-like
+        Optical efficiency of the collectors
+    a_1 : numeric or array-like
+        Linear heat loss coefficient in W/(m²K)
+    a_2 : numeric or array-like
+        Quadratic heat loss coefficient in W/(m²K²)
+    collector_temperature : numeric or array-like
+        Mean collector temperature in °C
+    names : array-like or None
+        Column names of the plants, defaults to their position
+    model : str, default="king"
+        Sky diffuse irradiance model of
+        :func:`pvlib.irradiance.get_total_irradiance`
+    as_frame : bool, default=True
+        Return a wide DataFrame (one column per plant) instead of a 2-D
+        numpy array of shape (timesteps, plants)
+
+    Examples
+    --------
+    >>> from placades.importer.weather_data import import_trj
+    >>> weather = import_trj("examples/simple_dispatch/data/TRY2015.dat")
+    >>> profiles = create_solar_thermal_production_timeseries(
+    ...     weather,
+    ...     lat=50.59,
+    ...     lon=10.17,
+    ...     collector_temperature=[40, 80],
+    ...     names=["low", "high"],
+    ...     model="isotropic",
+    ... )
+    >>> bool((profiles["low"] >= profiles["high"]).all())
+    True
+    """
+    plants = _broadcast_plants(
+        SOLAR_THERMAL_PLANT_PARAMETERS,
+        (lat, lon, tilt, azimuth, eta_0, a_1, a_2, collector_temperature),
+    )
+    times = weather_data.timeindex
+    air_temperature = np.asarray(weather_data.air_temperature_C, dtype=float)
+    profiles = np.zeros((len(times), len(plants)))
+    for (site_lat, site_lon), site in plants.groupby(
+        ["lat", "lon"], sort=False
+    ):
+        solar_position, irradiance = get_weather_irradiance(
+            weather_data, site_lat, site_lon
+        )
+        for position, plant in zip(
+            plants.index.get_indexer(site.index),
+            site.itertuples(),
+            strict=True,
+        ):
+            mounting_system = _create_mounting_system(
+                mounting_type="fix tilt",
+                tilt=plant.tilt,
+                azimuth=plant.azimuth,
+                gcr=None,
+            )
+            poa_global = (
+                _calculate_poa_global(
+                    solar_position, irradiance, mounting_system, model=model
+                )
+                .fillna(0)
+                .to_numpy()
+            )
+            delta_t = plant.collector_temperature - air_temperature
+            heat = np.clip(
+                plant.eta_0 * poa_global
+                - plant.a_1 * delta_t
+                - plant.a_2 * delta_t**2,
+                0,
+                None,
+            )
+            profiles[:, position] = heat / (plant.eta_0 * 1000)
+
+    if as_frame:
+        return pd.DataFrame(profiles, index=times, columns=names)
+    return profiles
+
+
+# Standard load profile types of the BDEW heat profiles
+SHLP_TYPES = {
+    "single-family house": "EFH",
+    "apartment building": "MFH",
+    "Commerce/Services general": "GHD",
+    "restaurants": "GGA",
+    "retail and wholesale": "GBH",
+    "metal and automotive": "GMK",
+    "household-like business enterprises": "GMF",
+    "accommodation": "GBH",
+    "Local authorities, credit institutions and insurancecompanies": "GKO",
+    "other operational services": "GBD",
+    "laundries, dry cleaning": "GWA",
+    "horticulture": "GGB",
+    "bakery": "GBA",
+    "paper and printing": "GPD",
+}
+
+RESIDENTIAL_SHLP_TYPES = ("EFH", "MFH")
+
+WIND_CLASSES = {"not windy": 0, "windy": 1}
+
+# Last building year of the residential building classes 1 to 10, younger
+# buildings belong to class 11
+BUILDING_CLASS_YEARS = (
+    1918,
+    1948,
+    1957,
+    1968,
+    1978,
+    1983,
+    1994,
+    1999,
+    2006,
+    2010,
+)
+
+
+def _get_bdew_parameters(profile_type, building_year, wind_class):
+    """Return the demandlib shlp type, building class and wind class."""
+    shlp_type = SHLP_TYPES.get(profile_type, profile_type)
+    building_class = 0
+    if shlp_type in RESIDENTIAL_SHLP_TYPES:
+        building_class = 1
+        if building_year is not None and not pd.isna(building_year):
+            building_class = (
+                int(np.searchsorted(BUILDING_CLASS_YEARS, building_year)) + 1
+            )
+    return shlp_type, building_class, WIND_CLASSES.get(wind_class, wind_class)
 
 
 def create_heat_demand(
@@ -158,6 +682,8 @@ def create_heat_demand(
     annual_heat_demand,
     building_year=None,
     wind_class="not windy",
+    holidays=None,
+    region=None,
 ):
     """
     timeframe:
@@ -181,9 +707,18 @@ def create_heat_demand(
     annual_heat_demand: numeric
         total heat demand in the chosen timeperiod
     building_year: int
-        only needed for non-residential buildings
+        only needed for residential buildings
     wind_class: str
         "not windy" or "windy"
+    holidays: dict or None
+        holidays (datetime.date mapped to their names), e.g. from
+        :meth:`placades.Project.get_holidays`. Defaults to the German
+        holidays of the years of the timeframe in the given region.
+    region: str or None
+        ISO 3166-2 code of the German state of the building, e.g. from
+        :func:`placades.importer.holidays.get_region` with the location of
+        the project. Without a region only the nationwide holidays are used.
+        Ignored if holidays are given.
 
     >>> from demandlib import bdew
     >>> heat_demand = create_heat_demand(
@@ -195,87 +730,16 @@ def create_heat_demand(
     ...     wind_class="not windy",)
     """
 
-    match wind_class:
-        case "not windy":
-            wind_class = 0
-        case "windy":
-            wind_class = 1
-
-    building_class = 0
-    if profile_type != "residential":
-        building_class = 1
-    else:
-        match building_year:
-            case y if y <= 1918:
-                building_class = 1
-            case y if 1919 <= y <= 1948:
-                building_class = 2
-            case y if 1949 <= y <= 1957:
-                building_class = 3
-            case y if 1958 <= y <= 1968:
-                building_class = 4
-            case y if 1969 <= y <= 1978:
-                building_class = 5
-            case y if 1979 <= y <= 1983:
-                building_class = 6
-            case y if 1984 <= y <= 1994:
-                building_class = 7
-            case y if 1995 <= y <= 1999:
-                building_class = 8
-            case y if 2000 <= y <= 2006:
-                building_class = 9
-            case y if 2007 <= y <= 2010:
-                building_class = 10
-            case y if y >= 2011:
-                building_class = 11
-
-    match profile_type:
-        case "single-family house":
-            profile_type = "EFH"
-        case "apartment building":
-            profile_type = "MFH"
-        case "Commerce/Services general":
-            profile_type = "GHD"
-        case "restaurants":
-            profile_type = "GGA"
-        case "retail and wholesale":
-            profile_type = "GBH"
-        case "metal and automotive":
-            profile_type = "GMK"
-        case "household-like business enterprises":
-            profile_type = "GMF"
-        case "accommodation":
-            profile_type = "GBH"
-        case "Local authorities, credit institutions and insurancecompanies":
-            profile_type = "GKO"
-        case "other operational services":
-            profile_type = "GBD"
-        case "laundries, dry cleaning":
-            profile_type = "GWA"
-        case "horticulture":
-            profile_type = "GGB"
-        case "bakery":
-            profile_type = "GBA"
-        case "paper and printing":
-            profile_type = "GPD"
-
-    holidays = {  # ToDo: Create table based on location of project
-        datetime.date(2010, 5, 24): "Whit Monday",
-        datetime.date(2010, 4, 5): "Easter Monday",
-        datetime.date(2010, 5, 13): "Ascension Thursday",
-        datetime.date(2010, 1, 1): "New year",
-        datetime.date(2010, 10, 3): "Day of German Unity",
-        datetime.date(2010, 12, 25): "Christmas Day",
-        datetime.date(2010, 5, 1): "Labour Day",
-        datetime.date(2010, 4, 2): "Good Friday",
-        datetime.date(2010, 12, 26): "Second Christmas Day",
-    }
-
+    shlp_type, building_class, wind_class = _get_bdew_parameters(
+        profile_type, building_year, wind_class
+    )
+    if holidays is None:
+        holidays = get_holidays(timeframe.year.unique(), region=region)
     demand_profile = bdew.HeatBuilding(
         timeframe,
         holidays=holidays,
         temperature=pd.Series(outdoor_temperature),
-        shlp_type=profile_type,
+        shlp_type=shlp_type,
         building_class=building_class,
         wind_class=wind_class,
         annual_heat_demand=annual_heat_demand,
@@ -283,3 +747,108 @@ def create_heat_demand(
     ).get_bdew_profile()
 
     return demand_profile
+
+
+def create_heat_demand_portfolio(
+    timeframe,
+    outdoor_temperature,
+    profile_type,
+    annual_heat_demand,
+    building_year=None,
+    wind_class="not windy",
+    holidays=None,
+    dtype=np.float64,
+    region=None,
+):
+    """
+    Create the heat demand timeseries of many buildings at once.
+
+    The buildings are grouped by their BDEW parameters (profile type,
+    building class and wind class). The normalised profile of each group is
+    calculated once with demandlib and scaled by the annual heat demand of
+    the buildings. The parameters accept the same values as
+    :func:`create_heat_demand`, either as scalar or with one value per
+    building.
+
+    Parameters
+    ----------
+    timeframe : pandas.DatetimeIndex
+        timeframe of the timeperiod
+    outdoor_temperature : iterable
+        Outside Air-temperature in °C
+    profile_type : str or array-like
+        Profile type of the buildings, see :func:`create_heat_demand`
+    annual_heat_demand : numeric or array-like
+        total heat demand of the buildings in the chosen timeperiod
+    building_year : int or array-like or None
+        only needed for residential buildings
+    wind_class : str or array-like
+        "not windy" or "windy"
+    holidays : dict or None
+        holidays (datetime.date mapped to their names) shared by all
+        buildings, see :func:`create_heat_demand`
+    dtype : numpy.dtype, default=numpy.float64
+        dtype of the result, e.g. numpy.float32 to halve the memory of
+        large portfolios
+    region : str or None
+        ISO 3166-2 code of the German state of the buildings, see
+        :func:`create_heat_demand`
+
+    Returns
+    -------
+    numpy.ndarray : heat demand of shape (timesteps, buildings)
+
+    Examples
+    --------
+    >>> timeframe = pd.date_range("2024-01-01 00:00", periods=3, freq="h")
+    >>> demand = create_heat_demand_portfolio(
+    ...     timeframe=timeframe,
+    ...     outdoor_temperature=[2, 3, 1],
+    ...     profile_type=["single-family house", "bakery", "bakery"],
+    ...     annual_heat_demand=[231, 1000, 2000],
+    ...     building_year=1992,
+    ... )
+    >>> demand.shape
+    (3, 3)
+    >>> bool(np.allclose(demand[:, 2], 2 * demand[:, 1]))
+    True
+    """
+    buildings = _broadcast_plants(
+        ("profile_type", "building_year", "wind_class", "annual_heat_demand"),
+        (profile_type, building_year, wind_class, annual_heat_demand),
+    )
+    groups = {}
+    codes = np.array(
+        [
+            groups.setdefault(
+                _get_bdew_parameters(profile, year, wind), len(groups)
+            )
+            for profile, year, wind in zip(
+                buildings["profile_type"],
+                buildings["building_year"],
+                buildings["wind_class"],
+                strict=True,
+            )
+        ],
+        dtype=np.intp,
+    )
+
+    if holidays is None:
+        holidays = get_holidays(timeframe.year.unique(), region=region)
+    temperature = pd.Series(outdoor_temperature)
+    shapes = np.empty((len(timeframe), len(groups)), dtype=dtype)
+    for (shlp_type, building_class, wind_class_), position in groups.items():
+        shapes[:, position] = bdew.HeatBuilding(
+            timeframe,
+            holidays=holidays,
+            temperature=temperature,
+            shlp_type=shlp_type,
+            building_class=building_class,
+            wind_class=wind_class_,
+            annual_heat_demand=1,
+            name="",
+        ).get_normalized_bdew_profile()
+
+    demand = np.take(shapes, codes, axis=1)
+    demand *= buildings["annual_heat_demand"].to_numpy(dtype=dtype)
+    return demand
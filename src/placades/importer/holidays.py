@@ -0,0 +1,189 @@
+import csv
+import datetime
+import functools
+import math
+import numbers
+from importlib.resources import files
+
+# Approximate geographic centres of the German federal states (ISO 3166-2)
+REGIONS_DE = {
+    "BW": (48.66, 9.35),
+    "BY": (48.95, 11.40),
+    "BE": (52.50, 13.40),
+    "BB": (52.35, 13.65),
+    "HB": (53.08, 8.80),
+    "HH": (53.55, 10.00),
+    "HE": (50.61, 9.03),
+    "MV": (53.77, 12.57),
+    "NI": (52.64, 9.85),
+    "NW": (51.48, 7.55),
+    "RP": (49.91, 7.45),
+    "SL": (49.38, 6.95),
+    "SN": (50.93, 13.46),
+    "ST": (51.97, 11.70),
+    "SH": (54.19, 9.82),
+    "TH": (50.90, 11.03),
+}
+
+REGIONS = {"DE": REGIONS_DE}
+
+# Bounding boxes (south, north, west, east) of the countries
+BOUNDS = {"DE": (47.27, 55.06, 5.87, 15.04)}
+
+
+def get_region(latitude, longitude, country="DE"):
+    """
+    Return the region of a location.
+
+    The region is the one with the nearest centre, which is an
+    approximation close to the borders of the regions. Locations outside of
+    the bounding box of the country have no region.
+
+    Returns
+    -------
+    str or None : ISO 3166-2 code of the region or None outside the country
+
+    Examples
+    --------
+    >>> get_region(50.587031, 10.165876)
+    'TH'
+    >>> get_region(48.14, 11.58)
+    'BY'
+    >>> get_region(48.86, 2.35) is None
+    True
+    """
+    south, north, west, east = BOUNDS[country]
+    if not (south <= latitude <= north and west <= longitude <= east):
+        return None
+    scale = math.cos(math.radians(latitude))
+    return min(
+        REGIONS[country].items(),
+        key=lambda item: (
+            (item[1][0] - latitude) ** 2
+            + ((item[1][1] - longitude) * scale) ** 2
+        ),
+    )[0]
+
+
+def get_holidays(years, country="DE", region=None):
+    """
+    Return the public holidays of a region.
+
+    The holidays are calculated from the rule table that ships with
+    placades (``placades/importer/data/holidays_<country>.csv``), so no
+    network access is needed. The holidays of each (country, region, year)
+    are memoised.
+
+    Parameters
+    ----------
+    years : int or iterable of int
+        Year(s) of the holidays
+    country : str, default="DE"
+        ISO 3166-1 code of the country
+    region : str or None, default=None
+        ISO 3166-2 code of the region, e.g. "TH" for Thuringia, see
+        :func:`get_region`. Without a region only the nationwide holidays are
+        returned.
+
+    Returns
+    -------
+    dict : holidays as datetime.date mapped to their names
+
+    Examples
+    --------
+    >>> holidays = get_holidays(2024, region="BY")
+    >>> holidays[datetime.date(2024, 5, 30)]
+    'Corpus Christi'
+    >>> datetime.date(2024, 5, 30) in get_holidays(2024, region="TH")
+    False
+    >>> len(get_holidays([2023, 2024]))
+    18
+    >>> import numpy as np
+    >>> len(get_holidays(np.int64(2024)))
+    9
+    """
+    if isinstance(years, numbers.Integral):
+        years = [years]
+    holidays = {}
+    for year in years:
+        holidays.update(_get_holidays(country, region, int(year)))
+    return holidays
+
+
+def holiday_cache_info():
+    """Return the statistics of the memoised holidays."""
+    return _get_holidays.cache_info()
+
+
+@functools.lru_cache(maxsize=256)
+def _get_holidays(country, region, year):
+    holidays = []
+    for rule in _load_rules(country):
+        if rule["regions"] and region not in rule["regions"]:
+            continue
+        if not rule["first_year"] <= year <= rule["last_year"]:
+            continue
+        holidays.append((_get_date(rule, year), rule["name"]))
+    return tuple(sorted(holidays))
+
+
+@functools.cache
+def _load_rules(country):
+    path = files("placades.importer").joinpath(
+        "data", f"holidays_{country.lower()}.csv"
+    )
+    if not path.is_file():
+        msg = f"No holiday table for country {country!r}."
+        raise ValueError(msg)
+    with path.open(encoding="utf-8") as f:
+        return tuple(
+            {
+                "name": row["name"],
+                "month": _to_int(row["month"]),
+                "day": _to_int(row["day"]),
+                "easter_offset": _to_int(row["easter_offset"]),
+                "weekday": _to_int(row["weekday"]),
+                "regions": frozenset(filter(None, row["regions"].split(";"))),
+                "first_year": _to_int(row["first_year"]) or datetime.MINYEAR,
+                "last_year": _to_int(row["last_year"]) or datetime.MAXYEAR,
+            }
+            for row in csv.DictReader(f)
+        )
+
+
+def _to_int(value):
+    return int(value) if value else None
+
+
+def _get_date(rule, year):
+    if rule["easter_offset"] is not None:
+        return _easter_sunday(year) + datetime.timedelta(
+            days=rule["easter_offset"]
+        )
+    date = datetime.date(year, rule["month"], rule["day"])
+    if rule["weekday"] is not None:
+        # last given weekday on or before the date
+        date -= datetime.timedelta(days=(date.weekday() - rule["weekday"]) % 7)
+    return date
+
+
+def _easter_sunday(year):
+    """
+    Return the date of Easter Sunday (anonymous Gregorian algorithm).
+
+    Examples
+    --------
+    >>> _easter_sunday(2010)
+    datetime.date(2010, 4, 4)
+    """
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    j = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * j) // 451
+    month, day = divmod(h + j - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
@@ -1,29 +1,56 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from placades.file_cache import cache_files
+from placades.file_cache import load_meta
+from placades.file_cache import save_array
+from placades.file_cache import store_meta
+
+# Columns of a TRY data row with the dtype of the resulting array
+TRY_COLUMNS = {
+    "east_coordinate_m": np.int32,
+    "north_coordinate_m": np.int32,
+    "month": np.int8,
+    "day": np.int8,
+    "hour_mez": np.int8,
+    "air_temperature_C": np.float64,
+    "air_pressure_hPa": np.float64,
+    "wind_direction_deg": np.float64,
+    "wind_speed_ms": np.float64,
+    "cloud_cover_oktas": np.float64,
+    "water_vapor_gkg": np.float64,
+    "relative_humidity_percent": np.float64,
+    "direct_solar_Wm2": np.float64,
+    "diffuse_solar_Wm2": np.float64,
+    "atmospheric_radiation_Wm2": np.float64,
+    "terrestrial_radiation_Wm2": np.float64,
+    "quality_flag": np.int8,
+}
+
+# MEZ (CET) without daylight saving time
+TRY_TIMEZONE = "Etc/GMT-1"
+
+# Record layout of the binary cache, one record per hour
+CACHE_DTYPE = np.dtype(list(TRY_COLUMNS.items()))
+
+
 class WeatherData:
     """
     Container for TRY weather data.
-    Attributes are empty until populated by import_TRY().
+    Attributes are empty until populated by import_trj().
     Expects data-structure like the "TestReferenzJahr" which can be downloaded
     from DWD
+
+    Every column of the dataset is stored as a typed numpy array, the hourly
+    time index (start of each hour in MEZ) as ``timeindex``.
     """
 
     def __init__(self):
-        self.east_coordinate_m = []
-        self.north_coordinate_m = []
-        self.month = []
-        self.day = []
-        self.hour_mez = []
-        self.air_temperature_C = []
-        self.air_pressure_hPa = []
-        self.wind_direction_deg = []
-        self.wind_speed_ms = []
-        self.cloud_cover_oktas = []
-        self.water_vapor_gkg = []
-        self.relative_humidity_percent = []
-        self.direct_solar_Wm2 = []
-        self.diffuse_solar_Wm2 = []
-        self.atmospheric_radiation_Wm2 = []
-        self.terrestrial_radiation_Wm2 = []
-        self.quality_flag = []
+        for name, dtype in TRY_COLUMNS.items():
+            setattr(self, name, np.empty(0, dtype=dtype))
+        self.timeindex = pd.DatetimeIndex([], tz=TRY_TIMEZONE)
 
     def __len__(self):
         return len(self.air_temperature_C)
@@ -32,45 +59,126 @@ class WeatherData:
         """serialize to dictionary"""
         return {k: getattr(self, k) for k in self.__dict__}
 
+    def to_dataframe(self):
+        """Return all columns as DataFrame with the hourly time index."""
+        return pd.DataFrame(
+            {name: getattr(self, name) for name in TRY_COLUMNS},
+            index=self.timeindex,
+        )
 
-def import_trj(path):
-    wd = WeatherData()
 
-    with path.open("wb", encoding="utf-8") as f:
-        for line in f:
-            # skip blank or comment/header lines
+def _count_header_lines(path):
+    """Count the lines in front of the first data row of a TRY file."""
+    with Path(path).open(encoding="latin-1") as f:
+        for number, line in enumerate(f):
+            if line.startswith("***"):
+                return number + 1
+            parts = line.split()
             if (
-                line.strip() == ""
-                or line.lstrip().startswith("*")
-                or line.lstrip().startswith("RW")
+                len(parts) >= len(TRY_COLUMNS)
+                and parts[0].replace("-", "").isdigit()
             ):
-                continue
+                return number
+    msg = f"No TRY data rows found in {path}."
+    raise ValueError(msg)
 
-            parts = line.split()
 
-            # skip lines where first column is not numeric
-            if not parts[0].replace("-", "").isdigit():
-                continue
-
-            if len(parts) < 17:
-                continue
-
-            wd.east_coordinate_m.append(int(parts[0]))
-            wd.north_coordinate_m.append(int(parts[1]))
-            wd.month.append(int(parts[2]))
-            wd.day.append(int(parts[3]))
-            wd.hour_mez.append(int(parts[4]))
-            wd.air_temperature_C.append(float(parts[5]))
-            wd.air_pressure_hPa.append(float(parts[6]))
-            wd.wind_direction_deg.append(float(parts[7]))
-            wd.wind_speed_ms.append(float(parts[8]))
-            wd.cloud_cover_oktas.append(float(parts[9]))
-            wd.water_vapor_gkg.append(float(parts[10]))
-            wd.relative_humidity_percent.append(float(parts[11]))
-            wd.direct_solar_Wm2.append(float(parts[12]))
-            wd.diffuse_solar_Wm2.append(float(parts[13]))
-            wd.atmospheric_radiation_Wm2.append(float(parts[14]))
-            wd.terrestrial_radiation_Wm2.append(float(parts[15]))
-            wd.quality_flag.append(int(parts[16]))
+def import_trj(path, year=2015, cache_dir=None):
+    """
+    Import a DWD TestReferenzJahr (TRY) file.
+
+    Only the header is read line by line to find the first data row. The
+    data rows are parsed by numpy's C reader in one go.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Path to the TRY .dat file.
+    year : int, default=2015
+        Year of the time index. TRY datasets describe a typical year
+        without leap day, so a non-leap year should be used.
+    cache_dir : str or pathlib.Path or None, default=None
+        Directory of the binary cache. If given, the parsed data is stored
+        there as .npy file and memory-mapped on the next import of the same
+        file. The cache is keyed by the source path and validated by its
+        modification time and content hash, so it is renewed automatically
+        if the source file changes.
+
+    Returns
+    -------
+    WeatherData
+
+    Examples
+    --------
+    >>> from pathlib import Path
+    >>> path = Path(
+    ...     "examples", "simple_dispatch", "data", "TRY2015.dat"
+    ... )
+    >>> wd = import_trj(path)
+    >>> len(wd)
+    8760
+    >>> wd.timeindex[0]
+    Timestamp('2015-01-01 00:00:00+0100', tz='Etc/GMT-1')
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as cache_dir:
+    ...     cold = import_trj(path, cache_dir=cache_dir)
+    ...     warm = import_trj(path, cache_dir=cache_dir)
+    >>> (cold.air_temperature_C == warm.air_temperature_C).all()
+    np.True_
+    """
+    if cache_dir is not None:
+        return _import_trj_cached(path, year, cache_dir)
+    return _parse_trj(path, year)
+
+
+def _parse_trj(path, year):
+    data = np.loadtxt(
+        path,
+        skiprows=_count_header_lines(path),
+        usecols=range(len(TRY_COLUMNS)),
+        ndmin=2,
+        encoding="latin-1",
+    )
+
+    wd = WeatherData()
+    for column, (name, dtype) in zip(data.T, TRY_COLUMNS.items(), strict=True):
+        setattr(wd, name, column.astype(dtype))
+
+    wd.timeindex = _create_timeindex(wd, year)
+    return wd
+
+
+def _create_timeindex(wd, year):
+    # HH is the end of the hour (1..24), the index marks its start
+    first_day_of_month = pd.date_range(
+        f"{year}-01-01", periods=12, freq="MS"
+    ).dayofyear.to_numpy()
+    day_of_year = first_day_of_month[wd.month - 1] + wd.day - 2
+    return pd.DatetimeIndex(
+        pd.Timestamp(year=year, month=1, day=1, tz=TRY_TIMEZONE)
+        + pd.to_timedelta(day_of_year * 24 + wd.hour_mez - 1, unit="h"),
+        freq="infer",
+    )
+
+
+def _import_trj_cached(path, year, cache_dir):
+    source, data_file, meta_file = cache_files(
+        path, cache_dir, f"-{year}.npy", f"-{year}.json"
+    )
+
+    if data_file.exists() and load_meta(meta_file, source) is not None:
+        records = np.load(data_file, mmap_mode="r")
+        wd = WeatherData()
+        for name in TRY_COLUMNS:
+            setattr(wd, name, records[name])
+        wd.timeindex = _create_timeindex(wd, year)
+        return wd
 
+    wd = _parse_trj(source, year)
+    records = np.empty(len(wd), dtype=CACHE_DTYPE)
+    for name in TRY_COLUMNS:
+        records[name] = getattr(wd, name)
+    save_array(data_file, records)
+    store_meta(meta_file, source)
     return wd
@@ -1,7 +1,10 @@
+import math
 import warnings
 
-import pandas as pd
-from oemof.solph import Investment
+import numpy as np
+
+from placades.profiling import count
+from placades.profiling import instrument
 
 
 def crf(project_life, discount_factor):
@@ -41,8 +44,145 @@ def get_replacement_costs(
     asset_lifetime,
     first_time_investment,
     discount_factor,
+    return_cash_flows=False,
+):
+    """
+    Calculates the discounted replacement costs of an asset minus its
+    residual value at the end of the project.
+
+    The replacements happen every ``asset_lifetime`` years, so their present
+    values form a geometric series which is summed up in closed form. The
+    result equals the year-by-year calculation of the MVS
+    (``_get_replacement_costs_reference``) up to floating point rounding.
+
+    Parameters
+    ----------
+    age_of_asset : int
+        Number of years the asset has already been in operation
+    project_lifetime : int
+        Lifetime of the project
+    asset_lifetime : int
+        Lifetime of the asset
+    first_time_investment : float
+        Specific investment costs of one installation
+    discount_factor : float
+        Discount factor of the project
+    return_cash_flows : bool, default=False
+        Also return the present value of the capital expenditures for every
+        year of the project. The residual value is booked negatively in the
+        last year.
+
+    Returns
+    -------
+    float or tuple : replacement costs net of the residual value (and the
+        per-year cash flows as numpy.ndarray if requested)
+
+    Examples
+    --------
+    >>> costs = get_replacement_costs(0, 40, 5, 1000, 0.05)
+    >>> round(costs, 6) == round(
+    ...     _get_replacement_costs_reference(0, 40, 5, 1000, 0.05), 6
+    ... )
+    True
+    >>> costs, cash_flows = get_replacement_costs(
+    ...     0, 20, 15, 1000, 0, return_cash_flows=True
+    ... )
+    >>> cash_flows[[0, 15, 20]].tolist()
+    [0.0, 1000.0, -666.6666666666667]
+    """
+    ratio = (project_lifetime + age_of_asset) / asset_lifetime
+    if project_lifetime + age_of_asset == asset_lifetime:
+        number_of_investments = 1
+    else:
+        number_of_investments = round(ratio + 0.5)
+    number_of_replacements = max(
+        0, min(number_of_investments - 1, math.ceil(ratio) - 1)
+    )
+
+    if abs(age_of_asset) > asset_lifetime:
+        warnings.warn(
+            f"The age of the asset ({age_of_asset} years) is lower or equal "
+            f"than the asset lifetime ({asset_lifetime} years). This does not "
+            f"make sense, as a replacement is imminent or should already have "
+            f"happened. Please check this value.",
+            stacklevel=2,
+        )
+    if (
+        number_of_investments - 1 > number_of_replacements
+        and (number_of_replacements + 1) * asset_lifetime - age_of_asset
+        == project_lifetime
+    ):
+        warnings.warn(
+            "No asset replacement costs are computed for the project's "
+            "last year as the asset reach its end-of-life exactly on that"
+            " year",
+            stacklevel=2,
+        )
+
+    discount = 1 + discount_factor
+    if discount_factor == 0:
+        present_value_factor = number_of_replacements
+    else:
+        ratio_per_cycle = discount**-asset_lifetime
+        present_value_factor = (
+            discount ** (age_of_asset - asset_lifetime)
+            * (1 - ratio_per_cycle**number_of_replacements)
+            / (1 - ratio_per_cycle)
+        )
+    replacement_costs = first_time_investment * present_value_factor
+
+    if number_of_replacements > 0:
+        latest_investment = first_time_investment / discount ** (
+            number_of_replacements * asset_lifetime - age_of_asset
+        )
+    else:
+        latest_investment = first_time_investment
+
+    year = (number_of_investments - 1) * asset_lifetime - age_of_asset
+    if year != project_lifetime:
+        year += asset_lifetime
+    value_at_project_end = 0
+    if year > project_lifetime:
+        value_at_project_end = (
+            latest_investment
+            / asset_lifetime
+            * (year - project_lifetime)
+            / discount**project_lifetime
+        )
+        replacement_costs -= value_at_project_end
+
+    if not return_cash_flows:
+        return replacement_costs
+
+    present_value_of_capital_expenditures = np.zeros(project_lifetime + 1)
+    years = (
+        np.arange(1, number_of_replacements + 1) * asset_lifetime
+        - age_of_asset
+    )
+    in_project = years >= 0
+    present_value_of_capital_expenditures[years[in_project]] = (
+        first_time_investment / discount ** years[in_project]
+    )
+    present_value_of_capital_expenditures[project_lifetime] -= (
+        value_at_project_end
+    )
+    return replacement_costs, present_value_of_capital_expenditures
+
+
+def _get_replacement_costs_reference(
+    age_of_asset,
+    project_lifetime,
+    asset_lifetime,
+    first_time_investment,
+    discount_factor,
 ):
-    """From mvs src/multi_vector_simulator/C2_economic_functions.py"""
+    """
+    Year-by-year reference implementation of :func:`get_replacement_costs`.
+
+    From mvs src/multi_vector_simulator/C2_economic_functions.py
+    """
+    import pandas as pd  # noqa: PLC0415
+
     if project_lifetime + age_of_asset == asset_lifetime:
         number_of_investments = 1
     else:
@@ -102,6 +242,179 @@ def get_replacement_costs(
     return replacement_costs
 
 
+def _power(base, exponent):
+    """
+    Element-wise ``base ** exponent`` rounded exactly like Python floats.
+
+    NumPy's vectorised power may differ from the C library in the last
+    digit. Bases (discount factors) and exponents (years) only take a few
+    distinct values, so their combinations are evaluated with ``math.pow``.
+    """
+    base, exponent = np.broadcast_arrays(base, exponent)
+    bases, base_index = np.unique(base, return_inverse=True)
+    exponents, exponent_index = np.unique(exponent, return_inverse=True)
+    table = np.array(
+        [[math.pow(b, e) for e in exponents] for b in bases], dtype=float
+    )
+    return table[base_index, exponent_index].reshape(base.shape)
+
+
+def crf_array(project_life, discount_factor):
+    """
+    Vectorised version of :func:`crf`.
+
+    Parameters
+    ----------
+    project_life : array-like of int
+        Time period over which the costs of the system occur
+    discount_factor : array-like of float
+        Weighted average cost of capital
+
+    Returns
+    -------
+    numpy.ndarray : capital recovery factors, element-wise identical to
+        :func:`crf`
+
+    Examples
+    --------
+    >>> crf_array([20, 20, 10], [0.05, 0, 0.01]).tolist() == [
+    ...     crf(20, 0.05), crf(20, 0), crf(10, 0.01)]
+    True
+    """
+    project_life, discount_factor = np.broadcast_arrays(
+        np.asarray(project_life, dtype=float),
+        np.asarray(discount_factor, dtype=float),
+    )
+    discounted = _power(1 + discount_factor, project_life)
+    crfv = np.empty_like(discounted)
+    zero = discount_factor == 0
+    crfv[zero] = 1 / project_life[zero]
+    crfv[~zero] = (discount_factor[~zero] * discounted[~zero]) / (
+        discounted[~zero] - 1
+    )
+    return crfv
+
+
+def get_replacement_costs_array(
+    age_of_asset,
+    project_lifetime,
+    asset_lifetime,
+    first_time_investment,
+    discount_factor,
+    return_residual_value=False,
+):
+    """
+    Vectorised version of :func:`get_replacement_costs`.
+
+    All arguments are broadcast against each other, so a whole column of
+    assets can be evaluated in one call. The same closed-form expressions
+    are used in the same order of operations as in the scalar function, so
+    the results are exactly equal.
+
+    Parameters
+    ----------
+    age_of_asset : array-like of int
+        Age of the assets at the start of the project.
+    project_lifetime : array-like of int
+        Lifetime of the project.
+    asset_lifetime : array-like of int
+        Lifetime of the assets.
+    first_time_investment : array-like of float
+        Specific investment costs of one installation.
+    discount_factor : array-like of float
+        Discount factor of the project.
+    return_residual_value : bool, default=False
+        Also return the discounted residual value of the last investment
+        at the end of the project.
+
+    Returns
+    -------
+    numpy.ndarray or tuple of numpy.ndarray : replacement costs net of the
+        residual value (and the residual value itself if requested)
+
+    Examples
+    --------
+    >>> costs = get_replacement_costs_array(0, 20, [5, 10, 15], 1000, 0.05)
+    >>> costs.tolist() == [
+    ...     get_replacement_costs(0, 20, lt, 1000, 0.05) for lt in [5, 10, 15]
+    ... ]
+    True
+    """
+    age, project, asset, investment, discount = np.broadcast_arrays(
+        np.asarray(age_of_asset, dtype=float),
+        np.asarray(project_lifetime, dtype=float),
+        np.asarray(asset_lifetime, dtype=float),
+        np.asarray(first_time_investment, dtype=float),
+        np.asarray(discount_factor, dtype=float),
+    )
+
+    ratio = (project + age) / asset
+    number_of_investments = np.where(
+        project + age == asset, 1, np.round(ratio + 0.5)
+    )
+    number_of_replacements = np.maximum(
+        0, np.minimum(number_of_investments - 1, np.ceil(ratio) - 1)
+    )
+
+    if np.any(np.abs(age) > asset):
+        warnings.warn(
+            f"The age of {np.count_nonzero(np.abs(age) > asset)} asset(s) is "
+            "higher than their asset lifetime. This does not make sense, as a "
+            "replacement is imminent or should already have happened. "
+            "Please check these values.",
+            stacklevel=2,
+        )
+    if np.any(
+        (number_of_investments - 1 > number_of_replacements)
+        & ((number_of_replacements + 1) * asset - age == project)
+    ):
+        warnings.warn(
+            "No asset replacement costs are computed for the project's "
+            "last year as the asset reach its end-of-life exactly on that"
+            " year",
+            stacklevel=2,
+        )
+
+    zero_discount = discount == 0
+    discount = 1 + discount
+    ratio_per_cycle = _power(discount, -asset)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        present_value_factor = np.where(
+            zero_discount,
+            number_of_replacements,
+            _power(discount, age - asset)
+            * (1 - _power(ratio_per_cycle, number_of_replacements))
+            / (1 - ratio_per_cycle),
+        )
+    replacement_costs = investment * present_value_factor
+
+    latest_investment = np.where(
+        number_of_replacements > 0,
+        investment / _power(discount, number_of_replacements * asset - age),
+        investment,
+    )
+
+    year = (number_of_investments - 1) * asset - age
+    year = np.where(year != project, year + asset, year)
+    depreciated = year > project
+    residual_value = np.where(
+        depreciated,
+        latest_investment
+        / asset
+        * (year - project)
+        / _power(discount, project),
+        0.0,
+    )
+    replacement_costs = np.where(
+        depreciated, replacement_costs - residual_value, replacement_costs
+    )
+
+    if return_residual_value:
+        return replacement_costs, residual_value
+    return replacement_costs
+
+
+@instrument
 def _create_invest_if_wanted(
     optimise_cap,
     existing_capacity,
@@ -113,6 +426,9 @@ def _create_invest_if_wanted(
     maximum_capacity=float("+inf"),
     minimum_capacity=0,
 ):
+    # Imported here to keep the economic functions free of oemof.solph
+    from oemof.solph import Investment  # noqa: PLC0415
+
     if optimise_cap is True:
         epc = (
             project_data.calculate_epc(
@@ -120,6 +436,7 @@ def _create_invest_if_wanted(
             )
             + opex_fix
         )
+        count("investments")
         return Investment(
             ep_costs=epc,
             existing=existing_capacity,
@@ -130,6 +447,89 @@ def _create_invest_if_wanted(
         return existing_capacity
 
 
+@instrument
+def create_invests_if_wanted(
+    optimise_cap,
+    existing_capacity,
+    project_data,
+    capex_var,
+    opex_fix,
+    lifetime,
+    age_installed,
+    maximum_capacity=float("+inf"),
+    minimum_capacity=0,
+):
+    """
+    Bulk version of ``_create_invest_if_wanted`` for a table of assets.
+
+    All arguments except ``project_data`` may be array-like columns of the
+    same length. The equivalent periodical costs of all assets that are
+    optimised are calculated in one vectorised call.
+
+    Returns
+    -------
+    list : an :class:`oemof.solph.Investment` for every optimised asset and
+        the existing capacity for all others
+
+    Examples
+    --------
+    >>> from placades import Project
+    >>> project = Project(
+    ...     name="my_project", lifetime=20, tax=0, discount_factor=0.05
+    ... )
+    >>> nvs = create_invests_if_wanted(
+    ...     optimise_cap=[True, False, True],
+    ...     existing_capacity=[0, 5, 10],
+    ...     project_data=project,
+    ...     capex_var=[1000, 1000, 800],
+    ...     opex_fix=[10, 10, 5],
+    ...     lifetime=[20, 25, 10],
+    ...     age_installed=0,
+    ... )
+    >>> nvs[1]
+    5
+    >>> nvs[2].ep_costs[0] == _create_invest_if_wanted(
+    ...     True, 10, project, 800, 5, 10, 0
+    ... ).ep_costs[0]
+    True
+    """
+    columns = np.broadcast_arrays(
+        np.asarray(optimise_cap, dtype=object),
+        np.asarray(existing_capacity, dtype=object),
+        np.asarray(capex_var, dtype=object),
+        np.asarray(opex_fix, dtype=object),
+        np.asarray(lifetime, dtype=object),
+        np.asarray(age_installed, dtype=object),
+        np.asarray(maximum_capacity, dtype=object),
+        np.asarray(minimum_capacity, dtype=object),
+    )
+    columns = [np.atleast_1d(c).tolist() for c in columns]
+    optimise, _, capex, _, life, age, _, _ = columns
+    # the same test as in _create_invest_if_wanted, so e.g. 1 or "True"
+    # never lead to an investment
+    wanted = [value is True for value in optimise]
+    if any(wanted):
+        project_data.precalculate_epc(
+            np.array(capex, dtype=float)[wanted],
+            np.array(life, dtype=float)[wanted],
+            np.array(age, dtype=float)[wanted],
+        )
+    return [
+        _create_invest_if_wanted(
+            optimise_cap=o,
+            existing_capacity=e,
+            project_data=project_data,
+            capex_var=c,
+            opex_fix=f,
+            lifetime=lt,
+            age_installed=a,
+            maximum_capacity=mx,
+            minimum_capacity=mn,
+        )
+        for o, e, c, f, lt, a, mx, mn in zip(*columns, strict=True)
+    ]
+
+
 def calculate_annuity_mvs(
     capex_var,
     lifetime,
@@ -149,3 +549,46 @@ def calculate_annuity_mvs(
 
     specific_capex *= crf(lifetime_project, discount_factor)
     return specific_capex
+
+
+def calculate_annuity_mvs_array(
+    capex_var,
+    lifetime,
+    age_installed,
+    tax,
+    lifetime_project,
+    discount_factor,
+):
+    """
+    Vectorised version of :func:`calculate_annuity_mvs`.
+
+    Calculates the equivalent periodical costs of whole columns of assets
+    in one call. All arguments are broadcast against each other and the
+    results are exactly equal to the scalar function.
+
+    Examples
+    --------
+    >>> epc = calculate_annuity_mvs_array(
+    ...     capex_var=[1000, 500, 3],
+    ...     lifetime=[20, 5, 10],
+    ...     age_installed=0,
+    ...     tax=0.19,
+    ...     lifetime_project=40,
+    ...     discount_factor=0.05,
+    ... )
+    >>> epc.tolist() == [
+    ...     calculate_annuity_mvs(c, lt, 0, 0.19, 40, 0.05)
+    ...     for c, lt in [(1000, 20), (500, 5), (3, 10)]
+    ... ]
+    True
+    """
+    # ToDo: Same as calculate_annuity_mvs, age_installed is not used yet
+    first_time_investment = np.asarray(capex_var, dtype=float) * (1 + tax)
+    specific_replacement_costs_optimized = get_replacement_costs_array(
+        0, lifetime_project, lifetime, first_time_investment, discount_factor
+    )
+    specific_capex = (
+        first_time_investment + specific_replacement_costs_optimized
+    )
+
+    return specific_capex * crf_array(lifetime_project, discount_factor)
@@ -0,0 +1,384 @@
+import numpy as np
+import pandas as pd
+from oemof.solph import Bus
+from oemof.solph import Investment
+from oemof.solph.components import Sink
+from oemof.solph.components import Source
+
+from placades.datapackage.results import component_id
+from placades.facades.compansation.excess import Excess
+from placades.facades.compansation.shortage import Shortage
+from placades.facades.providers.dso import DSO
+from placades.results import FlowLabels
+from placades.results import LazyResults
+from placades.results import _facade
+
+# Annuities are costs per year of this length
+HOURS_PER_YEAR = 8760
+
+# Key performance indicators of an energy system
+KPIS = (
+    "annuity",
+    "variable_costs",
+    "total_costs",
+    "demand",
+    "generation",
+    "renewable_generation",
+    "grid_import",
+    "grid_export",
+    "levelized_cost_of_energy",
+    "renewable_factor",
+    "self_consumption",
+    "self_sufficiency",
+    "degree_of_autonomy",
+    "peak_grid_import",
+)
+
+
+def _divide(numerator, denominator):
+    """Element-wise division, which is NaN where the denominator is 0."""
+    numerator, denominator = np.broadcast_arrays(
+        np.asarray(numerator, dtype=np.float64),
+        np.asarray(denominator, dtype=np.float64),
+    )
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.full(numerator.shape, np.nan),
+        where=denominator != 0,
+    )
+
+
+class KeyIndicators:
+    """
+    Key performance indicators of an energy system of placades facades.
+
+    The role of every flow (demand, local generation, renewable generation,
+    grid import or export), its variable costs and the periodical costs of
+    all investments are collected once per energy system. The indicators of
+    any number of results are then calculated by matrix products over all
+    flows and assets at once.
+
+    Local generation are the flows of sources (e.g. a ``PvPlant``) into
+    buses, it is renewable if the facade is a ``renewable_asset``. The grid
+    import and export are the flows from and to the DSOs, the import is
+    renewable by the ``renewable_share`` of the DSO. Demand are the flows
+    into sinks, except for excess sinks. The indicators are:
+
+    * "annuity": periodical costs per year, the ``ep_costs`` of all
+      investments (annuity of ``capex_var`` over the ``lifetime`` plus
+      ``opex_fix``) and the ``opex_fix`` of the ``installed_capacity``
+    * "variable_costs": variable costs of the flows (incl. the costs of
+      the grid import) in the simulated time
+    * "total_costs": annuity of the simulated time plus variable costs
+    * "levelized_cost_of_energy": total costs / demand
+    * "renewable_factor": renewable share of generation and import
+    * "self_consumption": (generation - export) / generation
+    * "self_sufficiency": (generation - export) / demand
+    * "degree_of_autonomy": (demand - import) / demand
+    * "peak_grid_import": highest sum of all grid imports of a time step
+
+    The costs and investments are read when the indicators are created, so
+    create them again after costs of the facades have been changed.
+
+    Parameters
+    ----------
+    energy_system : oemof.solph.EnergySystem
+        Energy system of the results
+
+    Examples
+    --------
+    >>> from oemof.solph import EnergySystem
+    >>> from oemof.solph import Model
+    >>> from placades import CarrierBus
+    >>> from placades import Demand
+    >>> from placades import DsoElectricity
+    >>> from placades import Project
+    >>> from placades import PvPlant
+    >>> es = EnergySystem(
+    ...     timeindex=pd.date_range("2025", periods=3, freq="h"),
+    ...     infer_last_interval=False,
+    ... )
+    >>> bus = CarrierBus(name="electricity", carrier="electricity")
+    >>> dso = DsoElectricity(
+    ...     name="dso", bus_electricity=bus, renewable_share=0.5
+    ... )
+    >>> pv = PvPlant(
+    ...     project_data=Project(
+    ...         name="p", lifetime=20, tax=0, discount_factor=0.05
+    ...     ),
+    ...     bus_out_electricity=bus,
+    ...     input_timeseries=[1, 0],
+    ...     name="pv",
+    ...     installed_capacity=1,
+    ...     opex_fix=8.76,
+    ... )
+    >>> demand = Demand(
+    ...     name="demand", bus_in_electricity=bus, input_timeseries=[1, 2]
+    ... )
+    >>> es.add(bus, dso, pv, demand)
+    >>> model = Model(energysystem=es)
+    >>> _ = model.solve(solver="highs")
+    >>> indicators = KeyIndicators(es)
+    >>> kpis = indicators.indicators(LazyResults(model))
+    >>> kpis[["demand", "generation", "grid_import"]].tolist()
+    [3.0, 1.0, 2.0]
+    >>> kpis[["renewable_factor", "peak_grid_import"]].round(4).tolist()
+    [0.6667, 2.0]
+    >>> round(float(kpis["levelized_cost_of_energy"]), 4)
+    0.2007
+    >>> assets = indicators.assets(LazyResults(model))
+    >>> assets.loc["pv", ["annuity", "energy", "levelized_cost"]].tolist()
+    [8.76, 1.0, 0.002]
+    """
+
+    def __init__(self, energy_system):
+        self.labels = FlowLabels(energy_system)
+        keys = list(self.labels.positions)
+        self.timeincrement = self.labels.timeincrement
+        assets = {}
+        self.owner = np.empty(len(keys), dtype=np.intp)
+        self.costs = np.zeros(len(keys))
+        self.varying_costs = {}
+        roles = ("demand", "generation", "renewable", "import", "export")
+        self.roles = {role: np.zeros(len(keys)) for role in roles}
+        self.supply = np.zeros(len(keys), dtype=bool)
+        investments = []
+        for position, ((o, i), flow) in enumerate(
+            zip(keys, energy_system.flows().values(), strict=True)
+        ):
+            source, target = _facade(o), _facade(i)
+            owner = target if isinstance(o, Bus) else source
+            self.owner[position] = assets.setdefault(owner, len(assets))
+            costs = flow.variable_costs
+            if np.ndim(costs):
+                self.varying_costs[position] = np.asarray(costs, dtype=float)
+            else:
+                self.costs[position] = costs[0]
+            if isinstance(flow.investment, Investment):
+                investments.append(((o, i), flow.investment, owner))
+            # energy supplied by one facade to a bus of another facade
+            supply = isinstance(i, Bus) and source is not target
+            self.supply[position] = supply
+            if supply and isinstance(source, DSO):
+                self.roles["import"][position] = 1
+                self.roles["renewable"][position] = source.renewable_share
+            elif supply and isinstance(source, Source):
+                self.roles["generation"][position] = not isinstance(
+                    source, Shortage
+                )
+                self.roles["renewable"][position] = bool(
+                    getattr(source, "renewable_asset", False)
+                )
+            if isinstance(o, Bus) and source is not target:
+                self.roles["export"][position] = isinstance(target, DSO)
+                self.roles["demand"][position] = isinstance(
+                    target, Sink
+                ) and not isinstance(target, Excess)
+
+        nodes = dict.fromkeys(node for key in keys for node in key)
+        for node in nodes:
+            investment = getattr(node, "investment", None)
+            if isinstance(investment, Investment):
+                investments.append((node, investment, _facade(node)))
+        self.investments = {
+            key: position for position, (key, _, _) in enumerate(investments)
+        }
+        self.ep_costs = np.array(
+            [investment.ep_costs[0] for _, investment, _ in investments],
+            dtype=float,
+        )
+        self.investment_owner = np.array(
+            [
+                assets.setdefault(owner, len(assets))
+                for *_, owner in investments
+            ],
+            dtype=np.intp,
+        )
+        self.fixed_costs = np.array(
+            [
+                (getattr(asset, "opex_fix", 0) or 0)
+                * (getattr(asset, "installed_capacity", 0) or 0)
+                for asset in assets
+            ],
+            dtype=float,
+        )
+        self.asset_ids = pd.Index(
+            [component_id(asset) for asset in assets], name="asset"
+        )
+
+    def _collect(self, results):
+        """
+        Return the energy and variable costs per flow, the optimised
+        capacity per investment, the peak grid import and the simulated
+        years of one result.
+        """
+        flows = results.get("flow")
+        columns = self.labels._columns(flows)
+        values = flows.to_numpy(dtype=np.float64)
+        timeincrement = self.timeincrement[: len(flows)]
+        energy = np.zeros(len(self.costs))
+        energy[columns] = timeincrement @ values
+        costs = energy * self.costs
+        if self.varying_costs:
+            column = dict(
+                zip(columns.tolist(), range(len(columns)), strict=True)
+            )
+            for position, sequence in self.varying_costs.items():
+                if position in column:
+                    costs[position] = timeincrement @ (
+                        values[:, column[position]] * sequence[: len(flows)]
+                    )
+        imports = self.roles["import"][columns] > 0
+        peak = values[:, imports].sum(axis=1).max(initial=0.0)
+
+        invest = np.zeros(len(self.ep_costs))
+        table = results.get("invest")
+        if isinstance(table, pd.DataFrame) and not table.empty:
+            for key, capacity in table.sum().items():
+                if key in self.investments:
+                    invest[self.investments[key]] += capacity
+        years = timeincrement.sum() / HOURS_PER_YEAR
+        return energy, costs, invest, peak, years
+
+    def assets(self, results):
+        """
+        Return the costs and the supplied energy of every asset.
+
+        Returns
+        -------
+        pandas.DataFrame : the "annuity" per year, the "variable_costs" and
+            the "energy" supplied to buses of other facades in the
+            simulated time and the "levelized_cost" of this energy, with
+            the :func:`component_id` of the facades as index
+        """
+        energy, costs, invest, _, years = self._collect(results)
+        count = len(self.asset_ids)
+        annuity = self.fixed_costs + np.bincount(
+            self.investment_owner,
+            weights=invest * self.ep_costs,
+            minlength=count,
+        )
+        variable_costs = np.bincount(
+            self.owner, weights=costs, minlength=count
+        )
+        supplied = np.bincount(
+            self.owner, weights=energy * self.supply, minlength=count
+        )
+        return pd.DataFrame(
+            {
+                "annuity": annuity,
+                "variable_costs": variable_costs,
+                "energy": supplied,
+                "levelized_cost": _divide(
+                    annuity * years + variable_costs, supplied
+                ),
+            },
+            index=self.asset_ids,
+        )
+
+    def table(self, scenarios):
+        """
+        Return the indicators of many results of the energy system.
+
+        Parameters
+        ----------
+        scenarios : dict
+            Results (e.g. :class:`placades.results.LazyResults` or
+            ``oemof.solph.Results``) by the name of their scenario
+
+        Returns
+        -------
+        pandas.DataFrame : the indicators (see ``KPIS``) as columns and the
+            scenarios as index
+        """
+        names = list(scenarios)
+        collected = [self._collect(scenarios[name]) for name in names]
+        if not collected:
+            return pd.DataFrame(columns=list(KPIS), dtype=float)
+        energy, costs, invest, peak, years = (
+            np.array(values) for values in zip(*collected, strict=True)
+        )
+        kpis = {
+            "annuity": invest @ self.ep_costs + self.fixed_costs.sum(),
+            "variable_costs": costs.sum(axis=1),
+        }
+        kpis["total_costs"] = kpis["annuity"] * years + kpis["variable_costs"]
+        for kpi, role in (
+            ("demand", "demand"),
+            ("generation", "generation"),
+            ("grid_import", "import"),
+            ("grid_export", "export"),
+        ):
+            kpis[kpi] = energy @ self.roles[role]
+        kpis["renewable_generation"] = energy @ (
+            self.roles["renewable"] * self.roles["generation"]
+        )
+        renewable_import = energy @ (
+            self.roles["renewable"] * self.roles["import"]
+        )
+        self_consumed = np.maximum(kpis["generation"] - kpis["grid_export"], 0)
+        kpis["levelized_cost_of_energy"] = _divide(
+            kpis["total_costs"], kpis["demand"]
+        )
+        kpis["renewable_factor"] = _divide(
+            kpis["renewable_generation"] + renewable_import,
+            kpis["generation"] + kpis["grid_import"],
+        )
+        kpis["self_consumption"] = _divide(self_consumed, kpis["generation"])
+        kpis["self_sufficiency"] = np.minimum(
+            _divide(self_consumed, kpis["demand"]), 1
+        )
+        kpis["degree_of_autonomy"] = _divide(
+            kpis["demand"] - kpis["grid_import"], kpis["demand"]
+        )
+        kpis["peak_grid_import"] = peak
+        return pd.DataFrame(kpis, index=pd.Index(names, name="scenario"))[
+            list(KPIS)
+        ]
+
+    def indicators(self, results):
+        """Return the indicators of one result as pandas.Series."""
+        return self.table({None: results}).iloc[0].rename(None)
+
+
+def kpi_table(models):
+    """
+    Return the key performance indicators of many solved models.
+
+    The indicators of every model are calculated from its current
+    solution and the current costs of its facades. Every scenario needs
+    its own model and energy system: a model solved again (e.g. by
+    :class:`placades.sweep.ParameterSweep`) only holds its last solution.
+
+    Parameters
+    ----------
+    models : dict
+        Solved ``oemof.solph.Model`` by the name of their scenario
+
+    Returns
+    -------
+    pandas.DataFrame : the indicators (see ``KPIS``) as columns and the
+        scenarios as index
+
+    Raises
+    ------
+    ValueError
+        If one model is given for more than one scenario
+    """
+    names = {}
+    for name, model in models.items():
+        if id(model) in names:
+            msg = (
+                f"The scenarios {names[id(model)]!r} and {name!r} are the "
+                "same model, which only holds its last solution."
+            )
+            raise ValueError(msg)
+        names[id(model)] = name
+    tables = [
+        KeyIndicators(model.es).table({name: LazyResults(model)})
+        for name, model in models.items()
+    ]
+    if not tables:
+        return pd.DataFrame(columns=list(KPIS), dtype=float)
+    return pd.concat(tables)
@@ -0,0 +1,470 @@
+import functools
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Active profiles, the innermost last
+_active = []
+
+# Instances whose construction is already timed by an outer __init__
+_constructing = set()
+
+# Original attributes of the classes patched while profiling
+_patched = {}
+
+# Held while profiles are started or stopped and classes are patched
+_lock = threading.RLock()
+
+
+def _record(section, name, seconds, count=1):
+    for report in tuple(_active):
+        report._add(section, name, seconds, count)
+
+
+@contextmanager
+def stage(name):
+    """
+    Time a stage of the pipeline, e.g. "build_model".
+
+    Does nothing if no :func:`profile` is active.
+    """
+    if not _active:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record("stages", name, time.perf_counter() - start)
+
+
+def instrument(function):
+    """
+    Time the calls of a function if a :func:`profile` is active.
+
+    The calls are reported by the qualified name of the function.
+    """
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not _active:
+            return function(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _record("calls", name, time.perf_counter() - start)
+
+    return wrapper
+
+
+def count(name, value=1):
+    """Add ``value`` to the counter ``name`` of the active profiles."""
+    for report in tuple(_active):
+        report.counters[name] = report.counters.get(name, 0) + value
+
+
+def watch(cls):
+    """
+    Time the construction of a facade class imported during a profile.
+
+    A profile patches the facade classes which are imported when it starts.
+    The lazy imports of :mod:`placades` and :data:`placades.TYPEMAP` pass
+    the classes they import to this function, so facades imported later on
+    are timed as well. Does nothing if no :func:`profile` is active.
+
+    Returns
+    -------
+    cls : the class itself
+    """
+    if _active:
+        with _lock:
+            if _active:
+                _patch_facade(cls)
+    return cls
+
+
+def _timed_init(init):
+    @functools.wraps(init)
+    def __init__(self, *args, **kwargs):
+        # facades calling the __init__ of a parent facade count once
+        if not _active or id(self) in _constructing:
+            return init(self, *args, **kwargs)
+        _constructing.add(id(self))
+        start = time.perf_counter()
+        try:
+            return init(self, *args, **kwargs)
+        finally:
+            _constructing.discard(id(self))
+            _record(
+                "facades", type(self).__name__, time.perf_counter() - start
+            )
+
+    return __init__
+
+
+def _timed_call(method, name, after=None):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            _record("calls", name, time.perf_counter() - start)
+        if after is not None:
+            after(self)
+        return result
+
+    return wrapper
+
+
+def _facade_classes():
+    """Return the facade classes that have already been imported."""
+    network = sys.modules.get("oemof.network.network")
+    if network is None:
+        return []
+    classes = set()
+    seen = set()
+    pending = [network.Node]
+    while pending:
+        for cls in pending.pop().__subclasses__():
+            if cls in seen:
+                continue
+            seen.add(cls)
+            pending.append(cls)
+            if cls.__module__.partition(".")[0] == "placades":
+                classes.add(cls)
+    typemap = sys.modules.get("placades.typemap")
+    if typemap is not None:
+        for name in typemap.TYPEMAP.resolved():
+            classes.add(typemap.TYPEMAP[name])
+    return sorted(classes, key=lambda cls: cls.__qualname__)
+
+
+def _patch_facade(cls):
+    network = sys.modules.get("oemof.network.network")
+    if (
+        network is None
+        or not isinstance(cls, type)
+        or not issubclass(cls, network.Node)
+        or "__init__" not in vars(cls)
+        or (cls, "__init__") in _patched
+    ):
+        return
+    _patched[cls, "__init__"] = vars(cls)["__init__"]
+    cls.__init__ = _timed_init(vars(cls)["__init__"])
+
+
+def _patch():
+    # oemof.solph is imported anyway to build a model, but the facade
+    # modules are only patched once they are imported, see watch
+    from oemof.solph import Model  # noqa: PLC0415
+    from oemof.solph import Results  # noqa: PLC0415
+
+    def count_model(model):
+        for report in tuple(_active):
+            if report.count_models:
+                report.count_model(model)
+
+    for cls in _facade_classes():
+        _patch_facade(cls)
+    for cls, attribute, value in (
+        (Model, "__init__", _timed_call(Model.__init__, "Model", count_model)),
+        (Model, "solve", _timed_call(Model.solve, "Model.solve")),
+        (Results, "__init__", _timed_call(Results.__init__, "Results")),
+    ):
+        _patched[cls, attribute] = vars(cls)[attribute]
+        setattr(cls, attribute, value)
+
+
+def _unpatch():
+    for (cls, attribute), value in _patched.items():
+        setattr(cls, attribute, value)
+    _patched.clear()
+
+
+def _owner(index):
+    """Return the facade a variable or constraint index belongs to."""
+    from oemof.solph import Bus  # noqa: PLC0415
+
+    keys = index if isinstance(index, tuple) else (index,)
+    nodes = [key for key in keys if hasattr(key, "label")]
+    if not nodes:
+        return None
+    # flows from buses belong to their target
+    node = (
+        nodes[1] if len(nodes) > 1 and isinstance(nodes[0], Bus) else nodes[0]
+    )
+    while getattr(node, "parent", None) is not None:
+        node = node.parent
+    return node
+
+
+def model_statistics(model):
+    """
+    Return the variables and constraints of a model per component.
+
+    Every index of a variable or constraint is attributed to the facade of
+    the nodes in the index, e.g. the flows to the facade at the end of the
+    bus. Indices without nodes belong to the component "model".
+
+    Returns
+    -------
+    pandas.DataFrame : the number of "variables" and "constraints" per
+        "component" (see :func:`placades.datapackage.results.component_id`),
+        its "component_type" and the pyomo "block" that creates them
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from oemof.solph import EnergySystem
+    >>> from oemof.solph import Model
+    >>> from placades import CarrierBus
+    >>> from placades import Demand
+    >>> from placades import DsoElectricity
+    >>> es = EnergySystem(
+    ...     timeindex=pd.date_range("2025", periods=3, freq="h"),
+    ...     infer_last_interval=False,
+    ... )
+    >>> bus = CarrierBus(name="electricity")
+    >>> dso = DsoElectricity(name="dso", bus_electricity=bus)
+    >>> demand = Demand(
+    ...     name="demand", bus_in_electricity=bus, input_timeseries=[1, 2]
+    ... )
+    >>> es.add(bus, dso, demand)
+    >>> statistics = model_statistics(Model(energysystem=es))
+    >>> totals = statistics.groupby("component")[["variables", "constraints"]]
+    >>> totals.sum().loc["dso"].tolist()
+    [12, 6]
+    """
+    import pandas as pd  # noqa: PLC0415
+    from pyomo.core import Constraint  # noqa: PLC0415
+    from pyomo.core import Var  # noqa: PLC0415
+
+    from placades.datapackage.results import component_id  # noqa: PLC0415
+
+    counts = {}
+    for kind, ctype in (("variables", Var), ("constraints", Constraint)):
+        for component in model.component_objects(ctype, active=True):
+            block = component.parent_block()
+            block = "model" if block is model else block.local_name
+            owners = {}
+            for index in component:
+                owner = _owner(index)
+                owners[owner] = owners.get(owner, 0) + 1
+            for owner, number in owners.items():
+                row = counts.setdefault(
+                    (owner, block), {"variables": 0, "constraints": 0}
+                )
+                row[kind] += number
+    statistics = pd.DataFrame(
+        [
+            {
+                "component": "model" if owner is None else component_id(owner),
+                "component_type": "model"
+                if owner is None
+                else type(owner).__name__,
+                "block": block,
+                **row,
+            }
+            for (owner, block), row in counts.items()
+        ],
+        columns=[
+            "component",
+            "component_type",
+            "block",
+            "variables",
+            "constraints",
+        ],
+    )
+    return statistics
+
+
+class Profile:
+    """
+    Timings and counters collected by :func:`profile`.
+
+    Attributes
+    ----------
+    stages : dict
+        Calls ("count") and "seconds" of the stages of the pipeline, e.g.
+        "read_datapackage", "build_model", "solve" and "write_results"
+    calls : dict
+        Calls and seconds of instrumented functions, e.g.
+        ``_create_invest_if_wanted``, and of "Model" (building the model),
+        "Model.solve" (including "Results") and "Results"
+    facades : dict
+        Instances and seconds of the construction per facade class
+    counters : dict
+        Counters added by :func:`count`, e.g. the number of created
+        "investments" and of loaded "sequence_columns"
+    models : list of pandas.DataFrame
+        :func:`model_statistics` of the models built while profiling
+    seconds : float
+        Wall time of the profile
+    count_models : bool
+        Whether the built models are counted
+    """
+
+    def __init__(self, count_models=True):
+        self.stages = {}
+        self.calls = {}
+        self.facades = {}
+        self.counters = {}
+        self.models = []
+        self.seconds = 0.0
+        self.count_models = count_models
+
+    def _add(self, section, name, seconds, count=1):
+        entry = getattr(self, section).setdefault(
+            name, {"count": 0, "seconds": 0.0}
+        )
+        entry["count"] += count
+        entry["seconds"] += seconds
+
+    def count_model(self, model):
+        """Add the :func:`model_statistics` of a model."""
+        start = time.perf_counter()
+        statistics = model_statistics(model)
+        self.models.append(statistics)
+        self._add("stages", "count_model", time.perf_counter() - start)
+        return statistics
+
+    def table(self, section="facades"):
+        """Return a section as pandas.DataFrame, the slowest entries first."""
+        import pandas as pd  # noqa: PLC0415
+
+        table = pd.DataFrame.from_dict(
+            getattr(self, section),
+            orient="index",
+            columns=["count", "seconds"],
+        )
+        return table.sort_values("seconds", ascending=False)
+
+    def to_dict(self, components=True):
+        """
+        Return the profile as JSON serialisable dict.
+
+        The statistics of the models are summed per component type and
+        block, and listed per component if ``components`` is True.
+        """
+        models = []
+        for statistics in self.models:
+            columns = ["variables", "constraints"]
+            model = {
+                "variables": int(statistics["variables"].sum()),
+                "constraints": int(statistics["constraints"].sum()),
+                "component_types": _records(
+                    statistics.groupby("component_type")[columns].sum()
+                ),
+                "blocks": _records(statistics.groupby("block")[columns].sum()),
+            }
+            if components:
+                model["components"] = _records(
+                    statistics.groupby("component")[columns].sum()
+                )
+            models.append(model)
+        return {
+            "seconds": self.seconds,
+            "stages": self.stages,
+            "calls": self.calls,
+            "facades": self.facades,
+            "counters": self.counters,
+            "models": models,
+        }
+
+    def write(self, path):
+        """Write the profile as JSON file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=4))
+        return path
+
+
+def _records(table):
+    return {
+        str(name): {column: int(value) for column, value in row.items()}
+        for name, row in table.iterrows()
+    }
+
+
+@contextmanager
+def profile(path=None, log=True, count_models=True):
+    """
+    Profile the code of the block.
+
+    While the profile is active the stages of the pipeline, the
+    instrumented functions, the construction of every imported facade
+    class (see :func:`watch`), the
+    building and solving of oemof.solph models and the creation of their
+    results are timed. The number of variables and constraints of every
+    component of the built models is counted. Outside of a profile the
+    hooks do nothing.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path or None, default=None
+        JSON file the profile is written to at the end of the block
+    log : bool, default=True
+        Log the profile without the components as JSON (level INFO)
+    count_models : bool, default=True
+        Count the variables and constraints of every built model, which
+        takes some time for large models
+
+    Yields
+    ------
+    Profile
+
+    Examples
+    --------
+    >>> from oemof.solph import Model
+    >>> from placades.datapackage.reading import from_datapackage
+    >>> with profile(log=False) as report:
+    ...     es = from_datapackage(
+    ...         "examples/simple_dispatch/openPlan_package/datapackage.json",
+    ...         resolution="1D",
+    ...     )
+    ...     model = Model(energysystem=es)
+    >>> sorted(report.facades)[:4]
+    ['CarrierBus', 'Demand', 'DsoElectricity', 'ElectricalStorage']
+    >>> report.facades["PvPlant"]["count"], report.calls["Model"]["count"]
+    (1, 1)
+    >>> sorted(report.stages)
+    ['count_model', 'read_datapackage', 'resample']
+    >>> report.counters
+    {'sequence_columns': 3}
+    >>> variables = report.models[0].groupby("component_type")["variables"]
+    >>> int(variables.sum()["PvPlant"])
+    365
+    """
+    report = Profile(count_models=count_models)
+    with _lock:
+        # the classes are patched by the first of all active profiles, which
+        # may be nested or run in several threads, and restored by the last
+        if not _active:
+            try:
+                _patch()
+            except BaseException:
+                _unpatch()
+                raise
+        _active.append(report)
+    start = time.perf_counter()
+    try:
+        yield report
+    finally:
+        report.seconds = time.perf_counter() - start
+        with _lock:
+            _active.remove(report)
+            if not _active:
+                _unpatch()
+        if path is not None:
+            report.write(path)
+        if log:
+            logging.info(
+                "Profile: %s", json.dumps(report.to_dict(components=False))
+            )
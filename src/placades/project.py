@@ -1,3 +1,10 @@
+from collections import OrderedDict
+from collections import namedtuple
+
+import numpy as np
+
+from placades.importer.holidays import get_holidays
+from placades.importer.holidays import get_region
 from placades.type_checks import check_parameter
 
 try:
@@ -6,6 +13,9 @@ except ModuleNotFoundError:
     annuity = None
 
 from placades.investment import calculate_annuity_mvs
+from placades.investment import calculate_annuity_mvs_array
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
 
 
 class Project:
@@ -21,15 +31,195 @@ class Project:
         disable_excess=False,
         latitude=50.587031,
         longitude=10.165876,
+        epc_cache_size=1024,
     ):
+        self._epc_cache = OrderedDict()
+        self._epc_cache_size = epc_cache_size
+        self._epc_cache_hits = 0
+        self._epc_cache_misses = 0
         self.name = name
-        self.tax = float(tax)
+        self.tax = tax
         self.lifetime = lifetime
-        self.discount_factor = float(discount_factor)
+        self.discount_factor = discount_factor
         self.shortage_cost = shortage_cost
         self.excess_cost = excess_cost
+        self.latitude = latitude
+        self.longitude = longitude
+
+    @property
+    def tax(self):
+        return self._tax
+
+    @tax.setter
+    def tax(self, value):
+        self._tax = float(value)
+        self.epc_cache_clear()
+
+    @property
+    def lifetime(self):
+        return self._lifetime
+
+    @lifetime.setter
+    def lifetime(self, value):
+        self._lifetime = value
+        self.epc_cache_clear()
+
+    @property
+    def discount_factor(self):
+        return self._discount_factor
+
+    @discount_factor.setter
+    def discount_factor(self, value):
+        self._discount_factor = float(value)
+        self.epc_cache_clear()
+
+    def get_holidays(self, years, country="DE"):
+        """
+        Return the public holidays at the location of the project.
+
+        The region is derived from the latitude and longitude of the
+        project, see :func:`placades.importer.holidays.get_region`. Outside
+        of the country only the nationwide holidays are returned.
+
+        Examples
+        --------
+        >>> import datetime
+        >>> project = Project(
+        ...     name="my_project",
+        ...     lifetime=20,
+        ...     tax=0,
+        ...     discount_factor=0.05,
+        ...     latitude=50.98,
+        ...     longitude=11.03,
+        ... )
+        >>> project.get_holidays(2024)[datetime.date(2024, 9, 20)]
+        "World Children's Day"
+        """
+        region = get_region(self.latitude, self.longitude, country=country)
+        return get_holidays(years, country=country, region=region)
+
+    def epc_cache_info(self):
+        """
+        Return the statistics of the EPC cache.
+
+        The cache holds the equivalent periodical costs of all distinct
+        (capex_var, lifetime, age_installed, method) combinations calculated
+        with the current tax, discount factor and lifetime of the project.
+        It is cleared automatically if one of these values is changed.
+
+        Examples
+        --------
+        >>> project = Project(
+        ...     name="my_project", lifetime=20, tax=0, discount_factor=0.05
+        ... )
+        >>> epc = project.calculate_epc(1000, 20, 0)
+        >>> epc == project.calculate_epc(1000, 20, 0)
+        True
+        >>> project.epc_cache_info()
+        CacheInfo(hits=1, misses=1, maxsize=1024, currsize=1)
+        >>> project.discount_factor = 0.06
+        >>> project.epc_cache_info()
+        CacheInfo(hits=0, misses=0, maxsize=1024, currsize=0)
+        """
+        return CacheInfo(
+            self._epc_cache_hits,
+            self._epc_cache_misses,
+            self._epc_cache_size,
+            len(self._epc_cache),
+        )
+
+    def epc_cache_clear(self):
+        """Clear the EPC cache and reset its statistics."""
+        self._epc_cache.clear()
+        self._epc_cache_hits = 0
+        self._epc_cache_misses = 0
+
+    def precalculate_epc(self, capex_var, lifetime, age_installed):
+        """
+        Fill the EPC cache for a whole table of assets at once.
+
+        The distinct combinations of the given columns are calculated in one
+        vectorised call with the "mvs" method, so facades created afterwards
+        only look up their equivalent periodical costs.
+
+        Examples
+        --------
+        >>> project = Project(
+        ...     name="my_project", lifetime=20, tax=0, discount_factor=0.05
+        ... )
+        >>> project.precalculate_epc([1000, 1000, 800], [20, 20, 10], 0)
+        >>> project.epc_cache_info().currsize
+        2
+        >>> epc = project.calculate_epc(800, 10, 0)
+        >>> project.epc_cache_info().hits
+        1
+        """
+        columns = np.broadcast_arrays(
+            np.asarray(capex_var),
+            np.asarray(lifetime),
+            np.asarray(age_installed),
+        )
+        keys = {
+            (*key, "mvs")
+            for key in zip(*(c.ravel().tolist() for c in columns), strict=True)
+        }
+        missing = [key for key in keys if key not in self._epc_cache]
+        if not missing:
+            return
+        capex, life, age, _ = (np.array(c) for c in zip(*missing, strict=True))
+        epcs = self._calculate_epc(capex, life, age, method="mvs")
+        for key, epc in zip(missing, epcs.tolist(), strict=True):
+            self._store_epc(key, epc)
 
     def calculate_epc(self, capex_var, lifetime, age_installed, method="mvs"):
+        """
+        Calculate the equivalent periodical costs of an asset.
+
+        Results for scalar inputs are memoised, see :meth:`epc_cache_info`.
+        With the "mvs" method ``capex_var``, ``lifetime`` and
+        ``age_installed`` may also be array-like columns of many assets,
+        which are then calculated in one vectorised call.
+
+        Examples
+        --------
+        >>> project = Project(
+        ...     name="my_project", lifetime=20, tax=0, discount_factor=0.05
+        ... )
+        >>> epc = project.calculate_epc([1000, 800], [20, 10], [0, 0])
+        >>> epc.tolist() == [
+        ...     project.calculate_epc(1000, 20, 0),
+        ...     project.calculate_epc(800, 10, 0),
+        ... ]
+        True
+        """
+        if np.ndim(capex_var) or np.ndim(lifetime) or np.ndim(age_installed):
+            return self._calculate_epc(
+                capex_var, lifetime, age_installed, method
+            )
+        key = (capex_var, lifetime, age_installed, method)
+        try:
+            epc = self._epc_cache[key]
+        except KeyError:
+            self._epc_cache_misses += 1
+            epc = self._calculate_epc(
+                capex_var, lifetime, age_installed, method
+            )
+            self._store_epc(key, epc)
+        except TypeError:  # unhashable input
+            return self._calculate_epc(
+                capex_var, lifetime, age_installed, method
+            )
+        else:
+            self._epc_cache_hits += 1
+            self._epc_cache.move_to_end(key)
+        return epc
+
+    def _store_epc(self, key, epc):
+        self._epc_cache[key] = epc
+        if len(self._epc_cache) > self._epc_cache_size:
+            self._epc_cache.popitem(last=False)
+
+    def _calculate_epc(self, capex_var, lifetime, age_installed, method):
         if method == "mvs":
             check_parameter(
                 capex_var,
@@ -39,6 +229,19 @@ class Project:
                 self.tax,
                 age_installed,
             )
+            if (
+                np.ndim(capex_var)
+                or np.ndim(lifetime)
+                or np.ndim(age_installed)
+            ):
+                return calculate_annuity_mvs_array(
+                    capex_var=capex_var,
+                    lifetime=lifetime,
+                    age_installed=age_installed,
+                    tax=self.tax,
+                    lifetime_project=self.lifetime,
+                    discount_factor=self.discount_factor,
+                )
             return calculate_annuity_mvs(
                 capex_var=capex_var,
                 lifetime=lifetime,
@@ -0,0 +1,448 @@
+import numpy as np
+import pandas as pd
+from oemof.solph import Bus
+from oemof.solph import Results
+from pyomo.core.base.var import Var
+
+from placades.datapackage.results import component_id
+from placades.facades.providers.dso import DSO
+
+
+def _matches(node, selector):
+    """
+    Check if a node is selected.
+
+    A selector is a node, its label or :func:`component_id`, a class of
+    nodes (e.g. a facade) or a list of them. Subnodes are also selected by
+    their parent facade.
+    """
+    if selector is None:
+        return True
+    if isinstance(selector, (list, set, frozenset)):
+        return any(_matches(node, item) for item in selector)
+    while node is not None:
+        if isinstance(selector, type):
+            if isinstance(node, selector):
+                return True
+        elif (
+            node is selector
+            or node.label == selector
+            or component_id(node) == selector
+        ):
+            return True
+        node = getattr(node, "parent", None)
+    return False
+
+
+class LazyResults:
+    """
+    Results of a solved model, which are extracted on access.
+
+    ``oemof.solph.Results`` builds a table of all values of a variable at
+    once. Here only the selected flows, storages or investments are read
+    from the model and cached, so e.g. the flows into one bus of a large
+    model are available without extracting all flows. The dictionary
+    interface of ``oemof.solph.Results`` (``results["flow"]``,
+    ``results.get("invest")``, ``"invest" in results``) is kept, other
+    variables are taken from ``oemof.solph.Results`` on first access.
+
+    Parameters
+    ----------
+    model : oemof.solph.Model
+        Solved model
+
+    Examples
+    --------
+    >>> from oemof.solph import EnergySystem
+    >>> from oemof.solph import Model
+    >>> from placades import CarrierBus
+    >>> from placades import Demand
+    >>> from placades import DsoElectricity
+    >>> es = EnergySystem(
+    ...     timeindex=pd.date_range("2025", periods=3, freq="h"),
+    ...     infer_last_interval=False,
+    ... )
+    >>> bus = CarrierBus(name="electricity", carrier="electricity")
+    >>> dso = DsoElectricity(name="dso", bus_electricity=bus)
+    >>> demand = Demand(
+    ...     name="demand", bus_in_electricity=bus, input_timeseries=[1, 2]
+    ... )
+    >>> es.add(bus, dso, demand)
+    >>> model = Model(energysystem=es)
+    >>> _ = model.solve(solver="highs")
+    >>> results = LazyResults(model)
+    >>> results.flows(source=bus)[bus, demand].tolist()
+    [1.0, 2.0]
+    >>> flows = results.flows(target=results.buses("electricity"))
+    >>> [(component_id(o), component_id(i)) for o, i in flows.columns]
+    [('dso.consumption_converter', 'electricity')]
+    >>> results.flows(source=DsoElectricity).shape
+    (2, 5)
+    >>> round(results["objective"], 2)
+    0.9
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._flow_values = {}
+        self._flow_variables = None
+        self._results = None
+        self._tables = {}
+
+    @property
+    def results(self):
+        """The ``oemof.solph.Results`` of the model, created on access."""
+        if self._results is None:
+            self._results = Results(self.model)
+        return self._results
+
+    def buses(self, carrier=None):
+        """Return the buses of the model, optionally of one carrier."""
+        return [
+            node
+            for node in self.model.nodes
+            if isinstance(node, Bus)
+            and (carrier is None or getattr(node, "carrier", None) == carrier)
+        ]
+
+    def _values_of_flows(self, keys):
+        missing = [key for key in keys if key not in self._flow_values]
+        if missing:
+            timesteps = len(self.model.TIMESTEPS)
+            if self._flow_variables is None:
+                # the flow variables are ordered by flow and time step
+                self._flow_variables = list(self.model.flow.values())
+                self._flow_position = {
+                    key: number for number, key in enumerate(self.model.FLOWS)
+                }
+            for key in missing:
+                start = self._flow_position[key] * timesteps
+                self._flow_values[key] = np.fromiter(
+                    (
+                        variable.value
+                        for variable in self._flow_variables[
+                            start : start + timesteps
+                        ]
+                    ),
+                    dtype=np.float64,
+                    count=timesteps,
+                )
+        return [self._flow_values[key] for key in keys]
+
+    def flows(self, source=None, target=None):
+        """
+        Return the selected flows.
+
+        Parameters
+        ----------
+        source, target : object or None, default=None
+            Node, label, :func:`component_id`, class of nodes (e.g.
+            ``PvPlant``) or a list of them to select the flows by their
+            source and target, e.g. ``target=bus`` for all flows into a
+            bus. The facades select the flows of their subnodes, too.
+
+        Returns
+        -------
+        pandas.DataFrame : like ``oemof.solph.Results.get("flow")``, with
+            the (source, target) of the flows as columns
+        """
+        keys = [
+            (o, i)
+            for o, i in self.model.FLOWS
+            if _matches(o, source) and _matches(i, target)
+        ]
+        values = self._values_of_flows(keys)
+        return pd.DataFrame(
+            np.column_stack(values) if values else None,
+            index=self.model.es.timeindex[: len(self.model.TIMESTEPS)],
+            columns=pd.MultiIndex.from_tuples(keys, names=[None, None])
+            if keys
+            else None,
+        )
+
+    def storage_content(self, storage=None):
+        """Return the content of the selected storages, e.g. a class."""
+        columns = {}
+        for name, storages in (
+            ("GenericStorageBlock", "STORAGES"),
+            ("GenericInvestmentStorageBlock", "INVESTSTORAGES"),
+        ):
+            block = getattr(self.model, name, None)
+            if block is None or not hasattr(block, "storage_content"):
+                continue
+            for node in getattr(block, storages):
+                if _matches(node, storage):
+                    columns[node] = [
+                        block.storage_content[node, t].value
+                        for t in self.model.TIMEPOINTS
+                    ]
+        return pd.DataFrame(
+            columns,
+            index=self.model.es.timeindex,
+            columns=pd.Index(list(columns), dtype=object),
+        )
+
+    def invest(self, asset=None):
+        """
+        Return the optimised capacities of the selected assets.
+
+        ``asset`` selects storages and investment flows like the selectors of
+        :meth:`flows`, a flow is selected by its source or its target.
+
+        Returns
+        -------
+        pandas.DataFrame : like ``oemof.solph.Results.get("invest")``, with
+            the periods as index
+        """
+        columns = {}
+        for variable in self.model.component_objects(Var):
+            if variable.local_name != "invest":
+                continue
+            for index, data in variable.items():
+                *key, period = index
+                if not any(_matches(node, asset) for node in key):
+                    continue
+                key = key[0] if len(key) == 1 else tuple(key)
+                columns.setdefault(key, {})[period] = data.value
+        return pd.DataFrame(columns, columns=pd.Index(list(columns)))
+
+    def get(self, key, default=None):
+        """Return a result table like ``oemof.solph.Results.get``."""
+        if key not in self._tables:
+            if key not in ("flow", "storage_content", "invest"):
+                return self.results.get(key, default)
+            if key not in self:
+                return default
+            self._tables[key] = getattr(self, _TABLES[key])()
+        return self._tables[key]
+
+    def keys(self):
+        return self.results.keys()
+
+    def __contains__(self, key):
+        # answered from the model to keep the results lazy
+        if key == "flow":
+            return len(self.model.FLOWS) > 0
+        if key == "storage_content":
+            return any(
+                hasattr(getattr(self.model, name, None), "storage_content")
+                for name in (
+                    "GenericStorageBlock",
+                    "GenericInvestmentStorageBlock",
+                )
+            )
+        if key == "invest":
+            return any(
+                variable.local_name == "invest"
+                for variable in self.model.component_objects(Var)
+            )
+        return key in self.results
+
+    def __getitem__(self, key):
+        if key in _TABLES and key in self:
+            return self.get(key)
+        return self.results[key]
+
+
+def _facade(node):
+    while getattr(node, "parent", None) is not None:
+        node = node.parent
+    return node
+
+
+class FlowLabels:
+    """
+    Precomputed labels of the flows of an energy system.
+
+    The labels are built once per energy system. Every flow is connected to
+    one or two buses, ``table`` holds one row per connection with the clean
+    identifiers (see :func:`component_id`) of the "source", the "target",
+    the "bus" and the "component" (the facade at the other end), the
+    "component_type", the "carrier" of the bus (its identifier, if the bus
+    has no carrier) and the "direction" ("in" into or "out" of the bus).
+    Flows from and to DSOs are marked as "import" or "export" in the column
+    "exchange". The result tables of any number of scenarios are then
+    relabelled and aggregated without loops over their columns.
+
+    Parameters
+    ----------
+    energy_system : oemof.solph.EnergySystem
+        Energy system of the flows
+
+    Examples
+    --------
+    >>> from oemof.solph import EnergySystem
+    >>> from placades import CarrierBus
+    >>> from placades import Demand
+    >>> from placades import DsoElectricity
+    >>> es = EnergySystem(
+    ...     timeindex=pd.date_range("2025", periods=3, freq="h"),
+    ...     infer_last_interval=False,
+    ... )
+    >>> bus = CarrierBus(name="electricity", carrier="electricity")
+    >>> dso = DsoElectricity(name="dso", bus_electricity=bus)
+    >>> demand = Demand(
+    ...     name="demand", bus_in_electricity=bus, input_timeseries=[1, 2]
+    ... )
+    >>> es.add(bus, dso, demand)
+    >>> labels = FlowLabels(es)
+    >>> flows = pd.DataFrame(
+    ...     [[1.0, 1.0, 0.0], [2.0, 2.5, 0.5]],
+    ...     index=es.timeindex[:-1],
+    ...     columns=pd.MultiIndex.from_tuples(
+    ...         [(bus, demand), (dso.subnodes[3], bus), (bus, dso.subnodes[1])]
+    ...     ),
+    ... )
+    >>> labels.relabel(flows).columns[1]
+    ('dso.consumption_converter', 'electricity')
+    >>> balances = labels.balances(flows, by="carrier")
+    >>> balances.loc["electricity"].to_dict()
+    {'in': 3.5, 'out': 3.5, 'import': 3.5, 'export': 0.5, 'balance': 0.0}
+    """
+
+    def __init__(self, energy_system):
+        keys = list(energy_system.flows())
+        # positions of the flows, nodes are slow to sort for a pandas index
+        self.positions = {key: position for position, key in enumerate(keys)}
+        self.ids = pd.MultiIndex.from_tuples(
+            [(component_id(o), component_id(i)) for o, i in keys]
+        )
+        self.timeincrement = np.asarray(energy_system.timeincrement)
+        rows = []
+        for position, (o, i) in enumerate(keys):
+            for bus, other, direction in ((i, o, "in"), (o, i, "out")):
+                if not isinstance(bus, Bus):
+                    continue
+                facade = _facade(other)
+                exchange = None
+                # flows inside a DSO do not cross the grid connection
+                if isinstance(facade, DSO) and _facade(bus) is not facade:
+                    exchange = "import" if direction == "in" else "export"
+                rows.append(
+                    (
+                        position,
+                        component_id(bus),
+                        getattr(bus, "carrier", None) or component_id(bus),
+                        direction,
+                        component_id(facade),
+                        type(facade).__name__,
+                        exchange,
+                    )
+                )
+        self.table = pd.DataFrame(
+            rows,
+            columns=[
+                "flow",
+                "bus",
+                "carrier",
+                "direction",
+                "component",
+                "component_type",
+                "exchange",
+            ],
+        )
+        self.table.insert(
+            1, "source", self.ids.get_level_values(0)[self.table["flow"]]
+        )
+        self.table.insert(
+            2, "target", self.ids.get_level_values(1)[self.table["flow"]]
+        )
+        for column in self.table.columns[1:]:
+            self.table[column] = self.table[column].astype("category")
+
+    def _columns(self, flows):
+        """Return the label position of every column of a flow table."""
+        positions = np.fromiter(
+            (self.positions.get(key, -1) for key in flows.columns),
+            dtype=np.intp,
+            count=len(flows.columns),
+        )
+        if (positions < 0).any():
+            unknown = flows.columns[positions < 0][:3].tolist()
+            msg = f"The flows {unknown} are not part of the energy system."
+            raise ValueError(msg)
+        return positions
+
+    def relabel(self, flows):
+        """Return the flow table with the component ids as columns."""
+        relabelled = flows.copy(deep=False)
+        relabelled.columns = self.ids[self._columns(flows)]
+        return relabelled
+
+    def _connections(self, flows):
+        """Return the connections of the columns and their column number."""
+        column = np.full(len(self.positions), -1)
+        column[self._columns(flows)] = np.arange(len(flows.columns))
+        table = self.table.assign(column=column[self.table["flow"]])
+        return table[table["column"] >= 0]
+
+    def balances(self, flows, by="bus", timeincrement=None):
+        """
+        Return the energy into and out of every bus (or carrier).
+
+        Parameters
+        ----------
+        flows : pandas.DataFrame
+            Flows like ``oemof.solph.Results.get("flow")``
+        by : str or list, default="bus"
+            Column(s) of ``table`` to group by, e.g. "carrier" or
+            ["bus", "component_type"]
+        timeincrement : array-like or None, default=None
+            Length of the time steps in hours, defaults to the one of the
+            energy system
+
+        Returns
+        -------
+        pandas.DataFrame : the energy "in" and "out" of the buses, the
+            "import" and "export" of the DSOs and the "balance" (in - out)
+        """
+        if timeincrement is None:
+            timeincrement = self.timeincrement[: len(flows)]
+        energy = np.asarray(timeincrement, dtype=np.float64) @ flows.to_numpy(
+            dtype=np.float64
+        )
+        table = self._connections(flows)
+        table = table.assign(value=energy[table["column"]])
+        kinds = [
+            table.groupby(by, observed=True)["value"].sum().rename(kind)
+            for kind, table in (
+                ("in", table[table["direction"] == "in"]),
+                ("out", table[table["direction"] == "out"]),
+                ("import", table[table["exchange"] == "import"]),
+                ("export", table[table["exchange"] == "export"]),
+            )
+        ]
+        balances = pd.concat(kinds, axis=1).fillna(0.0)
+        balances["balance"] = balances["in"] - balances["out"]
+        return balances
+
+    def balance_series(self, flows, by="bus"):
+        """
+        Return the balance (in - out) of every bus (or carrier) per time step.
+
+        The flows are summed by one sparse matrix product.
+        """
+        # scipy is imported here, as it is only needed for the balances
+        from scipy.sparse import csr_matrix  # noqa: PLC0415
+
+        table = self._connections(flows)
+        groups = table[by].cat.remove_unused_categories()
+        sign = np.where(table["direction"] == "in", 1.0, -1.0)
+        incidence = csr_matrix(
+            (sign, (table["column"], groups.cat.codes)),
+            shape=(len(flows.columns), len(groups.cat.categories)),
+        )
+        values = incidence.T @ flows.to_numpy(dtype=np.float64).T
+        return pd.DataFrame(
+            values.T,
+            index=flows.index,
+            columns=pd.Index(groups.cat.categories, name=by),
+        )
+
+
+# Result tables extracted by LazyResults itself
+_TABLES = {
+    "flow": "flows",
+    "storage_content": "storage_content",
+    "invest": "invest",
+}
@@ -0,0 +1,378 @@
+import contextlib
+import logging
+import multiprocessing
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from oemof.solph import Investment
+from oemof.solph import Model
+from oemof.solph.components import GenericStorage
+
+from placades.timeseries import replaced_sequences
+from placades.timeseries import share_nodes
+
+Window = namedtuple("Window", ["number", "start", "stop", "keep"])
+
+# Arguments of the parallel windows, set in each worker process
+_worker_arguments = None
+
+
+def create_windows(timesteps, window, overlap=0):
+    """
+    Split the time steps into windows.
+
+    Every window is solved for ``window + overlap`` time steps, but only the
+    first ``window`` time steps are kept. The overlap looks ahead, so e.g.
+    storages are not emptied at the end of a window.
+
+    Examples
+    --------
+    >>> for w in create_windows(10, window=4, overlap=2):
+    ...     print(w)
+    Window(number=0, start=0, stop=6, keep=4)
+    Window(number=1, start=4, stop=10, keep=4)
+    Window(number=2, start=8, stop=10, keep=2)
+    """
+    if window < 1 or overlap < 0:
+        msg = (
+            "The window has to be positive and the overlap must not be"
+            f" negative, got window={window} and overlap={overlap}."
+        )
+        raise ValueError(msg)
+    return [
+        Window(
+            number,
+            start,
+            min(start + window + overlap, timesteps),
+            min(window, timesteps - start),
+        )
+        for number, start in enumerate(range(0, timesteps, window))
+    ]
+
+
+def _slice(values, start, stop, timesteps):
+    if isinstance(values, np.ndarray) and values.ndim == 1:
+        if len(values) == timesteps:
+            return values[start:stop]
+        if len(values) == timesteps + 1:
+            return values[start : stop + 1]
+    return values
+
+
+@contextlib.contextmanager
+def _window_view(energy_system, start, stop):
+    """
+    Create the energy system of a window.
+
+    The sequences of the flows and nodes are replaced by views of the window
+    and restored afterwards, like the changed storage attributes. The nodes
+    are shared with the original energy system.
+    """
+    timesteps = len(energy_system.timeindex) - 1
+    storages = [
+        node
+        for node in energy_system.nodes
+        if isinstance(node, GenericStorage)
+    ]
+    attributes = [
+        (storage, storage.initial_storage_level, storage.balanced)
+        for storage in storages
+    ]
+    try:
+        with replaced_sequences(
+            energy_system,
+            lambda _, values: _slice(values, start, stop, timesteps),
+        ):
+            yield share_nodes(
+                energy_system,
+                timeindex=energy_system.timeindex[start : stop + 1],
+                infer_last_interval=False,
+            )
+    finally:
+        for storage, level, balanced in attributes:
+            storage.initial_storage_level = level
+            storage.balanced = balanced
+
+
+def _check_dispatch(energy_system):
+    for (source, target), flow in energy_system.flows().items():
+        if flow.investment is not None:
+            msg = (
+                "A rolling horizon can only be used for dispatch, but the"
+                f" flow from {source.label} to {target.label} is optimised."
+            )
+            raise ValueError(msg)
+    for node in energy_system.nodes:
+        if isinstance(getattr(node, "investment", None), Investment):
+            msg = (
+                "A rolling horizon can only be used for dispatch, but the"
+                f" capacity of {node.label} is optimised."
+            )
+            raise ValueError(msg)
+
+
+def _solve_window(
+    energy_system,
+    window,
+    single,
+    flows,
+    storages,
+    levels,
+    end_levels,
+    solver,
+    cmdline_options,
+):
+    """Solve one window and return the kept flows, contents and costs."""
+    flow_objects = [energy_system.flows()[key] for key in flows]
+    with _window_view(energy_system, window.start, window.stop) as system:
+        for storage in storages:
+            storage.balanced = storage.balanced and single
+            if levels is not None:
+                storage.initial_storage_level = levels[storage]
+        model = Model(energysystem=system)
+        if end_levels:
+            for storage, content in end_levels.items():
+                variable = model.GenericStorageBlock.storage_content[
+                    storage, window.stop - window.start
+                ]
+                variable.fix(content)
+        model.solve(solver=solver, cmdline_options=cmdline_options)
+
+        length = window.stop - window.start
+        flow_values = np.fromiter(
+            (
+                model.flow[o, i, t].value
+                for o, i in flows
+                for t in range(window.keep)
+            ),
+            dtype=np.float64,
+            count=len(flows) * window.keep,
+        ).reshape(len(flows), window.keep)
+        timeincrement = np.asarray(system.timeincrement[: window.keep])
+        costs = sum(
+            float(
+                np.dot(
+                    _as_array(flow.variable_costs, length)[: window.keep]
+                    * timeincrement,
+                    values,
+                )
+            )
+            for flow, values in zip(flow_objects, flow_values, strict=True)
+        )
+        storage_values = np.array(
+            [
+                [
+                    model.GenericStorageBlock.storage_content[storage, t].value
+                    for t in range(window.keep + 1)
+                ]
+                for storage in storages
+            ],
+            dtype=np.float64,
+        ).reshape(len(storages), window.keep + 1)
+    return flow_values, storage_values, costs
+
+
+def _as_array(values, length):
+    if isinstance(values, np.ndarray):
+        return values
+    return np.full(length, values[0], dtype=np.float64)
+
+
+def _init_worker(*arguments):
+    global _worker_arguments
+    _worker_arguments = arguments
+
+
+def _solve_parallel_window(window):
+    energy_system, *args = _worker_arguments
+    return _solve_window(energy_system, window, False, *args)
+
+
+def solve_rolling_horizon(
+    energy_system,
+    window,
+    overlap=0,
+    solver="cbc",
+    cmdline_options=None,
+    parallel=False,
+    workers=None,
+):
+    """
+    Solve the dispatch of an energy system window by window.
+
+    Instead of one model of the whole time horizon one smaller model per
+    window is built and solved, so the peak memory depends on the window
+    length. The storage content at the end of the kept part of a window is
+    the initial storage content of the next window. Balanced storages end
+    the last window with the content of the first one.
+
+    Parameters
+    ----------
+    energy_system : oemof.solph.EnergySystem
+        Energy system with a time index, capacities must not be optimised
+    window : int
+        Time steps kept of each window
+    overlap : int, default=0
+        Additional time steps solved, but not kept, at the end of a window
+    solver : str, default="cbc"
+        Solver used by oemof.solph
+    cmdline_options : dict or None, default=None
+        Options of the solver
+    parallel : bool, default=False
+        Solve the windows in parallel processes. Only possible if the windows
+        are decoupled, i.e. there are no storages, and on platforms which
+        can fork processes (not on Windows).
+    workers : int or None, default=None
+        Number of processes of the parallel mode
+
+    Returns
+    -------
+    dict : the stitched "flow" and "storage_content" tables in the structure
+        of ``oemof.solph.Results`` and the "variable_costs", which are the
+        sum of the variable costs of the flows in the kept time steps. Other
+        terms of an objective are not included. Constraints linking time steps
+        apart from the storage balance (e.g. gradients or minimum up times)
+        are not passed from one window to the next.
+
+    Examples
+    --------
+    >>> from oemof.solph import EnergySystem
+    >>> from placades import CarrierBus
+    >>> from placades import Demand
+    >>> from placades import DsoElectricity
+    >>> es = EnergySystem(
+    ...     timeindex=pd.date_range("2025", periods=7, freq="h"),
+    ...     infer_last_interval=False,
+    ... )
+    >>> bus = CarrierBus(name="electricity")
+    >>> demand = Demand(
+    ...     name="demand",
+    ...     bus_in_electricity=bus,
+    ...     input_timeseries=[1, 2, 3, 4, 5, 6],
+    ... )
+    >>> es.add(bus, DsoElectricity(name="dso", bus_electricity=bus), demand)
+    >>> results = solve_rolling_horizon(es, window=4, solver="highs")
+    >>> round(results["variable_costs"], 2)
+    6.3
+    >>> results["flow"][bus, demand].tolist()
+    [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    """
+    _check_dispatch(energy_system)
+    timesteps = len(energy_system.timeindex) - 1
+    windows = create_windows(timesteps, window, overlap)
+    flows = list(energy_system.flows())
+    storages = [
+        node
+        for node in energy_system.nodes
+        if isinstance(node, GenericStorage)
+    ]
+    cmdline_options = cmdline_options or {}
+    start_time = time.perf_counter()
+
+    if parallel:
+        if storages:
+            msg = (
+                "The windows are coupled by the storages "
+                f"{[str(s.label) for s in storages]} and cannot be solved in"
+                " parallel."
+            )
+            raise ValueError(msg)
+        if "fork" not in multiprocessing.get_all_start_methods():
+            msg = (
+                "The windows can only be solved in parallel on platforms"
+                " which can fork processes, use parallel=False."
+            )
+            raise ValueError(msg)
+        # the nodes and sequences of oemof.solph cannot be pickled, so the
+        # workers are forked and inherit the arguments of the initializer,
+        # only the windows and the results are pickled
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(
+                energy_system,
+                flows,
+                storages,
+                None,
+                {},
+                solver,
+                cmdline_options,
+            ),
+        ) as pool:
+            solved = list(pool.map(_solve_parallel_window, windows))
+    else:
+        solved = []
+        levels = None
+        end_levels = {}
+        for current in windows:
+            last = current.number == len(windows) - 1
+            result = _solve_window(
+                energy_system,
+                current,
+                len(windows) == 1,
+                flows,
+                storages,
+                levels,
+                end_levels if last else {},
+                solver,
+                cmdline_options,
+            )
+            storage_values = result[1]
+            if current.number == 0:
+                end_levels = {
+                    storage: content
+                    for storage, content in zip(
+                        storages, storage_values[:, 0], strict=True
+                    )
+                    if storage.balanced
+                }
+            levels = {
+                storage: _storage_level(
+                    storage, content, current.start + current.keep
+                )
+                for storage, content in zip(
+                    storages, storage_values[:, -1], strict=True
+                )
+            }
+            solved.append(result)
+            logging.info(
+                "Window %s of %s solved", current.number + 1, len(windows)
+            )
+    logging.info(
+        "Rolling horizon solved in %.1f s", time.perf_counter() - start_time
+    )
+
+    flow_values = np.concatenate([values for values, _, _ in solved], axis=1)
+    storage_values = np.concatenate(
+        [values[:, :-1] for _, values, _ in solved] + [solved[-1][1][:, -1:]],
+        axis=1,
+    )
+    return {
+        "flow": pd.DataFrame(
+            flow_values.T,
+            index=energy_system.timeindex[:-1],
+            columns=pd.MultiIndex.from_tuples(flows),
+        ),
+        "storage_content": pd.DataFrame(
+            storage_values.T,
+            index=energy_system.timeindex,
+            columns=pd.Index(storages, dtype=object),
+        ),
+        "variable_costs": sum(costs for _, _, costs in solved),
+    }
+
+
+def _storage_level(storage, content, timepoint):
+    """Return the relative level within the bounds of the storage."""
+    level = content / storage.nominal_storage_capacity
+    return float(
+        np.clip(
+            level,
+            storage.min_storage_level[timepoint],
+            storage.max_storage_level[timepoint],
+        )
+    )
@@ -0,0 +1,292 @@
+import contextlib
+import csv
+import glob
+import json
+import logging
+import os
+import time
+import warnings
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from pathlib import Path
+
+from placades import profiling
+
+# Name of the option to limit the threads of a solver
+SOLVER_THREAD_OPTIONS = {
+    "cbc": "threads",
+    "cplex": "threads",
+    "gurobi": "Threads",
+    "highs": "threads",
+}
+
+ScenarioResult = namedtuple(
+    "ScenarioResult",
+    ["name", "path", "output_dir", "status", "objective", "seconds", "error"],
+)
+
+
+def find_datapackages(paths):
+    """
+    Return the datapackage.json files of directories, globs or files.
+
+    Directories are searched recursively.
+
+    Examples
+    --------
+    >>> packages = find_datapackages("examples/simple_dispatch/*_package")
+    >>> [p.parent.name for p in packages]
+    ['openPlan_package']
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    packages = []
+    for pattern in paths:
+        # glob.glob, as Path.glob does not support absolute patterns
+        for match in sorted(glob.glob(str(pattern))) or [pattern]:  # noqa: PTH207
+            path = Path(match)
+            if path.is_dir():
+                packages.extend(sorted(path.rglob("datapackage.json")))
+            elif path.is_file():
+                packages.append(path)
+    return list(dict.fromkeys(p.resolve() for p in packages))
+
+
+def _scenario_names(packages):
+    """Name the scenarios by their shortest unique parent directories."""
+    parts = [p.parent.parts for p in packages]
+    for depth in range(1, max((len(p) for p in parts), default=0) + 1):
+        names = ["__".join(p[-depth:]) for p in parts]
+        if len(set(names)) == len(names):
+            return names
+    return [str(number) for number in range(len(packages))]
+
+
+def solve_datapackage(
+    path,
+    output_dir,
+    name=None,
+    solver="cbc",
+    solver_threads=1,
+    cache_dir=None,
+    resolution=None,
+    results_format="csv",
+    profile=False,
+):
+    """
+    Build, solve and export one datapackage.
+
+    The results are written to ``output_dir``: one file per result
+    variable (e.g. "flow.csv") and a "scenario.json" with the status and
+    the objective. Errors are not raised but returned in the result, so
+    one failing scenario does not stop a batch.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Path to the datapackage.json
+    output_dir : str or pathlib.Path
+        Directory of the results of this scenario
+    name : str or None, default=None
+        Name of the scenario, defaults to the name of the package directory
+    solver : str, default="cbc"
+        Solver used by oemof.solph
+    solver_threads : int or None, default=1
+        Threads of the solver, None leaves it to the solver
+    cache_dir : str or pathlib.Path or None, default=None
+        Directory of the sequence cache, see
+        :func:`placades.datapackage.reading.from_datapackage`
+    resolution : str or None, default=None
+        Coarser time resolution of the sequences, e.g. "4h"
+    results_format : str, default="csv"
+        "csv" for wide csv files of all result tables, "parquet" or "arrow"
+        for the flows, storage contents and investments in the long format
+        of :func:`placades.datapackage.results.write_results`
+    profile : bool, default=False
+        Write the timings of the stages and facades and the size of the
+        model to "profile.json", see :func:`placades.profiling.profile`
+
+    Returns
+    -------
+    ScenarioResult
+    """
+    from oemof.solph import Model  # noqa: PLC0415
+
+    from placades.datapackage.reading import from_datapackage  # noqa: PLC0415
+
+    path = Path(path)
+    output_dir = Path(output_dir)
+    if name is None:
+        name = path.parent.name
+    start = time.perf_counter()
+    objective = None
+    error = None
+    profiler = (
+        profiling.profile(path=Path(output_dir, "profile.json"))
+        if profile
+        else contextlib.nullcontext()
+    )
+    with profiler:
+        try:
+            energy_system = from_datapackage(
+                path, cache_dir=cache_dir, resolution=resolution
+            )
+            with profiling.stage("build_model"):
+                model = Model(energysystem=energy_system)
+            options = {}
+            if solver_threads is not None and solver in SOLVER_THREAD_OPTIONS:
+                options[SOLVER_THREAD_OPTIONS[solver]] = solver_threads
+            with profiling.stage("solve"):
+                results = model.solve(solver=solver, cmdline_options=options)
+            objective = results["objective"]
+            with profiling.stage("write_results"):
+                _write_results(results, model, output_dir, results_format)
+            status = "optimal"
+        except Exception as e:
+            logging.exception("Scenario %s failed", name)
+            status = "error"
+            error = f"{type(e).__name__}: {e}"
+    result = ScenarioResult(
+        name,
+        str(path),
+        str(output_dir),
+        status,
+        objective,
+        time.perf_counter() - start,
+        error,
+    )
+    output_dir.mkdir(parents=True, exist_ok=True)
+    Path(output_dir, "scenario.json").write_text(
+        json.dumps(result._asdict(), indent=4)
+    )
+    return result
+
+
+def _write_results(results, model, output_dir, results_format="csv"):
+    from oemof.tools.debugging import ExperimentalFeatureWarning  # noqa: PLC0415
+
+    from placades.datapackage.results import nodes_of  # noqa: PLC0415
+    from placades.datapackage.results import write_labels  # noqa: PLC0415
+    from placades.datapackage.results import write_results  # noqa: PLC0415
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # solver results are already part of scenario.json
+    keys = results.keys() - model.solver_results.keys() - {"objective"}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ExperimentalFeatureWarning)
+        if results_format != "csv":
+            write_results(results, output_dir, format=results_format)
+            return
+        tables = []
+        for key in sorted(keys):
+            table = results.get(key)
+            if not hasattr(table, "to_csv"):
+                continue
+            tables.append(table)
+            if hasattr(table, "columns"):
+                table = table.rename(columns=_label)
+            table.to_csv(Path(output_dir, f"{key}.csv"))
+        write_labels(nodes_of(tables), output_dir)
+
+
+def _label(node):
+    return str(getattr(node, "label", node))
+
+
+def run_scenarios(
+    paths,
+    output_dir,
+    workers=None,
+    solver="cbc",
+    solver_threads=1,
+    cache_dir=None,
+    resolution=None,
+    results_format="csv",
+    profile=False,
+):
+    """
+    Solve many datapackages in a process pool.
+
+    Every scenario is built, solved and exported in its own process, the
+    results are written to a sub-directory of ``output_dir`` named after
+    the scenario. A "scenarios.csv" summarises all scenarios.
+
+    Parameters
+    ----------
+    paths : str or pathlib.Path or iterable
+        Directories, glob patterns or datapackage.json files
+    output_dir : str or pathlib.Path
+        Directory of the results
+    workers : int or None, default=None
+        Number of processes, defaults to the number of cores divided by
+        ``solver_threads``
+    solver : str, default="cbc"
+        Solver used by oemof.solph
+    solver_threads : int or None, default=1
+        Threads of the solver per scenario
+    cache_dir : str or pathlib.Path or None, default=None
+        Directory of the sequence cache shared by all processes
+    resolution : str or None, default=None
+        Coarser time resolution of all scenarios, e.g. "4h"
+    results_format : str, default="csv"
+        Format of the results, "csv", "parquet" or "arrow". The columnar
+        results of all scenarios are read by
+        :func:`placades.datapackage.results.read_results`.
+    profile : bool, default=False
+        Write a "profile.json" per scenario, see :func:`solve_datapackage`
+
+    Returns
+    -------
+    list of ScenarioResult : in the order of the datapackages
+    """
+    packages = find_datapackages(paths)
+    if not packages:
+        msg = f"No datapackage.json found in {paths}."
+        raise FileNotFoundError(msg)
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 1) // (solver_threads or 1))
+    output_dir = Path(output_dir)
+    names = _scenario_names(packages)
+    jobs = {
+        name: {
+            "path": path,
+            "output_dir": Path(output_dir, name),
+            "name": name,
+            "solver": solver,
+            "solver_threads": solver_threads,
+            "cache_dir": cache_dir,
+            "resolution": resolution,
+            "results_format": results_format,
+            "profile": profile,
+        }
+        for name, path in zip(names, packages, strict=True)
+    }
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = {
+            pool.submit(solve_datapackage, **job): name
+            for name, job in jobs.items()
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            logging.info(
+                "Scenario %s: %s (%.1f s)",
+                result.name,
+                result.status,
+                result.seconds,
+            )
+            results[futures[future]] = result
+
+    results = [results[name] for name in names]
+    _write_summary(results, Path(output_dir, "scenarios.csv"))
+    return results
+
+
+def _write_summary(results, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(ScenarioResult._fields)
+        writer.writerows(results)
@@ -0,0 +1,370 @@
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+from oemof.solph import Investment
+from oemof.solph import Model
+from oemof.solph import Results
+
+from placades.profiling import stage
+
+try:
+    from pyomo.contrib.appsi.base import TerminationCondition
+    from pyomo.contrib.appsi.solvers import Highs
+except ImportError:
+    Highs = None
+
+
+class ParameterSweep:
+    """
+    Solve one energy system for many values of a parameter.
+
+    The model is built once. Between the solves only the facades are
+    changed in place by an update function, e.g.
+    :meth:`placades.facades.providers.dso.DSO.set_prices` or
+    :func:`set_capex_var`. Afterwards the objective is rebuilt from the
+    changed costs and the bounds of all flows with changed ``fix``,
+    ``minimum``, ``maximum`` or ``nominal_capacity`` are updated, for flows
+    with an investment the constraints bounding them by the invested
+    capacity. Changes of other attributes, which are part of the
+    constraints, are not applied.
+
+    With the "highs" solver one persistent solver instance is reused, so
+    only the changed coefficients are passed to the solver.
+
+    Parameters
+    ----------
+    energy_system : oemof.solph.EnergySystem
+        Energy system of placades facades
+    solver : str, default="cbc"
+        Solver used by oemof.solph
+    cmdline_options : dict or None, default=None
+        Options of the solver, e.g. {"threads": 1}
+    result_keys : tuple, default=("flow",)
+        Keys of the oemof.solph results collected for every value
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from oemof.solph import EnergySystem
+    >>> from placades import CarrierBus
+    >>> from placades import Demand
+    >>> from placades import DsoElectricity
+    >>> es = EnergySystem(
+    ...     timeindex=pd.date_range("2025", periods=3, freq="h"),
+    ...     infer_last_interval=False,
+    ... )
+    >>> bus = CarrierBus(name="electricity")
+    >>> dso = DsoElectricity(name="dso", bus_electricity=bus)
+    >>> demand = Demand(
+    ...     name="demand", bus_in_electricity=bus, input_timeseries=[1, 2]
+    ... )
+    >>> es.add(bus, dso, demand)
+    >>> sweep = ParameterSweep(es, solver="highs")
+    >>> flows = sweep.run(
+    ...     [0.2, 0.3],
+    ...     lambda price: dso.set_prices(energy_price=price),
+    ...     name="energy_price",
+    ... )
+    >>> sweep.objectives.round(2).tolist()
+    [0.6, 0.9]
+    >>> flows.index.names
+    FrozenList(['energy_price', None])
+    """
+
+    def __init__(
+        self,
+        energy_system,
+        solver="cbc",
+        cmdline_options=None,
+        result_keys=("flow",),
+    ):
+        start = time.perf_counter()
+        with stage("build_model"):
+            self.model = Model(energysystem=energy_system)
+        logging.info("Model built in %.1f s", time.perf_counter() - start)
+        self.solver = solver
+        self.cmdline_options = cmdline_options or {}
+        self.result_keys = result_keys
+        self.objectives = pd.Series(dtype=float)
+        self._persistent_solver = None
+        self._bounds = self._get_bound_attributes()
+
+    def _get_bound_attributes(self):
+        # copies of the values, so changes in place are detected as well
+        timesteps = len(self.model.TIMESTEPS)
+        return {
+            key: (
+                _values(flow.fix, timesteps),
+                _values(flow.minimum, timesteps),
+                _values(flow.maximum, timesteps),
+                flow.nominal_capacity,
+            )
+            for key, flow in self.model.flows.items()
+        }
+
+    def update(self):
+        """Apply changed facade attributes to the model."""
+        # oemof.solph replaces the cost expressions of the blocks, which
+        # pyomo logs as a warning
+        logger = logging.getLogger("pyomo.core")
+        level = logger.level
+        logger.setLevel(logging.ERROR)
+        try:
+            self.model._add_objective(update=True)
+        finally:
+            logger.setLevel(level)
+        bounds = self._get_bound_attributes()
+        for (o, i), attributes in bounds.items():
+            if not _equal_bounds(attributes, self._bounds[o, i]):
+                self._update_flow_bounds(o, i)
+        self._bounds = bounds
+
+    def _update_flow_bounds(self, o, i):
+        """Set the bounds like oemof.solph does when building the model."""
+        model = self.model
+        flow = model.flows[o, i]
+        if flow.investment is not None:
+            self._update_investment_flow_bounds(o, i)
+            return
+        if flow.nominal_capacity is None:
+            return
+        for t in model.TIMESTEPS:
+            variable = model.flow[o, i, t]
+            if flow.fix is not None:
+                variable.fix(flow.fix[t] * flow.nominal_capacity)
+                continue
+            variable.unfix()
+            variable.setub(flow.maximum[t] * flow.nominal_capacity)
+            if not flow.nonconvex:
+                variable.setlb(flow.minimum[t] * flow.nominal_capacity)
+
+    def _update_investment_flow_bounds(self, o, i):
+        """
+        Rebuild the constraints of an investment flow like oemof.solph does.
+
+        The flow is bounded by the invested capacity in constraints of the
+        InvestmentFlowBlock instead of variable bounds.
+        """
+        model = self.model
+        flow = model.flows[o, i]
+        block = model.InvestmentFlowBlock
+        minimum = (o, i) in block.MIN_INVESTFLOWS
+        timesteps = len(model.TIMESTEPS)
+        if ((o, i) in block.FIXED_INVESTFLOWS) is (flow.fix is None) or (
+            not minimum
+            and flow.fix is None
+            and _values(flow.minimum, timesteps).any()
+        ):
+            msg = (
+                f"The flow from {o.label} to {i.label} has an investment, "
+                "its fix and minimum can only be changed but not be added "
+                "or removed."
+            )
+            raise ValueError(msg)
+        for p, t in model.TIMEINDEX:
+            variable = model.flow[o, i, t]
+            capacity = block.total[o, i, p]
+            if flow.fix is not None:
+                block.fixed[o, i, p, t].set_value(
+                    variable == capacity * flow.fix[t]
+                )
+                continue
+            block.max[o, i, p, t].set_value(
+                variable <= capacity * flow.maximum[t]
+            )
+            if minimum:
+                block.min[o, i, p, t].set_value(
+                    variable >= capacity * flow.minimum[t]
+                )
+
+    def solve(self):
+        """Solve the model and return the oemof.solph results."""
+        if self.solver == "highs" and Highs is not None:
+            if self._persistent_solver is None:
+                self._persistent_solver = Highs()
+                self._persistent_solver.highs_options = self.cmdline_options
+            result = self._persistent_solver.solve(self.model)
+            condition = result.termination_condition
+            if condition != TerminationCondition.optimal:
+                msg = f"The solver ended with {condition.name}."
+                raise RuntimeError(msg)
+            self.model.solver_results = {
+                "termination_condition": condition.name,
+                "wallclock_time": result.wallclock_time,
+            }
+            return Results(self.model)
+        return self.model.solve(
+            solver=self.solver, cmdline_options=self.cmdline_options
+        )
+
+    def run(self, values, update, name="value"):
+        """
+        Solve the model for every value.
+
+        Parameters
+        ----------
+        values : iterable
+            Values of the swept parameter
+        update : callable
+            Called with each value to change the facades in place
+        name : str, default="value"
+            Name of the parameter, used as index level of the results
+
+        Returns
+        -------
+        pandas.DataFrame : results of the first result key stacked with the
+            values as outer index level. All result keys are available as
+            ``results`` attribute and the objectives as ``objectives``.
+        """
+        values = list(values)
+        collected = {key: [] for key in self.result_keys}
+        objectives = []
+        for value in values:
+            with stage("update"):
+                update(value)
+                self.update()
+            with stage("solve"):
+                results = self.solve()
+            objectives.append(results["objective"])
+            for key in self.result_keys:
+                if key == "flow":
+                    table = _flow_table(self.model)
+                else:
+                    table = results.get(key)
+                    if hasattr(table, "columns"):
+                        table = table.rename(columns=_label)
+                collected[key].append(table)
+
+        index = pd.Index(values, name=name)
+        self.objectives = pd.Series(objectives, index=index, name="objective")
+        self.results = {
+            key: pd.concat(tables, keys=index)
+            for key, tables in collected.items()
+        }
+        return self.results[self.result_keys[0]]
+
+
+def _label(node):
+    return str(getattr(node, "label", node))
+
+
+def _values(sequence, timesteps):
+    if sequence is None:
+        return None
+    return np.array(sequence[:timesteps], dtype=float)
+
+
+def _equal_bounds(bounds, other):
+    for value, other_value in zip(bounds, other, strict=True):
+        if isinstance(value, np.ndarray) or isinstance(
+            other_value, np.ndarray
+        ):
+            if not np.array_equal(value, other_value):
+                return False
+        elif value is not other_value and value != other_value:
+            return False
+    return True
+
+
+def _flow_table(model):
+    """Return the flows like ``Results.get("flow")`` without stacking."""
+    flows = list(model.FLOWS)
+    timesteps = len(model.TIMESTEPS)
+    values = np.fromiter(
+        (variable.value for variable in model.flow.values()),
+        dtype=np.float64,
+        count=len(flows) * timesteps,
+    )
+    return pd.DataFrame(
+        values.reshape(len(flows), timesteps).T,
+        index=model.es.timeindex[:timesteps],
+        columns=pd.MultiIndex.from_tuples(
+            [(_label(o), _label(i)) for o, i in flows]
+        ),
+    )
+
+
+def set_capex_var(
+    facade,
+    capex_var,
+    project_data,
+    lifetime=None,
+    age_installed=None,
+    opex_fix=None,
+):
+    """
+    Change the specific investment costs of a facade in place.
+
+    The periodical costs of the investment of the facade, i.e. of its
+    storage capacity or of the flows with an investment, are recalculated.
+    ``lifetime``, ``age_installed`` and ``opex_fix`` default to the
+    attributes of the facade.
+
+    Raises
+    ------
+    ValueError
+        If the capacity of the facade is not optimised
+
+    Examples
+    --------
+    >>> from placades import CarrierBus
+    >>> from placades import Project
+    >>> from placades import PvPlant
+    >>> project = Project(
+    ...     name="p", lifetime=20, tax=0, discount_factor=0.05
+    ... )
+    >>> bus = CarrierBus(name="electricity")
+    >>> pv = PvPlant(
+    ...     project_data=project,
+    ...     bus_out_electricity=bus,
+    ...     input_timeseries=[0.5, 0.7],
+    ...     name="pv",
+    ...     optimize_cap=True,
+    ...     capex_var=1000,
+    ... )
+    >>> set_capex_var(pv, 500, project)
+    >>> pv.capex_var
+    500
+    >>> expected = project.calculate_epc(500, 20, 0) + pv.opex_fix
+    >>> bool(pv.outputs[bus].investment.ep_costs[0] == expected)
+    True
+    """
+    investments = _investments(facade)
+    if lifetime is None:
+        lifetime = facade.lifetime
+    if age_installed is None:
+        age_installed = facade.age_installed
+    if opex_fix is None:
+        opex_fix = facade.opex_fix
+    epc = (
+        project_data.calculate_epc(
+            capex_var, lifetime, age_installed, method="mvs"
+        )
+        + opex_fix
+    )
+    facade.capex_var = capex_var
+    for investment in investments:
+        investment.ep_costs = epc
+
+
+def _investments(facade):
+    """Return the investments created from the capex of a facade."""
+    # the charge and discharge flows of storages have investments without
+    # costs, which are linked to the investment of the capacity
+    investment = getattr(facade, "investment", None)
+    if isinstance(investment, Investment):
+        return [investment]
+    investments = {}
+    for flows in (facade.inputs.values(), facade.outputs.values()):
+        for flow in flows:
+            if isinstance(flow.investment, Investment):
+                investments[id(flow.investment)] = flow.investment
+    if not investments:
+        msg = (
+            f"{facade.label} has no investment, its capacity has to be "
+            "optimised (optimize_cap=True)."
+        )
+        raise ValueError(msg)
+    return list(investments.values())
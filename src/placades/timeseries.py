@@ -0,0 +1,414 @@
+import contextlib
+import hashlib
+import inspect
+import weakref
+from collections import UserDict
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+StoreInfo = namedtuple("StoreInfo", ["hits", "misses", "profiles", "nbytes"])
+
+SequenceSlot = namedtuple("SequenceSlot", ["name", "container", "key"])
+
+
+class TimeSeriesStore:
+    """
+    Store of time series interned by their content.
+
+    Identical profiles are only held once. :meth:`intern` returns the same
+    read-only array for all of them, so the memory grows with the number of
+    distinct profiles instead of the number of assets using them. A profile
+    is dropped as soon as no asset uses it anymore.
+
+    Examples
+    --------
+    >>> store = TimeSeriesStore()
+    >>> a = store.intern([0.1, 0.5, 0.2])
+    >>> b = store.intern(np.array([0.1, 0.5, 0.2]))
+    >>> a is b
+    True
+    >>> a.flags.writeable
+    False
+    >>> store.info()
+    StoreInfo(hits=1, misses=1, profiles=1, nbytes=24)
+    >>> store.intern("demand.csv")
+    'demand.csv'
+    """
+
+    def __init__(self):
+        self._profiles = weakref.WeakValueDictionary()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def intern(self, values):
+        """
+        Return the stored read-only copy of a profile.
+
+        One-dimensional numeric sequences (lists, arrays, pandas.Series) are
+        interned as float arrays. Contiguous float arrays which are read-only
+        together with all their bases, e.g. memory-mapped sequences, are
+        stored without a copy. All other values, e.g. scalars or file names,
+        are returned unchanged.
+        """
+        if isinstance(values, (str, bytes)) or np.ndim(values) != 1:
+            return values
+        array = np.ascontiguousarray(values, dtype=np.float64)
+        key = hashlib.blake2b(array.view(np.uint8), digest_size=16).digest()
+        profile = self._profiles.get(key)
+        if profile is not None and np.array_equal(
+            profile, array, equal_nan=True
+        ):
+            self._hits += 1
+        else:
+            self._misses += 1
+            profile = array
+            if not _is_immutable(profile):
+                profile = array.copy()
+                profile.flags.writeable = False
+            self._profiles[key] = profile
+        return profile
+
+    def info(self):
+        """Return the statistics and the memory of the stored profiles."""
+        return StoreInfo(
+            self._hits,
+            self._misses,
+            len(self._profiles),
+            sum(profile.nbytes for profile in self._profiles.values()),
+        )
+
+    def clear(self):
+        """Forget all stored profiles and reset the statistics."""
+        self._profiles.clear()
+        self._hits = 0
+        self._misses = 0
+
+
+def _is_immutable(array):
+    while isinstance(array, np.ndarray):
+        if array.flags.writeable:
+            return False
+        array = array.base
+    return True
+
+
+TIMESERIES_STORE = TimeSeriesStore()
+
+
+def intern_timeseries(values, store=None):
+    """Intern a profile in the given store or in ``TIMESERIES_STORE``."""
+    if store is None:
+        store = TIMESERIES_STORE
+    return store.intern(values)
+
+
+def shared_fix_flow(values, store=None, **kwargs):
+    """
+    Create a Flow fixed to an interned profile.
+
+    The profile is interned with :func:`intern_timeseries` and shared with
+    the flow by :func:`share_sequence`, so all facades with the same profile
+    use one read-only array.
+
+    Parameters
+    ----------
+    values : array-like or scalar or str
+        Profile of the flow
+    store : TimeSeriesStore or None, default=None
+        Store of the profile, defaults to ``TIMESERIES_STORE``
+    kwargs
+        Further arguments of :class:`oemof.solph.Flow`
+
+    Returns
+    -------
+    tuple : the interned profile and the flow
+
+    Examples
+    --------
+    >>> profile, flow = shared_fix_flow([0.1, 0.5, 0.2], nominal_capacity=1)
+    >>> flow.fix is profile
+    True
+    """
+    from oemof.solph import Flow  # noqa: PLC0415
+
+    values = intern_timeseries(values, store)
+    flow = Flow(fix=values, **kwargs)
+    share_sequence(flow, "fix", values)
+    return values, flow
+
+
+def share_sequence(flow, attribute, values):
+    """
+    Make a flow attribute use an interned profile without copying it.
+
+    oemof.solph converts sequence attributes of a Flow with ``np.array``,
+    which copies the interned profile. This replaces the copy by the
+    interned array in the storage of the ``Apply`` descriptor of
+    oemof.solph. If the attribute is not stored like that, e.g. in another
+    version of oemof.solph, or does not equal the profile, the copy is kept.
+
+    Returns
+    -------
+    bool : True if the attribute is the interned profile now
+
+    Examples
+    --------
+    >>> from oemof.solph import Flow
+    >>> profile = intern_timeseries([0.1, 0.5, 0.2])
+    >>> flow = Flow(fix=profile, nominal_capacity=1)
+    >>> np.shares_memory(flow.fix, profile)
+    False
+    >>> share_sequence(flow, "fix", profile)
+    True
+    >>> np.shares_memory(flow.fix, profile)
+    True
+    """
+    if not isinstance(values, np.ndarray):
+        return False
+    try:
+        from oemof.solph._plumbing import Apply  # noqa: PLC0415
+    except ImportError:
+        return False
+    descriptor = inspect.getattr_static(type(flow), attribute, None)
+    if not isinstance(descriptor, Apply) or not isinstance(
+        getattr(descriptor, "data", None), dict
+    ):
+        return False
+    copy = descriptor.data.get(id(flow))
+    if (
+        copy is not getattr(flow, attribute)
+        or not isinstance(copy, np.ndarray)
+        or copy.shape != values.shape
+        or not np.array_equal(copy, values, equal_nan=True)
+    ):
+        return False
+    descriptor.data[id(flow)] = values
+    if getattr(flow, attribute) is not values:
+        descriptor.data[id(flow)] = copy
+        return False
+    return True
+
+
+def _apply_descriptors(holder):
+    from oemof.solph._plumbing import Apply  # noqa: PLC0415
+
+    for cls in type(holder).__mro__:
+        for name, value in vars(cls).items():
+            if isinstance(value, Apply) and id(holder) in value.data:
+                yield name, value
+
+
+def sequence_slots(energy_system):
+    """
+    Return where the sequences of all flows and nodes are stored.
+
+    Every slot holds its sequence as ``slot.container[slot.key]``. Assigning
+    to it replaces the sequence without the conversion (i.e. copy) of
+    oemof.solph. The slots are named "<label>/<attribute>" with the labels
+    of the source and the target for flows.
+
+    Examples
+    --------
+    >>> from oemof.solph import Bus
+    >>> from oemof.solph import EnergySystem
+    >>> from oemof.solph import Flow
+    >>> from oemof.solph.components import Sink
+    >>> bus = Bus(label="bus")
+    >>> sink = Sink(
+    ...     label="sink", inputs={bus: Flow(fix=[1, 2], nominal_capacity=1)}
+    ... )
+    >>> es = EnergySystem()
+    >>> es.add(bus, sink)
+    >>> [s.name for s in sequence_slots(es) if isinstance(
+    ...     s.container[s.key], np.ndarray
+    ... )]
+    ['bus/sink/fix']
+    """
+    holders = [(str(node.label), node) for node in energy_system.nodes]
+    for (source, target), flow in energy_system.flows().items():
+        name = f"{source.label}/{target.label}"
+        holders.append((name, flow))
+        if flow.nonconvex is not None:
+            holders.append((f"{name}/nonconvex", flow.nonconvex))
+
+    slots = []
+    for name, holder in holders:
+        for attribute, descriptor in _apply_descriptors(holder):
+            values = descriptor.data[id(holder)]
+            if isinstance(values, UserDict):
+                # e.g. the conversion factors of a Converter
+                slots.extend(
+                    SequenceSlot(
+                        f"{name}/{attribute}/{getattr(key, 'label', key)}",
+                        values.data,
+                        key,
+                    )
+                    for key in values.data
+                )
+            else:
+                slots.append(
+                    SequenceSlot(
+                        f"{name}/{attribute}", descriptor.data, id(holder)
+                    )
+                )
+    return slots
+
+
+@contextlib.contextmanager
+def replaced_sequences(energy_system, replace):
+    """
+    Replace the sequences of an energy system within the context.
+
+    ``replace`` is called with the name and the values of every slot of
+    :func:`sequence_slots` and returns the new values. The original values
+    are restored when the context is left.
+    """
+    originals = []
+    try:
+        for slot in sequence_slots(energy_system):
+            values = slot.container[slot.key]
+            originals.append((slot, values))
+            slot.container[slot.key] = replace(slot.name, values)
+        yield
+    finally:
+        for slot, values in reversed(originals):
+            slot.container[slot.key] = values
+
+
+def share_nodes(energy_system, **kwargs):
+    """
+    Create an energy system with the nodes of another one.
+
+    The keyword arguments are passed to oemof.solph's EnergySystem, e.g. a
+    shorter ``timeindex``. Subnodes are added by their parents.
+    """
+    from oemof.solph import EnergySystem  # noqa: PLC0415
+
+    shared = EnergySystem(**kwargs)
+    shared.add(
+        *(
+            node
+            for node in energy_system.nodes
+            if getattr(node, "parent", None) is None
+        )
+    )
+    return shared
+
+
+def _resolution_step(timeindex, resolution):
+    """Return the number of time steps merged into one coarse time step."""
+    freq = timeindex.freq or pd.infer_freq(timeindex)
+    if freq is None:
+        msg = "The time index needs a regular frequency to be resampled."
+        raise ValueError(msg)
+    step = pd.Timedelta(resolution) / (timeindex[1] - timeindex[0])
+    if step < 1 or step != int(step):
+        msg = (
+            f"The resolution {resolution} is no multiple of the frequency"
+            f" {freq} of the time index."
+        )
+        raise ValueError(msg)
+    return int(step)
+
+
+def resample_values(values, step, timesteps):
+    """
+    Average a sequence over coarse time steps of ``step`` time steps.
+
+    Sequences of the ``timesteps`` intervals or of the ``timesteps + 1``
+    time points are averaged, the value of the last time point is kept.
+    The last coarse time step may be shorter. Other values are returned
+    unchanged.
+
+    Examples
+    --------
+    >>> resample_values(np.array([1, 2, 3, 4, 5]), 2, 5).tolist()
+    [1.5, 3.5, 5.0]
+    >>> resample_values(np.array([1, 2, 3, 4, 5]), 2, 4).tolist()
+    [1.5, 3.5, 5.0]
+    """
+    if not isinstance(values, np.ndarray) or values.ndim != 1:
+        return values
+    if len(values) not in (timesteps, timesteps + 1):
+        return values
+    starts = np.arange(0, timesteps, step)
+    lengths = np.diff(np.append(starts, timesteps))
+    means = np.add.reduceat(values[:timesteps], starts) / lengths
+    if len(values) > timesteps:
+        means = np.append(means, values[timesteps])
+    return means
+
+
+def resample(energy_system, resolution):
+    """
+    Change the time resolution of an energy system.
+
+    All sequences of the flows and nodes, e.g. the profiles of the facades,
+    the COPs of heat pumps or time-dependent prices, are replaced in place
+    by their means over the coarse time steps. Flows are powers in
+    oemof.solph, so the mean keeps the energy of every coarse time step,
+    and ratios are averaged as well. oemof.solph scales the loss rates and
+    the fixed losses of storages (``self_discharge``,
+    ``thermal_loss_rate``) and the variable costs by the length of the time
+    steps, so they are not changed. The ``peak_demand_pricing_period`` of
+    the DSOs counts periods per year and does not depend on the resolution
+    either.
+
+    The nodes are shared with the original energy system, which should not
+    be used anymore.
+
+    Parameters
+    ----------
+    energy_system : oemof.solph.EnergySystem
+        Energy system with a regular time index
+    resolution : str or pandas.Timedelta
+        New length of the time steps, e.g. "4h" or "1D", a multiple of the
+        frequency of the time index
+
+    Returns
+    -------
+    oemof.solph.EnergySystem : energy system of the coarse time index
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from oemof.solph import Bus
+    >>> from oemof.solph import EnergySystem
+    >>> from oemof.solph import Flow
+    >>> from oemof.solph.components import Sink
+    >>> es = EnergySystem(
+    ...     timeindex=pd.date_range("2025", periods=5, freq="h"),
+    ...     infer_last_interval=False,
+    ... )
+    >>> bus = Bus(label="bus")
+    >>> sink = Sink(
+    ...     label="sink",
+    ...     inputs={bus: Flow(fix=[1, 2, 3, 4], nominal_capacity=1)},
+    ... )
+    >>> es.add(bus, sink)
+    >>> coarse = resample(es, "2h")
+    >>> coarse.timeincrement.tolist()
+    [2.0, 2.0]
+    >>> sink.inputs[bus].fix.tolist()
+    [1.5, 3.5]
+    """
+    timeindex = energy_system.timeindex
+    step = _resolution_step(timeindex, resolution)
+    timesteps = len(timeindex) - 1
+    coarse_index = timeindex[::step]
+    if timesteps % step:
+        coarse_index = coarse_index.append(timeindex[-1:])
+    resampled = {}
+    for slot in sequence_slots(energy_system):
+        values = slot.container[slot.key]
+        if id(values) not in resampled:
+            resampled[id(values)] = resample_values(values, step, timesteps)
+        slot.container[slot.key] = resampled[id(values)]
+    return share_nodes(
+        energy_system, timeindex=coarse_index, infer_last_interval=False
+    )
@@ -1,69 +1,210 @@
-from oemof.solph.components import Source
-
-from placades import CHP
-from placades import Battery
-from placades import BiogasPlant
-from placades import Boiler
-from placades import CarrierBus
-from placades import ChpFixedRatio
-from placades import ChpVariableRatio
-from placades import Demand
-from placades import DieselGenerator
-from placades import DsoElectricity
-from placades import DsoFuel
-from placades import DsoHeat
-from placades import DsoHydrogen
-from placades import ElectricalStorage
-from placades import ElectricalTransformator
-from placades import Electrolyzer
-from placades import FuelCell
-from placades import FuelDemand
-from placades import FuelStorage
-from placades import GeothermalPlant
-from placades import H2Demand
-from placades import HeatDemand
-from placades import HeatPump
-from placades import HydrogenStorage
-from placades import Project
-from placades import PvPlant
-from placades import SolarThermalPlant
-from placades import ThermalStorage
-from placades import WindTurbine
-
-TYPEMAP = {
-    "CHP": CHP,
-    "Battery": Battery,
-    "CarrierBus": CarrierBus,
-    "demand": Demand,
-    "Source": Source,
-    "project": Project,
-    "pv_plant": PvPlant,
-    "wind_plant": WindTurbine,
-    "dso_electricity": DsoElectricity,
-    "dso": DsoElectricity,
-    "gas_dso": DsoFuel,
-    "h2_dso": DsoHydrogen,
-    "heat_dso": DsoHeat,
-    "gas_demand": FuelDemand,
-    "h2_demand": H2Demand,
-    "heat_demand": HeatDemand,
-    "transformer_station_in": ElectricalTransformator,
-    "transformer_station_out": ElectricalTransformator,
-    "storage_charge_controller_in": ElectricalTransformator,
-    "storage_charge_controller_out": ElectricalTransformator,
-    "solar_inverter": ElectricalTransformator,
-    "diesel_generator": DieselGenerator,
-    "fuel_cell": FuelCell,
-    "gas_boiler": Boiler,
-    "electrolyzer": Electrolyzer,
-    "heat_pump": HeatPump,
-    "biogas_plant": BiogasPlant,
-    "geothermal_conversion": GeothermalPlant,
-    "solar_thermal_plant": SolarThermalPlant,
-    "bess": ElectricalStorage,
-    "gess": FuelStorage,
-    "h2ess": HydrogenStorage,
-    "hess": ThermalStorage,
-    "chp": ChpVariableRatio,
-    "chp_fixed_ratio": ChpFixedRatio,
-}
+import importlib
+from collections.abc import MutableMapping
+from importlib.metadata import EntryPoint
+from importlib.metadata import entry_points
+
+from placades.profiling import watch
+
+ENTRY_POINT_GROUP = "placades.facades"
+
+
+class FacadeRegistry(MutableMapping):
+    """
+    Mapping of datapackage type names to facade classes.
+
+    Classes are registered by their import path ("module:attribute") and
+    only imported on the first lookup of one of their type names. Resolved
+    classes are cached. Further facades can be registered at runtime or by
+    third-party packages through the ``placades.facades`` entry point group,
+    e.g. in their pyproject.toml:
+
+    .. code-block:: toml
+
+        [project.entry-points."placades.facades"]
+        my_type = "my_package.facades:MyFacade"
+
+    Entry points never replace a type name that placades already defines.
+
+    Parameters
+    ----------
+    targets : dict
+        Type names mapped to classes or to their import paths.
+    group : str or None, default="placades.facades"
+        Entry point group to discover further facades from. Use None to
+        disable the discovery.
+
+    Examples
+    --------
+    >>> registry = FacadeRegistry(
+    ...     {"pv_plant": "placades.facades.production.PvPlant:PvPlant"},
+    ...     group=None,
+    ... )
+    >>> "pv_plant" in registry
+    True
+    >>> registry.resolved()
+    []
+    >>> registry["pv_plant"]
+    <class 'placades.facades.production.PvPlant.PvPlant'>
+    >>> registry.resolved()
+    ['pv_plant']
+    >>> registry.get("unknown") is None
+    True
+    """
+
+    def __init__(self, targets=None, group=ENTRY_POINT_GROUP):
+        self._targets = dict(targets or {})
+        self._classes = {}
+        self._group = group
+        self._entry_points_loaded = group is None
+
+    def __getitem__(self, name):
+        try:
+            return self._classes[name]
+        except KeyError:
+            pass
+        self._load_entry_points_if_missing(name)
+        target = self._targets[name]
+        if isinstance(target, str):
+            module, _, attribute = target.partition(":")
+            target = getattr(importlib.import_module(module), attribute)
+        elif isinstance(target, EntryPoint):
+            target = target.load()
+        self._classes[name] = watch(target)
+        return target
+
+    def __setitem__(self, name, target):
+        self._classes.pop(name, None)
+        self._targets[name] = target
+
+    def __delitem__(self, name):
+        self._load_entry_points_if_missing(name)
+        del self._targets[name]
+        self._classes.pop(name, None)
+
+    def __contains__(self, name):
+        self._load_entry_points_if_missing(name)
+        return name in self._targets
+
+    def __iter__(self):
+        self._load_entry_points()
+        return iter(self._targets)
+
+    def __len__(self):
+        self._load_entry_points()
+        return len(self._targets)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {sorted(self._targets)}>"
+
+    def register(self, name, target=None):
+        """
+        Register a facade for a type name.
+
+        Can also be used as class decorator.
+
+        Examples
+        --------
+        >>> registry = FacadeRegistry(group=None)
+        >>> @registry.register("my_type")
+        ... class MyFacade:
+        ...     pass
+        >>> registry["my_type"] is MyFacade
+        True
+        """
+        if target is None:
+
+            def decorator(cls):
+                self[name] = cls
+                return cls
+
+            return decorator
+        self[name] = target
+        return target
+
+    def resolved(self):
+        """Return the type names whose classes have already been imported."""
+        return sorted(self._classes)
+
+    def copy(self):
+        """Return a copy, e.g. to extend it for one datapackage."""
+        registry = type(self)(self._targets, group=self._group)
+        registry._classes = dict(self._classes)
+        registry._entry_points_loaded = self._entry_points_loaded
+        return registry
+
+    def _load_entry_points_if_missing(self, name):
+        if name not in self._targets:
+            self._load_entry_points()
+
+    def _load_entry_points(self):
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        for entry_point in entry_points(group=self._group):
+            self._targets.setdefault(entry_point.name, entry_point)
+
+
+TYPEMAP = FacadeRegistry(
+    {
+        "CHP": "placades.facades.komponenten:CHP",
+        "Battery": "placades.facades.komponenten:Battery",
+        "CarrierBus": "placades.facades.buses.carrier:CarrierBus",
+        "demand": "placades.facades.demand.electricity_demand:Demand",
+        "Source": "oemof.solph.components:Source",
+        "project": "placades.project:Project",
+        "pv_plant": "placades.facades.production.PvPlant:PvPlant",
+        "wind_plant": "placades.facades.production.WindTurbine:WindTurbine",
+        "dso_electricity": (
+            "placades.facades.providers.DSO_electricity:DsoElectricity"
+        ),
+        "dso": "placades.facades.providers.DSO_electricity:DsoElectricity",
+        "gas_dso": "placades.facades.providers.DSO_fuel:DsoFuel",
+        "h2_dso": "placades.facades.providers.DSO_hydrogen:DsoHydrogen",
+        "heat_dso": "placades.facades.providers.DSO_heat:DsoHeat",
+        "gas_demand": "placades.facades.demand.fuel_demand:FuelDemand",
+        "h2_demand": "placades.facades.demand.hydrogen_demand:H2Demand",
+        "heat_demand": "placades.facades.demand.heat_demand:HeatDemand",
+        "transformer_station_in": (
+            "placades.facades.converters.ElectricalTransformator"
+            ":ElectricalTransformator"
+        ),
+        "transformer_station_out": (
+            "placades.facades.converters.ElectricalTransformator"
+            ":ElectricalTransformator"
+        ),
+        "storage_charge_controller_in": (
+            "placades.facades.converters.ElectricalTransformator"
+            ":ElectricalTransformator"
+        ),
+        "storage_charge_controller_out": (
+            "placades.facades.converters.ElectricalTransformator"
+            ":ElectricalTransformator"
+        ),
+        "solar_inverter": (
+            "placades.facades.converters.ElectricalTransformator"
+            ":ElectricalTransformator"
+        ),
+        "diesel_generator": (
+            "placades.facades.converters.DieselGenerator:DieselGenerator"
+        ),
+        "fuel_cell": "placades.facades.converters.FuelCell:FuelCell",
+        "gas_boiler": "placades.facades.converters.Boiler:Boiler",
+        "electrolyzer": "placades.facades.converters.Electrolyzer:Electrolyzer",
+        "heat_pump": "placades.facades.converters.HeatPump:HeatPump",
+        "biogas_plant": "placades.facades.production.BiogasPlant:BiogasPlant",
+        "geothermal_conversion": (
+            "placades.facades.production.GeothermalPlant:GeothermalPlant"
+        ),
+        "solar_thermal_plant": (
+            "placades.facades.production.SolarThermalPlant:SolarThermalPlant"
+        ),
+        "bess": "placades.facades.storages.ElectricalStorage:ElectricalStorage",
+        "gess": "placades.facades.storages.FuelStorage:FuelStorage",
+        "h2ess": "placades.facades.storages.HydrogenStorage:HydrogenStorage",
+        "hess": "placades.facades.storages.ThermalStorage:ThermalStorage",
+        "chp": "placades.facades.converters.ChpVariableRatio:ChpVariableRatio",
+        "chp_fixed_ratio": (
+            "placades.facades.converters.ChpFixedRatio:ChpFixedRatio"
+        ),
+    }
+)
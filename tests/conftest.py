@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+from oemof.solph import EnergySystem
+
+from placades import CarrierBus
+from placades import Demand
+from placades import DsoElectricity
+from placades import ElectricalStorage
+from placades import Project
+from placades import PvPlant
+
+HOURS = 48
+
+
+def daylight(hours):
+    """Normalised PV profile with the sun up from 6 to 18 o'clock."""
+    return np.clip(np.sin((np.arange(hours) % 24 - 6) / 12 * np.pi), 0, 1)
+
+
+def daily_load(hours):
+    """Demand profile with its peak at midnight and a mean of 1."""
+    return 1 + 0.5 * np.cos(np.arange(hours) / 24 * 2 * np.pi)
+
+
+def create_energy_system(
+    hours=HOURS,
+    demand=1.0,
+    pv=None,
+    storage=None,
+    dso=None,
+    project=None,
+):
+    """
+    Build an hourly electricity system of a DSO, a demand, a PV plant and
+    a battery.
+
+    Parameters
+    ----------
+    hours : int, default=48
+        Number of time steps
+    demand : float or sequence, default=1.0
+        Scale of :func:`daily_load` or the demand profile itself
+    pv, storage, dso : dict or False or None, default=None
+        Keyword arguments of the facade in addition to the defaults below,
+        False leaves the PV plant or the battery out
+    project : placades.Project or None, default=None
+        Project of the investments
+
+    Returns
+    -------
+    oemof.solph.EnergySystem : with the buses and facades "electricity",
+        "dso", "demand", "pv" and "battery"
+    """
+    if project is None:
+        project = Project(name="p", lifetime=20, tax=0, discount_factor=0.05)
+    es = EnergySystem(
+        timeindex=pd.date_range("2025", periods=hours + 1, freq="h"),
+        infer_last_interval=False,
+    )
+    if np.ndim(demand) == 0:
+        demand = demand * daily_load(hours)
+    bus = CarrierBus(name="electricity", carrier="electricity")
+    es.add(
+        bus,
+        DsoElectricity(
+            name="dso",
+            bus_electricity=bus,
+            **{"feedin_tariff": 0} | (dso or {}),
+        ),
+        Demand(name="demand", bus_in_electricity=bus, input_timeseries=demand),
+    )
+    if pv is not False:
+        defaults = {
+            "name": "pv",
+            "project_data": project,
+            "bus_out_electricity": bus,
+            "input_timeseries": daylight(hours),
+        }
+        es.add(PvPlant(**defaults | (pv or {})))
+    if storage is not False:
+        defaults = {
+            "name": "battery",
+            "bus_in_electricity": bus,
+            "age_installed": 0,
+            "installed_capacity": 6,
+            "capex_var": 0,
+            "opex_fix": 0,
+            "opex_var": 0,
+            "lifetime": 10,
+            "optimize_cap": False,
+            "soc_max": 1,
+            "soc_min": 0,
+            "crate": 1,
+            "efficiency": 0.9,
+            "project_data": project,
+        }
+        es.add(ElectricalStorage(**defaults | (storage or {})))
+    return es
+
+
+@pytest.fixture(scope="session")
+def energy_system():
+    """Builder of test energy systems, see :func:`create_energy_system`."""
+    return create_energy_system
@@ -0,0 +1,102 @@
+import inspect
+
+import numpy as np
+import pytest
+from oemof.solph import Model
+
+from placades import aggregation
+from placades.aggregation import cluster_periods
+from placades.aggregation import solve_aggregated
+
+DAYS = 14
+SELF_DISCHARGE = 0.001
+
+
+@pytest.fixture(scope="module")
+def create_energy_system(energy_system):
+    def create():
+        hours = np.arange(DAYS * 24)
+        weather = np.random.default_rng(0).uniform(0.2, 1, DAYS).repeat(24)
+        daylight = np.clip(np.sin((hours % 24 - 6) / 12 * np.pi), 0, 1)
+        return energy_system(
+            hours=len(hours),
+            pv={
+                "input_timeseries": daylight * weather,
+                "optimize_cap": True,
+                "capex_var": 30,
+            },
+            storage={
+                "installed_capacity": 0,
+                "capex_var": 15,
+                "optimize_cap": True,
+                "self_discharge": SELF_DISCHARGE,
+            },
+        )
+
+    return create
+
+
+@pytest.fixture(scope="module")
+def monolithic(create_energy_system):
+    return Model(energysystem=create_energy_system()).solve(solver="highs")
+
+
+def test_all_periods_equal_monolithic_solve(create_energy_system, monolithic):
+    results = solve_aggregated(create_energy_system(), DAYS, solver="highs")
+    assert results["objective"] == pytest.approx(monolithic["objective"])
+    assert results["errors"]["rmse"].max() == pytest.approx(0)
+
+
+def test_typical_periods_map_back_to_the_whole_year(
+    create_energy_system, monolithic
+):
+    results = solve_aggregated(create_energy_system(), 4, solver="highs")
+    assert results["aggregation"].weights.sum() == DAYS
+    assert results["objective"] == pytest.approx(
+        monolithic["objective"], rel=0.05
+    )
+    assert set(results["errors"].index) == {
+        "electricity/demand/fix",
+        "pv/electricity/fix",
+    }
+    assert len(results["flow"]) == DAYS * 24
+
+    (battery,) = results["storage_content"].columns
+    bus = next(iter(battery.inputs))
+    content = results["storage_content"][battery].to_numpy()
+    efficiency = battery.inflow_conversion_factor[0]
+    expected = (
+        content[:-1] * (1 - SELF_DISCHARGE)
+        + results["flow"][bus, battery].to_numpy() * efficiency
+        - results["flow"][battery, bus].to_numpy() / efficiency
+    )
+    np.testing.assert_allclose(content[1:], expected, atol=1e-6)
+    assert content[-1] == pytest.approx(content[0], abs=1e-6)
+
+
+def test_periods_have_to_fit_into_the_time_index():
+    with pytest.raises(ValueError, match="cannot be split"):
+        cluster_periods(np.ones(30), 2)
+
+
+def test_storage_levels_are_bounded_per_period(
+    create_energy_system, monkeypatch
+):
+    # _TypicalPeriodModel overrides a private method of oemof.solph
+    assert list(
+        inspect.signature(Model._add_parent_block_sets).parameters
+    ) == ["self"]
+    models = []
+    bound_storage_levels = aggregation._bound_storage_levels
+
+    def spy(model, periods):
+        models.append(model)
+        bound_storage_levels(model, periods)
+
+    monkeypatch.setattr(aggregation, "_bound_storage_levels", spy)
+    solve_aggregated(create_energy_system(), 4, solver="highs")
+    (model,) = models
+    block = model.GenericInvestmentStorageBlock
+    assert len(block.storage_inter_maximum_level) == 0
+    assert len(block.storage_inter_minimum_level) == 0
+    assert len(block.storage_period_maximum_level) == DAYS
@@ -0,0 +1,101 @@
+import shutil
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from oemof.datapackage import datapackage  # noqa: F401
+from oemof.datapackage.datapackage import reading
+from oemof.solph import EnergySystem
+
+from placades import TYPEMAP
+from placades.datapackage.reading import from_datapackage
+
+PACKAGE = Path("examples", "simple_dispatch", "openPlan_package")
+
+
+def _fixed_flows(es):
+    return {
+        (str(i), str(o)): np.asarray(flow.fix)
+        for (i, o), flow in es.flows().items()
+        if flow.fix is not None
+    }
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_sequences_equal_oemof_datapackage(tmp_path, cached):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = EnergySystem.from_datapackage(
+            str(PACKAGE / "datapackage.json"),
+            attributemap={},
+            typemap=TYPEMAP.copy(),
+        )
+    cache_dir = tmp_path if cached else None
+    for _ in range(2):
+        es = from_datapackage(
+            PACKAGE / "datapackage.json", cache_dir=cache_dir
+        )
+        assert es.timeindex.equals(expected.timeindex)
+        result = _fixed_flows(es)
+        assert result.keys() == _fixed_flows(expected).keys()
+        for key, fix in _fixed_flows(expected).items():
+            np.testing.assert_array_equal(result[key], fix)
+    assert bool(list(tmp_path.glob("profiles-*.npy"))) is cached
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_threads_read_datapackages_concurrently(tmp_path):
+    sequences = reading.sequences
+    read = reading.dp.Resource.read
+    path = PACKAGE / "datapackage.json"
+    expected = _fixed_flows(from_datapackage(path))
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        systems = list(
+            pool.map(
+                lambda number: from_datapackage(
+                    path, cache_dir=tmp_path if number % 2 else None
+                ),
+                range(8),
+            )
+        )
+    for es in systems:
+        for key, fix in _fixed_flows(es).items():
+            np.testing.assert_array_equal(fix, expected[key])
+    assert reading.sequences is sequences
+    assert reading.dp.Resource.read is read
+
+
+def test_cache_is_renewed_if_the_sequences_change(tmp_path):
+    package = tmp_path / "package"
+    shutil.copytree(PACKAGE, package)
+    profiles_file = package / "data" / "sequences" / "profiles.csv"
+    path = package / "datapackage.json"
+    cache_dir = tmp_path / "cache"
+    from_datapackage(path, cache_dir=cache_dir)
+
+    profiles = pd.read_csv(profiles_file, index_col="timeindex")
+    profiles["pv_profile.csv"] = 0.5
+    profiles.to_csv(profiles_file)
+    es = from_datapackage(path, cache_dir=cache_dir)
+    pv = next(flow for (i, _), flow in es.flows().items() if str(i) == "pv")
+    assert (np.asarray(pv.fix) == 0.5).all()
+
+
+def test_equivalent_periodical_costs_are_calculated_upfront(tmp_path):
+    package = tmp_path / "package"
+    shutil.copytree(PACKAGE, package)
+    for name in ("pv_plant", "wind_plant"):
+        elements_file = package / "data" / "elements" / f"{name}.csv"
+        elements = pd.read_csv(elements_file)
+        elements["optimize_cap"] = True
+        elements.to_csv(elements_file, index=False)
+
+    es = from_datapackage(package / "datapackage.json")
+    project = es.groups["pv"].project_data
+    assert es.groups["lithium_battery_system"].project_data is project
+    # pv and wind share their costs
+    assert project.epc_cache_info()[:2] == (2, 0)
+    assert project.epc_cache_info().currsize == 1
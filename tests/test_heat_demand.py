@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from placades.importer.create_timeseries import create_heat_demand
+from placades.importer.create_timeseries import create_heat_demand_portfolio
+
+
+def test_portfolio_equals_single_buildings():
+    timeframe = pd.date_range("2021-01-01", periods=24 * 14, freq="h")
+    temperature = np.linspace(-10, 15, len(timeframe))
+    buildings = pd.DataFrame(
+        {
+            "profile_type": ["single-family house", "apartment building"] * 3
+            + ["retail and wholesale", "bakery"],
+            "annual_heat_demand": np.arange(1, 9) * 1000.0,
+            "building_year": [1900, 1950, 1980, 2000, 2008, 2020, 1960, 1990],
+            "wind_class": ["not windy", "windy"] * 4,
+        }
+    )
+    result = create_heat_demand_portfolio(
+        timeframe=timeframe,
+        outdoor_temperature=temperature,
+        profile_type=buildings["profile_type"],
+        annual_heat_demand=buildings["annual_heat_demand"],
+        building_year=buildings["building_year"],
+        wind_class=buildings["wind_class"],
+    )
+    expected = np.column_stack(
+        [
+            create_heat_demand(
+                timeframe=timeframe,
+                outdoor_temperature=temperature,
+                profile_type=row.profile_type,
+                annual_heat_demand=row.annual_heat_demand,
+                building_year=row.building_year,
+                wind_class=row.wind_class,
+            )
+            for row in buildings.itertuples()
+        ]
+    )
+    np.testing.assert_allclose(result, expected, rtol=1e-12)
+
+
+def test_regional_holidays_change_the_heat_demand():
+    # Corpus Christi is a holiday in Bavaria but not nationwide
+    timeframe = pd.date_range("2024-05-29", periods=24 * 3, freq="h")
+    kwargs = {
+        "timeframe": timeframe,
+        "outdoor_temperature": np.full(len(timeframe), 10.0),
+        "profile_type": "bakery",
+        "annual_heat_demand": 1000,
+    }
+    national = create_heat_demand(**kwargs)
+    bavarian = create_heat_demand(**kwargs, region="BY")
+    portfolio = create_heat_demand_portfolio(**kwargs, region="BY")
+    corpus_christi = timeframe.date == pd.Timestamp("2024-05-30").date()
+    assert not np.allclose(national[corpus_christi], bavarian[corpus_christi])
+    np.testing.assert_allclose(portfolio[:, 0], bavarian, rtol=1e-12)
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+import placades
+
+HEAVY_DEPENDENCIES = {"oemof.solph", "pvlib", "demandlib"}
+
+
+def _run(statement):
+    code = f"{statement}\nimport sys\nprint(' '.join(sys.modules))"
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(process.stdout.split()), time.perf_counter() - start
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import placades",
+        "from placades import Project",
+        "from placades import TYPEMAP",
+        "from placades.investment import calculate_annuity_mvs_array",
+    ],
+)
+def test_light_imports_skip_heavy_dependencies(statement):
+    modules, _ = _run(statement)
+    assert not HEAVY_DEPENDENCIES & modules
+
+
+def test_import_time_of_project_is_below_facades():
+    light = min(_run("from placades import Project")[1] for _ in range(3))
+    heavy = min(_run("from placades import PvPlant")[1] for _ in range(3))
+    assert light < heavy / 2
+
+
+def test_lazy_attributes_resolve():
+    from placades.facades.production.PvPlant import PvPlant  # noqa: PLC0415
+
+    assert placades.PvPlant is PvPlant
+    assert set(placades.__all__) <= set(dir(placades))
+    with pytest.raises(AttributeError, match="no attribute 'Unknown'"):
+        _ = placades.Unknown
@@ -0,0 +1,199 @@
+import warnings
+
+import numpy as np
+import pytest
+from hypothesis import example
+from hypothesis import given
+from hypothesis import strategies as st
+
+from placades import Project
+from placades.investment import _create_invest_if_wanted
+from placades.investment import _get_replacement_costs_reference
+from placades.investment import calculate_annuity_mvs
+from placades.investment import calculate_annuity_mvs_array
+from placades.investment import create_invests_if_wanted
+from placades.investment import crf
+from placades.investment import crf_array
+from placades.investment import get_replacement_costs
+from placades.investment import get_replacement_costs_array
+
+
+@pytest.fixture
+def asset_table():
+    rng = np.random.default_rng(42)
+    n = 2000
+    return {
+        "age": rng.integers(0, 30, n),
+        "project_lifetime": rng.integers(1, 50, n),
+        "asset_lifetime": rng.integers(1, 40, n),
+        "investment": rng.uniform(0, 5000, n),
+        "discount_factor": rng.choice([0, 0.01, 0.05, 0.1, 0.57], n),
+    }
+
+
+def _rows(table):
+    return zip(
+        table["age"].tolist(),
+        table["project_lifetime"].tolist(),
+        table["asset_lifetime"].tolist(),
+        table["investment"].tolist(),
+        table["discount_factor"].tolist(),
+        strict=True,
+    )
+
+
+def test_crf_array_equals_scalar(asset_table):
+    result = crf_array(
+        asset_table["project_lifetime"], asset_table["discount_factor"]
+    )
+    expected = [crf(p, d) for _, p, _, _, d in _rows(asset_table)]
+    assert result.tolist() == expected
+
+
+def test_replacement_costs_array_equals_scalar(asset_table):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = get_replacement_costs_array(
+            asset_table["age"],
+            asset_table["project_lifetime"],
+            asset_table["asset_lifetime"],
+            asset_table["investment"],
+            asset_table["discount_factor"],
+        )
+        expected = [
+            get_replacement_costs(a, p, lt, i, d)
+            for a, p, lt, i, d in _rows(asset_table)
+        ]
+    assert result.tolist() == expected
+
+
+def test_annuity_array_equals_scalar(asset_table):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = calculate_annuity_mvs_array(
+            capex_var=asset_table["investment"],
+            lifetime=asset_table["asset_lifetime"],
+            age_installed=asset_table["age"],
+            tax=0.19,
+            lifetime_project=asset_table["project_lifetime"],
+            discount_factor=asset_table["discount_factor"],
+        )
+        expected = [
+            calculate_annuity_mvs(i, lt, a, 0.19, p, d)
+            for a, p, lt, i, d in _rows(asset_table)
+        ]
+    assert result.tolist() == expected
+
+
+economic_parameters = {
+    "age_of_asset": st.integers(0, 30),
+    "project_lifetime": st.integers(1, 60),
+    "asset_lifetime": st.integers(1, 40),
+    "first_time_investment": st.one_of(
+        st.just(0.0), st.floats(1e-2, 1e5, allow_subnormal=False)
+    ),
+    "discount_factor": st.one_of(st.just(0.0), st.floats(1e-4, 0.3)),
+}
+
+
+@given(**economic_parameters)
+def test_closed_form_equals_reference(
+    age_of_asset,
+    project_lifetime,
+    asset_lifetime,
+    first_time_investment,
+    discount_factor,
+):
+    args = (
+        age_of_asset,
+        project_lifetime,
+        asset_lifetime,
+        first_time_investment,
+        discount_factor,
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = get_replacement_costs(*args)
+        expected = _get_replacement_costs_reference(*args)
+    assert result == pytest.approx(
+        expected, rel=1e-9, abs=1e-9 * first_time_investment
+    )
+
+
+@given(**economic_parameters)
+def test_closed_form_warns_like_reference(
+    age_of_asset,
+    project_lifetime,
+    asset_lifetime,
+    first_time_investment,
+    discount_factor,
+):
+    args = (
+        age_of_asset,
+        project_lifetime,
+        asset_lifetime,
+        first_time_investment,
+        discount_factor,
+    )
+    with warnings.catch_warnings(record=True) as result:
+        warnings.simplefilter("always")
+        get_replacement_costs(*args)
+    with warnings.catch_warnings(record=True) as expected:
+        warnings.simplefilter("always")
+        _get_replacement_costs_reference(*args)
+    assert {str(w.message) for w in result} == {
+        str(w.message) for w in expected
+    }
+
+
+@given(**economic_parameters)
+@example(
+    age_of_asset=0,
+    project_lifetime=3,
+    asset_lifetime=1,
+    first_time_investment=5e-324,
+    discount_factor=0.25,
+)
+def test_cash_flows_sum_up_to_replacement_costs(
+    age_of_asset,
+    project_lifetime,
+    asset_lifetime,
+    first_time_investment,
+    discount_factor,
+):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        costs, cash_flows = get_replacement_costs(
+            min(age_of_asset, asset_lifetime),
+            project_lifetime,
+            asset_lifetime,
+            first_time_investment,
+            discount_factor,
+            return_cash_flows=True,
+        )
+    assert len(cash_flows) == project_lifetime + 1
+    assert cash_flows.sum() == pytest.approx(
+        costs, rel=1e-9, abs=max(1e-9 * first_time_investment, 1e-12)
+    )
+
+
+def test_bulk_investments_equal_scalar():
+    project = Project(name="p", lifetime=20, tax=0, discount_factor=0.05)
+    table = {
+        "optimise_cap": [True, False, 1, np.True_, True],
+        "existing_capacity": [0, 5, 10, 15, 20],
+        "capex_var": [1000, 1000, 800, 800, 600],
+        "opex_fix": [10, 10, 5, 5, 0],
+        "lifetime": [20, 25, 10, 10, 30],
+        "age_installed": [0, 0, 2, 2, 5],
+    }
+    nvs = create_invests_if_wanted(project_data=project, **table)
+    assert project.epc_cache_info().misses == 0
+    for i, nv in enumerate(nvs):
+        row = {name: column[i] for name, column in table.items()}
+        expected = _create_invest_if_wanted(project_data=project, **row)
+        if row["optimise_cap"] is True:
+            assert nv.ep_costs[0] == expected.ep_costs[0]
+            assert nv.existing == expected.existing
+        else:
+            assert nv == expected == row["existing_capacity"]
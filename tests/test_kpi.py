@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+from oemof.solph import Model
+from oemof.solph import Results
+
+from placades.kpi import KPIS
+from placades.kpi import KeyIndicators
+from placades.kpi import kpi_table
+from placades.results import LazyResults
+
+HOURS = 48
+
+
+@pytest.fixture
+def solve_energy_system(energy_system):
+    def solve(demand=1.0, energy_price=0.3):
+        es = energy_system(
+            hours=HOURS,
+            demand=demand,
+            dso={"energy_price": energy_price, "renewable_share": 0.4},
+            pv={
+                "installed_capacity": 1,
+                "optimize_cap": True,
+                "capex_var": 30,
+                "opex_fix": 0.5,
+            },
+            storage={
+                "installed_capacity": 0,
+                "capex_var": 4,
+                "optimize_cap": True,
+            },
+        )
+        model = Model(energysystem=es)
+        model.solve(solver="highs")
+        return model
+
+    return solve
+
+
+def test_kpis_equal_the_flows_of_the_results(solve_energy_system):
+    model = solve_energy_system()
+    es = model.es
+    results = Results(model)
+    flows = results["flow"]
+    bus = es.groups["electricity"]
+    dso = es.groups["dso"]
+    pv = es.groups["pv"]
+
+    kpis = KeyIndicators(es).indicators(results)
+    demand = flows[bus, es.groups["demand"]].sum()
+    generation = flows[pv, bus].sum()
+    grid_import = flows[dso.subnodes[3], bus].sum()
+    grid_export = flows[bus, dso.subnodes[1]].sum()
+    assert kpis["demand"] == pytest.approx(demand)
+    assert kpis["generation"] == pytest.approx(generation)
+    assert kpis["grid_import"] == pytest.approx(grid_import)
+    assert kpis["grid_export"] == pytest.approx(grid_export)
+    assert kpis["renewable_factor"] == pytest.approx(
+        (generation + 0.4 * grid_import) / (generation + grid_import)
+    )
+    assert kpis["degree_of_autonomy"] == pytest.approx(
+        (demand - grid_import) / demand
+    )
+    assert kpis["self_consumption"] == pytest.approx(
+        (generation - grid_export) / generation
+    )
+    assert kpis["peak_grid_import"] == pytest.approx(
+        flows[dso.subnodes[3], bus].max()
+    )
+    # the objective holds the annuities of the investments and the
+    # variable costs, the fixed costs of the existing capacity are added
+    fixed_costs = pv.opex_fix * pv.installed_capacity
+    assert kpis["annuity"] - fixed_costs + kpis[
+        "variable_costs"
+    ] == pytest.approx(results["objective"])
+    assert kpis["levelized_cost_of_energy"] == pytest.approx(
+        (kpis["annuity"] * HOURS / 8760 + kpis["variable_costs"]) / demand
+    )
+
+
+def test_asset_costs_add_up_to_the_kpis(solve_energy_system):
+    model = solve_energy_system()
+    indicators = KeyIndicators(model.es)
+    results = LazyResults(model)
+    assets = indicators.assets(results)
+    kpis = indicators.indicators(results)
+    assert assets["annuity"].sum() == pytest.approx(kpis["annuity"])
+    assert assets["variable_costs"].sum() == pytest.approx(
+        kpis["variable_costs"]
+    )
+    assert assets.loc["pv", "energy"] == pytest.approx(kpis["generation"])
+    assert assets.loc["dso", "energy"] == pytest.approx(kpis["grid_import"])
+    assert np.isnan(assets.loc["demand", "levelized_cost"])
+
+
+def test_kpi_table_of_many_scenarios(solve_energy_system):
+    models = {
+        "base": solve_energy_system(),
+        "high_demand": solve_energy_system(demand=2),
+        "expensive_grid": solve_energy_system(energy_price=0.6),
+    }
+    table = kpi_table(models)
+    assert list(table.columns) == list(KPIS)
+    assert list(table.index) == list(models)
+    for name, model in models.items():
+        expected = KeyIndicators(model.es).indicators(LazyResults(model))
+        pd.testing.assert_series_equal(
+            table.loc[name], expected, check_names=False
+        )
+    assert table.loc["high_demand", "demand"] == pytest.approx(
+        2 * table.loc["base", "demand"]
+    )
+    assert (
+        table.loc["expensive_grid", "grid_import"]
+        <= table.loc["base", "grid_import"]
+    )
+
+
+def test_kpi_table_rejects_a_model_solved_again(solve_energy_system):
+    model = solve_energy_system()
+    with pytest.raises(ValueError, match="last solution"):
+        kpi_table({"first": model, "second": model})
@@ -0,0 +1,143 @@
+import json
+import shutil
+import subprocess
+import sys
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from oemof.solph import Model
+from pyomo.core import Var
+
+from placades import DsoElectricity
+from placades import profiling
+from placades.runner import solve_datapackage
+
+PACKAGE = Path("examples", "simple_dispatch", "openPlan_package")
+
+
+@pytest.fixture
+def create_energy_system(energy_system):
+    return lambda: energy_system(
+        hours=3, demand=[1, 2, 3], pv=False, storage=False
+    )
+
+
+def test_facades_are_counted_once_per_instance(create_energy_system):
+    with profiling.profile(log=False) as outer:
+        with profiling.profile(log=False, count_models=False) as inner:
+            model = Model(energysystem=create_energy_system())
+    # DsoElectricity calls the __init__ of DSO
+    assert outer.facades["DsoElectricity"]["count"] == 1
+    assert "DSO" not in outer.facades
+    assert inner.facades.keys() == outer.facades.keys()
+    assert inner.models == []
+    assert outer.calls["Model"]["count"] == 1
+    statistics = outer.models[0].groupby("component")["variables"].sum()
+    variables = model.component_data_objects(Var, active=True)
+    assert statistics.sum() == len(list(variables))
+
+
+def test_hooks_do_nothing_outside_of_a_profile(create_energy_system):
+    init = Model.__init__
+    with profiling.profile(log=False) as report:
+        assert Model.__init__ is not init
+    assert Model.__init__ is init
+    assert not hasattr(DsoElectricity.__init__, "__wrapped__")
+    with profiling.stage("build_model"):
+        Model(energysystem=create_energy_system())
+    assert report.stages == {}
+    assert report.calls == {}
+    assert report.models == []
+
+
+def test_solve_datapackage_writes_a_profile(tmp_path):
+    package = Path(tmp_path, "package")
+    shutil.copytree(PACKAGE, package)
+    profiles_file = Path(package, "data", "sequences", "profiles.csv")
+    profiles = pd.read_csv(profiles_file, index_col="timeindex").head(24)
+    profiles.to_csv(profiles_file)
+
+    output_dir = Path(tmp_path, "results")
+    result = solve_datapackage(
+        Path(package, "datapackage.json"),
+        output_dir,
+        solver="highs",
+        profile=True,
+    )
+    assert result.status == "optimal"
+    report = json.loads(Path(output_dir, "profile.json").read_text())
+    assert {"build_model", "solve", "write_results"} <= set(report["stages"])
+    assert report["calls"]["Model.solve"]["count"] == 1
+    assert report["facades"]["PvPlant"]["count"] == 1
+    (model,) = report["models"]
+    assert model["variables"] == sum(
+        types["variables"] for types in model["component_types"].values()
+    )
+    assert "My_DSO" in model["components"]
+
+
+def test_facades_are_patched_when_they_are_imported():
+    # a fresh interpreter, in which no facade has been imported yet
+    script = """
+        import sys
+        from placades import profiling
+
+        with profiling.profile(log=False) as report:
+            imported = "placades.facades.production.PvPlant" in sys.modules
+            from placades import CarrierBus
+            from placades import Project
+            from placades import PvPlant
+
+            PvPlant(
+                name="pv",
+                project_data=Project(
+                    name="p", lifetime=20, tax=0, discount_factor=0.05
+                ),
+                bus_out_electricity=CarrierBus(name="electricity"),
+                input_timeseries=[0.5, 0.7],
+                optimize_cap=True,
+            )
+        print(imported, sorted(report.facades), report.counters)
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(script)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.split("\n")[0] == (
+        "False ['CarrierBus', 'PvPlant'] {'investments': 1}"
+    )
+
+
+def test_profiles_may_end_in_any_order(create_energy_system):
+    init = Model.__init__
+    outer = profiling.profile(log=False, count_models=False)
+    inner = profiling.profile(log=False, count_models=False)
+    outer_report = outer.__enter__()
+    inner_report = inner.__enter__()
+    outer.__exit__(None, None, None)
+    assert Model.__init__ is not init
+    Model(energysystem=create_energy_system())
+    inner.__exit__(None, None, None)
+    assert Model.__init__ is init
+    assert "Model" not in outer_report.calls
+    assert inner_report.calls["Model"]["count"] == 1
+
+
+def test_profiles_in_threads_restore_the_classes(create_energy_system):
+    init = Model.__init__
+
+    def build(_):
+        with profiling.profile(log=False, count_models=False) as report:
+            Model(energysystem=create_energy_system())
+        return report
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        reports = list(pool.map(build, range(8)))
+    assert Model.__init__ is init
+    assert not hasattr(DsoElectricity.__init__, "__wrapped__")
+    assert all(report.calls["Model"]["count"] >= 1 for report in reports)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+from oemof.solph import Model
+from oemof.solph import Results
+
+from placades import ElectricalStorage
+from placades import PvPlant
+from placades.results import FlowLabels
+from placades.results import LazyResults
+
+HOURS = 48
+
+
+@pytest.fixture
+def solved(energy_system):
+    es = energy_system(
+        hours=HOURS, pv={"optimize_cap": True, "capex_var": 100}
+    )
+    model = Model(energysystem=es)
+    model.solve(solver="highs")
+    return model, es.groups["electricity"]
+
+
+def test_lazy_results_equal_solph_results(solved):
+    model, _ = solved
+    expected = Results(model)
+    results = LazyResults(model)
+    pd.testing.assert_frame_equal(
+        results["flow"], expected["flow"][results["flow"].columns]
+    )
+    assert set(results["flow"].columns) == set(expected["flow"].columns)
+    pd.testing.assert_frame_equal(
+        results["storage_content"],
+        expected["storage_content"],
+        check_freq=False,
+    )
+    pd.testing.assert_frame_equal(results["invest"], expected["invest"])
+    assert results["objective"] == expected["objective"]
+
+
+def test_lazy_results_select_flows_and_investments(solved):
+    model, bus = solved
+    results = LazyResults(model)
+    into_bus = results.flows(target=results.buses("electricity"))
+    assert {o.label for o, _ in into_bus.columns} == {
+        ("consumption_converter", "dso"),
+        "pv",
+        "battery",
+    }
+    assert list(results.flows(source="pv", target=bus).columns) == [
+        (model.es.groups["pv"], bus)
+    ]
+    assert list(results.invest(PvPlant).columns) == [
+        (model.es.groups["pv"], bus)
+    ]
+    assert results.storage_content(ElectricalStorage).shape == (HOURS + 1, 1)
+    # only the selected flows were extracted
+    assert len(results._flow_values) == len(into_bus.columns)
+
+
+def test_bus_balances(solved):
+    model, bus = solved
+    flows = LazyResults(model)["flow"]
+    labels = FlowLabels(model.es)
+
+    balances = labels.balances(flows)
+    assert set(balances.index) == {"electricity", "dso.internal_bus"}
+    np.testing.assert_allclose(balances["balance"], 0, atol=1e-6)
+    into_bus = flows[[c for c in flows.columns if c[1] is bus]]
+    assert balances.loc["electricity", "in"] == pytest.approx(
+        into_bus.to_numpy().sum()
+    )
+    dso = model.es.groups["dso"]
+    assert balances.loc["electricity", "import"] == pytest.approx(
+        flows[dso.subnodes[3], bus].sum()
+    )
+    # the internal bus of the DSO is not connected to the grid
+    assert balances.loc["dso.internal_bus", "import"] == 0
+    assert balances.loc["dso.internal_bus", "export"] == 0
+    assert balances["export"].sum() == pytest.approx(
+        flows[bus, dso.subnodes[1]].sum()
+    )
+
+    by_type = labels.balances(flows, by=["bus", "component_type"])
+    assert by_type.loc[("electricity", "Demand"), "out"] == pytest.approx(
+        flows[bus, model.es.groups["demand"]].sum()
+    )
+    series = labels.balance_series(flows)
+    assert series.shape == (HOURS, 2)
+    np.testing.assert_allclose(series.to_numpy(), 0, atol=1e-6)
@@ -0,0 +1,129 @@
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+import pytest
+from oemof.solph import Model
+
+from placades import CarrierBus
+from placades import HeatDemand
+from placades import HeatPump
+from placades import Project
+from placades import Shortage
+from placades import rolling_horizon
+from placades.rolling_horizon import solve_rolling_horizon
+
+HOURS = 48
+
+
+@pytest.fixture
+def create_energy_system(energy_system):
+    def create(storage=True, optimize_cap=False):
+        return energy_system(
+            hours=HOURS,
+            pv={"installed_capacity": 4, "optimize_cap": optimize_cap},
+            storage=storage and {"self_discharge": 0.001},
+        )
+
+    return create
+
+
+def monolithic(es):
+    return Model(energysystem=es).solve(solver="highs")
+
+
+def test_single_window_equals_monolithic_solve(create_energy_system):
+    es = create_energy_system()
+    results = solve_rolling_horizon(es, window=HOURS, solver="highs")
+    expected = monolithic(es)
+    assert results["variable_costs"] == pytest.approx(expected["objective"])
+    pd.testing.assert_frame_equal(
+        results["flow"], expected["flow"], check_freq=False, atol=1e-6
+    )
+
+
+def test_windows_carry_the_storage_content(create_energy_system):
+    es = create_energy_system()
+    results = solve_rolling_horizon(es, window=12, overlap=12, solver="highs")
+    content = results["storage_content"].iloc[:, 0]
+    assert len(content) == HOURS + 1
+    assert content.iloc[-1] == pytest.approx(content.iloc[0])
+    assert content.max() > 1
+    flows = results["flow"]
+    assert list(flows.columns) == list(monolithic(es)["flow"].columns)
+    assert results["variable_costs"] >= monolithic(es)["objective"] - 1e-6
+
+
+def test_parallel_windows_equal_sequential_windows(create_energy_system):
+    es = create_energy_system(storage=False)
+    sequential = solve_rolling_horizon(es, window=12, solver="highs")
+    parallel = solve_rolling_horizon(
+        es, window=12, solver="highs", parallel=True, workers=2
+    )
+    assert parallel["variable_costs"] == pytest.approx(
+        sequential["variable_costs"]
+    )
+    assert parallel["variable_costs"] == pytest.approx(
+        monolithic(es)["objective"]
+    )
+    pd.testing.assert_frame_equal(parallel["flow"], sequential["flow"])
+    # only the workers hold the arguments
+    assert rolling_horizon._worker_arguments is None
+
+
+def test_coupled_or_investment_models_are_rejected(create_energy_system):
+    with pytest.raises(ValueError, match="coupled by the storages"):
+        solve_rolling_horizon(
+            create_energy_system(), window=12, solver="highs", parallel=True
+        )
+    with pytest.raises(ValueError, match="only be used for dispatch"):
+        solve_rolling_horizon(
+            create_energy_system(optimize_cap=True), window=12
+        )
+
+
+def test_parallel_windows_need_fork(create_energy_system, monkeypatch):
+    monkeypatch.setattr(
+        multiprocessing, "get_all_start_methods", lambda: ["spawn"]
+    )
+    with pytest.raises(ValueError, match="fork processes"):
+        solve_rolling_horizon(
+            create_energy_system(storage=False),
+            window=12,
+            solver="highs",
+            parallel=True,
+        )
+
+
+def test_windows_restore_conversion_factors(create_energy_system):
+    es = create_energy_system(storage=False)
+    project = Project(name="p", lifetime=20, tax=0, discount_factor=0.05)
+    electricity = next(n for n in es.nodes if str(n.label) == "electricity")
+    ambient = CarrierBus(name="ambient")
+    heat = CarrierBus(name="heat")
+    cop = 3 + np.sin(np.arange(HOURS) / 24 * 2 * np.pi)
+    heat_pump = HeatPump(
+        name="heat_pump",
+        bus_in_electricity=electricity,
+        bus_in_heat=ambient,
+        bus_out_heat=heat,
+        installed_capacity=10,
+        cop=cop,
+        project_data=project,
+    )
+    es.add(
+        ambient,
+        heat,
+        heat_pump,
+        Shortage(name="ambient_source", bus_out=ambient, cost=0),
+        HeatDemand(
+            name="heat_demand",
+            bus_in_heat=heat,
+            input_timeseries=np.full(HOURS, 2.0),
+        ),
+    )
+    results = solve_rolling_horizon(es, window=12, solver="highs")
+    assert len(heat_pump.conversion_factors[electricity]) == HOURS
+    assert results["variable_costs"] == pytest.approx(
+        monolithic(es)["objective"]
+    )
@@ -0,0 +1,134 @@
+import json
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from placades.cli import main
+from placades.runner import run_scenarios
+
+PACKAGE = Path("examples", "simple_dispatch", "openPlan_package")
+
+
+@pytest.fixture
+def scenarios(tmp_path):
+    """Two short variants of the example datapackage."""
+    for name, demand in [("low", 0.5), ("high", 1.5)]:
+        package = Path(tmp_path, "scenarios", name)
+        shutil.copytree(PACKAGE, package)
+        profiles_file = Path(package, "data", "sequences", "profiles.csv")
+        profiles = pd.read_csv(profiles_file, index_col="timeindex").head(24)
+        profiles["electricity_demand.csv"] *= demand
+        profiles.to_csv(profiles_file)
+    return Path(tmp_path, "scenarios")
+
+
+def test_run_scenarios_in_parallel(tmp_path, scenarios):
+    output_dir = Path(tmp_path, "results")
+    results = run_scenarios(
+        scenarios, output_dir, workers=2, solver="highs", solver_threads=1
+    )
+    assert [r.name for r in results] == ["high", "low"]
+    assert [r.status for r in results] == ["optimal", "optimal"]
+    assert results[0].objective != results[1].objective
+    for result in results:
+        scenario = json.loads(
+            Path(output_dir, result.name, "scenario.json").read_text()
+        )
+        assert scenario["objective"] == result.objective
+        assert Path(output_dir, result.name, "flow.csv").exists()
+    summary = pd.read_csv(Path(output_dir, "scenarios.csv"))
+    assert summary["name"].tolist() == ["high", "low"]
+
+
+def test_cli_reports_failed_scenarios(tmp_path, scenarios):
+    Path(scenarios, "low", "datapackage.json").write_text("{")
+    exit_code = main(
+        [
+            "run",
+            str(Path(scenarios, "*")),
+            "-o",
+            str(Path(tmp_path, "results")),
+            "-j",
+            "1",
+            "--solver",
+            "highs",
+        ]
+    )
+    assert exit_code == 1
+    scenario = json.loads(
+        Path(tmp_path, "results", "low", "scenario.json").read_text()
+    )
+    assert scenario["status"] == "error"
+
+
+@pytest.mark.parametrize("results_format", ["parquet", "arrow"])
+def test_columnar_results_equal_csv_results(
+    tmp_path, scenarios, results_format
+):
+    pytest.importorskip("pyarrow")
+    from placades.datapackage.results import read_results  # noqa: PLC0415
+
+    for format in ("csv", results_format):
+        run_scenarios(
+            scenarios,
+            Path(tmp_path, format),
+            workers=1,
+            solver="highs",
+            results_format=format,
+        )
+    flows = read_results(
+        Path(tmp_path, results_format), "flow", format=results_format
+    )
+    assert set(flows["scenario"]) == {"high", "low"}
+    assert "My_DSO.consumption_converter" in set(flows["source"])
+
+    low = read_results(
+        Path(tmp_path, results_format),
+        "flow",
+        scenarios=["low"],
+        format=results_format,
+    )
+    csv = pd.read_csv(
+        Path(tmp_path, "csv", "low", "flow.csv"), header=[0, 1], index_col=0
+    )
+    totals = low.groupby(["source", "target"], observed=True)["value"].sum()
+    assert totals["pv", "electricity"] == pytest.approx(
+        csv["pv", "electricity"].sum()
+    )
+    assert len(low) == csv.size
+
+
+def test_result_store_reloads_selected_results(tmp_path, scenarios):
+    pytest.importorskip("pyarrow")
+    from placades.datapackage.results import ResultStore  # noqa: PLC0415
+    from placades.datapackage.results import read_labels  # noqa: PLC0415
+
+    for format in ("csv", "parquet"):
+        run_scenarios(
+            scenarios,
+            Path(tmp_path, format),
+            workers=1,
+            solver="highs",
+            results_format=format,
+        )
+    store = ResultStore(Path(tmp_path, "parquet"))
+    assert store.scenarios == ["high", "low"]
+    assert "flow" in store
+    buses = store.select(type="CarrierBus")
+    assert "electricity" in buses
+    # the flows from the facade and its subnodes into the buses
+    flows = store.get("flow", scenarios=["low"], source="My_DSO", target=buses)
+    assert flows.columns.tolist() == [
+        ("My_DSO.consumption_converter", "electricity")
+    ]
+
+    # the sidecar of the csv results maps their labels to the identifiers
+    labels = read_labels(Path(tmp_path, "csv", "low"))
+    ids = dict(zip(labels["label"], labels.index, strict=True))
+    csv = pd.read_csv(
+        Path(tmp_path, "csv", "low", "flow.csv"), header=[0, 1], index_col=0
+    ).rename(columns=ids)
+    expected = csv[flows.columns].to_numpy()
+    assert flows.loc["low"].to_numpy() == pytest.approx(expected)
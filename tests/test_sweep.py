@@ -0,0 +1,159 @@
+import inspect
+
+import pandas as pd
+import pytest
+from oemof.solph import Model
+
+from placades import Project
+from placades.sweep import ParameterSweep
+from placades.sweep import set_capex_var
+
+PV_PROFILE = [0.0, 0.2, 0.6, 0.9, 0.6, 0.2]
+DEMAND = [1.0, 1.5, 2.0, 2.5, 2.0, 1.0]
+
+
+@pytest.fixture
+def create_energy_system(energy_system):
+    def create(
+        capex_var=1000,
+        energy_price=0.3,
+        demand=1,
+        opex_fix=10,
+        feedin_tariff=0.1,
+        pv_profile=PV_PROFILE,
+    ):
+        project = Project(name="p", lifetime=20, tax=0, discount_factor=0.05)
+        es = energy_system(
+            hours=len(DEMAND),
+            demand=[value * demand for value in DEMAND],
+            dso={"energy_price": energy_price, "feedin_tariff": feedin_tariff},
+            pv={
+                "input_timeseries": pv_profile,
+                "optimize_cap": True,
+                "capex_var": capex_var,
+                "opex_fix": opex_fix,
+            },
+            storage=False,
+            project=project,
+        )
+        bus = es.groups["electricity"]
+        return es, project, es.groups["pv"], es.groups["demand"].inputs[bus]
+
+    return create
+
+
+def solve(es):
+    return Model(energysystem=es).solve(solver="highs")["objective"]
+
+
+def test_sweep_equals_rebuilt_models(create_energy_system):
+    es, project, pv, _ = create_energy_system()
+    sweep = ParameterSweep(es, solver="highs")
+    values = [1000, 200, 50]
+    flows = sweep.run(
+        values, lambda value: set_capex_var(pv, value, project), "capex_var"
+    )
+    for value in values:
+        expected = solve(create_energy_system(capex_var=value)[0])
+        assert sweep.objectives[value] == pytest.approx(expected)
+    assert flows.index.get_level_values("capex_var").unique().tolist() == (
+        values
+    )
+    assert len(flows.loc[50]) == len(PV_PROFILE)
+
+
+def test_sweep_updates_fixed_flows(create_energy_system):
+    es, _, _, demand_flow = create_energy_system()
+
+    def scale_demand(value):
+        demand_flow.fix = [x * value for x in DEMAND]
+
+    sweep = ParameterSweep(es, solver="highs")
+    sweep.run([1, 2], scale_demand, "demand")
+    expected = solve(create_energy_system(demand=2)[0])
+    assert sweep.objectives[2] == pytest.approx(expected)
+    assert sweep.objectives[2] != pytest.approx(sweep.objectives[1])
+
+
+def test_sweep_flows_equal_solph_results(create_energy_system):
+    es, *_ = create_energy_system()
+    sweep = ParameterSweep(es, solver="highs")
+    flows = sweep.run([0], lambda value: None).loc[0]
+    expected = Model(energysystem=es).solve(solver="highs").get("flow")
+    expected = expected.rename(columns=lambda node: str(node.label))
+    pd.testing.assert_frame_equal(
+        flows, expected, check_freq=False, check_names=False
+    )
+
+
+def test_sweep_from_an_investment_without_costs(create_energy_system):
+    # without a feed-in tariff the free investment is bounded
+    es, project, pv, _ = create_energy_system(
+        capex_var=0, opex_fix=0, feedin_tariff=0
+    )
+    sweep = ParameterSweep(es, solver="highs")
+    sweep.run(
+        [0, 1000],
+        lambda value: set_capex_var(pv, value, project),
+        "capex_var",
+    )
+    expected = solve(
+        create_energy_system(capex_var=1000, opex_fix=0, feedin_tariff=0)[0]
+    )
+    assert sweep.objectives[1000] == pytest.approx(expected)
+    assert sweep.objectives[1000] != pytest.approx(sweep.objectives[0])
+
+
+def test_set_capex_var_needs_an_investment(create_energy_system):
+    es, project, _, _ = create_energy_system()
+    with pytest.raises(ValueError, match="dso"):
+        set_capex_var(es.groups["dso"], 1000, project)
+
+
+def test_sweep_updates_bounds_changed_in_place(create_energy_system):
+    es, _, _, demand_flow = create_energy_system()
+    demand_flow.fix = pd.Series(DEMAND).to_numpy()
+
+    def scale_demand(value):
+        demand_flow.fix[:] = [x * value for x in DEMAND]
+
+    sweep = ParameterSweep(es, solver="highs")
+    sweep.run([1, 2], scale_demand, "demand")
+    expected = solve(create_energy_system(demand=2)[0])
+    assert sweep.objectives[2] == pytest.approx(expected)
+
+
+def test_sweep_updates_fixed_investment_flows(create_energy_system):
+    es, _, pv, _ = create_energy_system(
+        capex_var=1, opex_fix=0, feedin_tariff=0
+    )
+    pv_flow = pv.outputs[es.groups["electricity"]]
+
+    def scale_profile(value):
+        pv_flow.fix = [x * value for x in PV_PROFILE]
+
+    sweep = ParameterSweep(es, solver="highs")
+    sweep.run([1, 0.5], scale_profile, "pv")
+    expected = solve(
+        create_energy_system(
+            capex_var=1,
+            opex_fix=0,
+            feedin_tariff=0,
+            pv_profile=[x * 0.5 for x in PV_PROFILE],
+        )[0]
+    )
+    assert sweep.objectives[0.5] == pytest.approx(expected)
+    assert sweep.objectives[0.5] != pytest.approx(sweep.objectives[1])
+
+
+def test_fix_of_investment_flows_cannot_be_removed(create_energy_system):
+    es, _, pv, _ = create_energy_system()
+    sweep = ParameterSweep(es, solver="highs")
+    pv.outputs[es.groups["electricity"]].fix = None
+    with pytest.raises(ValueError, match="pv to electricity"):
+        sweep.update()
+
+
+def test_solph_rebuilds_the_objective_on_request():
+    # ParameterSweep.update relies on this private method of oemof.solph
+    assert "update" in inspect.signature(Model._add_objective).parameters
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+from oemof.solph import Flow
+from oemof.solph import Model
+
+from placades import CarrierBus
+from placades import HeatDemand
+from placades import Project
+from placades import PvPlant
+from placades.timeseries import TIMESERIES_STORE
+from placades.timeseries import intern_timeseries
+from placades.timeseries import resample
+from placades.timeseries import share_sequence
+
+
+def test_facades_share_identical_profiles():
+    TIMESERIES_STORE.clear()
+    project = Project(name="p", lifetime=20, tax=0, discount_factor=0.05)
+    bus = CarrierBus(name="electricity")
+    profile = np.random.default_rng(1).random(8760)
+    plants = [
+        PvPlant(
+            project_data=project,
+            bus_out_electricity=bus,
+            input_timeseries=pd.Series(profile),
+            name=f"pv_{number}",
+        )
+        for number in range(200)
+    ]
+    demand = HeatDemand(
+        name="demand", bus_in_heat=bus, input_timeseries=profile * 2
+    )
+
+    info = TIMESERIES_STORE.info()
+    assert info.profiles == 2
+    assert info.nbytes == 2 * profile.nbytes
+    fixes = [plant.outputs[bus].fix for plant in plants]
+    assert all(np.shares_memory(fix, fixes[0]) for fix in fixes)
+    assert not fixes[0].flags.writeable
+    np.testing.assert_array_equal(fixes[0], profile)
+    np.testing.assert_array_equal(demand.inputs[bus].fix, profile * 2)
+
+
+@pytest.fixture
+def create_energy_system(energy_system):
+    def create(hours):
+        es = energy_system(
+            hours=hours,
+            pv={"installed_capacity": 4},
+            storage={"self_discharge": 0.01},
+        )
+        return es, es.groups["electricity"], es.groups["demand"]
+
+    return create
+
+
+def energy(results, source, target, timeincrement):
+    return float(np.dot(results["flow"][source, target], timeincrement))
+
+
+def test_flows_store_their_sequences_in_apply_descriptors():
+    # fails if oemof.solph changes the storage of the flow attributes, which
+    # would make share_sequence silently keep its copies
+    profile = intern_timeseries(np.linspace(0, 1, 24))
+    flow = Flow(fix=profile, nominal_capacity=2)
+    assert flow.fix is not profile
+    assert share_sequence(flow, "fix", profile)
+    assert flow.fix is profile
+
+
+def test_sequences_that_differ_are_not_shared():
+    profile = intern_timeseries(np.linspace(0, 1, 24))
+    flow = Flow(fix=profile[::-1], nominal_capacity=2)
+    assert not share_sequence(flow, "fix", profile)
+    np.testing.assert_array_equal(flow.fix, profile[::-1])
+    assert not share_sequence(flow, "nominal_capacity", profile)
+    assert flow.nominal_capacity == 2
+
+
+def test_resample_keeps_energy_and_costs(create_energy_system):
+    es, bus, demand = create_energy_system(7 * 24)
+    hourly = Model(energysystem=es).solve(solver="highs")
+    hourly_demand = energy(hourly, bus, demand, es.timeincrement)
+
+    coarse = resample(es, "2h")
+    assert len(coarse.timeindex) == 7 * 12 + 1
+    results = Model(energysystem=coarse).solve(solver="highs")
+    assert energy(results, bus, demand, coarse.timeincrement) == pytest.approx(
+        hourly_demand
+    )
+    assert results["objective"] == pytest.approx(hourly["objective"], rel=0.02)
+
+
+def test_resample_with_a_shorter_last_time_step(create_energy_system):
+    es, bus, demand = create_energy_system(10)
+    coarse = resample(es, "4h")
+    assert coarse.timeincrement.tolist() == [4, 4, 2]
+    assert float(
+        np.dot(demand.inputs[bus].fix, coarse.timeincrement)
+    ) == pytest.approx(sum(1 + 0.5 * np.cos(np.arange(10) / 24 * 2 * np.pi)))
+
+
+def test_resample_needs_a_multiple_of_the_frequency(create_energy_system):
+    es, _, _ = create_energy_system(4)
+    with pytest.raises(ValueError, match="no multiple"):
+        resample(es, "90min")
@@ -0,0 +1,58 @@
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from placades import typemap
+from placades.typemap import FacadeRegistry
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    def fake_entry_points(group):
+        assert group == typemap.ENTRY_POINT_GROUP
+        return [
+            EntryPoint(
+                name="rooftop_pv",
+                value="placades.facades.production.PvPlant:PvPlant",
+                group=group,
+            ),
+            EntryPoint(
+                name="bess",
+                value="placades.facades.komponenten:Battery",
+                group=group,
+            ),
+        ]
+
+    monkeypatch.setattr(typemap, "entry_points", fake_entry_points)
+    return FacadeRegistry(
+        {
+            "bess": (
+                "placades.facades.storages.ElectricalStorage:ElectricalStorage"
+            )
+        }
+    )
+
+
+def test_entry_points_are_resolved_on_lookup(registry):
+    from placades.facades.production.PvPlant import PvPlant  # noqa: PLC0415
+
+    assert registry.resolved() == []
+    assert registry["rooftop_pv"] is PvPlant
+    assert registry.resolved() == ["rooftop_pv"]
+    assert sorted(registry) == ["bess", "rooftop_pv"]
+
+
+def test_entry_points_do_not_replace_builtin_types(registry):
+    assert registry["bess"].__name__ == "ElectricalStorage"
+
+
+def test_unknown_type_is_missing(registry):
+    assert "unknown" not in registry
+    assert registry.get("unknown") is None
+    with pytest.raises(KeyError):
+        _ = registry["unknown"]
+
+
+def test_typemap_covers_all_types():
+    for name in typemap.TYPEMAP:
+        assert isinstance(typemap.TYPEMAP[name], type)
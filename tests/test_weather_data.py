@@ -0,0 +1,52 @@
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from placades.importer.weather_data import import_trj
+
+TRY_FILE = Path(
+    Path(__file__).parent.parent,
+    "examples",
+    "simple_dispatch",
+    "data",
+    "TRY2015.dat",
+)
+
+
+@pytest.fixture
+def try_file(tmp_path):
+    return Path(shutil.copy(TRY_FILE, tmp_path / "TRY2015.dat"))
+
+
+def test_cache_is_memory_mapped_on_reload(try_file, tmp_path):
+    cold = import_trj(try_file, cache_dir=tmp_path / "cache")
+    warm = import_trj(try_file, cache_dir=tmp_path / "cache")
+    assert len(list((tmp_path / "cache").glob("*.npy"))) == 1
+    assert isinstance(warm.air_temperature_C.base, np.memmap)
+    assert warm.timeindex.equals(cold.timeindex)
+    for name, values in cold.to_dict().items():
+        if name != "timeindex":
+            np.testing.assert_array_equal(getattr(warm, name), values)
+
+
+def test_cache_survives_touching_the_source(try_file, tmp_path):
+    import_trj(try_file, cache_dir=tmp_path)
+    stat = try_file.stat()
+    os.utime(try_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    warm = import_trj(try_file, cache_dir=tmp_path)
+    assert isinstance(warm.air_temperature_C.base, np.memmap)
+
+
+def test_cache_is_renewed_if_the_source_changes(try_file, tmp_path):
+    cold = import_trj(try_file, cache_dir=tmp_path)
+    text = try_file.read_text(encoding="latin-1")
+    try_file.write_text(
+        text.replace("   1.4  976", "  11.4  976", 1), encoding="latin-1"
+    )
+    changed = import_trj(try_file, cache_dir=tmp_path)
+    assert cold.air_temperature_C[0] == 1.4
+    assert changed.air_temperature_C[0] == 11.4
+    assert not isinstance(changed.air_temperature_C.base, np.memmap)